@@ -0,0 +1,399 @@
+"""
+bench_pipeline.py
+
+Offline benchmarks for each pipeline stage and for end-to-end ingest (no Kafka needed).
+
+Benchmarks (size = messages, or rows already in the table for the SQLite ones):
+- generate_messages: the per-message generator, timed per chunk
+- generate_message_batches: the vectorized generator, timed per batch
+- process_message: field conversion, timed per chunk
+- insert_message: one-transaction inserts into a table of `size` rows
+- insert_messages: SQLITE_BATCH_SIZE-message transactions into a table of `size` rows
+- fetch_data: incremental dashboard refresh after each new batch, table of `size` rows
+- ingest: encode -> decode -> process_messages -> insert_messages for `size` messages
+
+Each (benchmark, size) runs in a fresh interpreter against a scratch
+database, so peak RSS belongs to that run alone. Reported per run:
+items/sec, p50/p99 latency of one operation (a chunk, batch, insert or
+refresh - see "op") and peak RSS.
+
+Results can be saved as JSON and compared with an earlier run; any
+benchmark whose items/sec fell, or whose p99 rose, by more than the
+threshold is reported and the exit status is 1.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--sizes 1k 100k 1m] [--only NAME ...]
+        [--output results.json] [--baseline baseline.json] [--threshold 0.25]
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from standard library
+import argparse
+import json
+import os
+import pathlib
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import islice
+
+# import from local modules
+from utils.utils_metrics import percentile
+
+PROJECT_ROOT = pathlib.Path(__file__).parent.parent
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+# messages per timed chunk for the per-message stages
+CHUNK_SIZE = 1_000
+
+# timed operations for the benchmarks measured against a table of `size` rows
+SINGLE_INSERTS = 1_000
+BATCH_INSERTS = 100
+REFRESHES = 100
+
+# p99 is only compared with a baseline when both runs timed at least this many operations
+MIN_OPS_FOR_P99 = 100
+
+# run in the child: one benchmark, result as JSON on the last line
+_PROBE = """
+import json
+from benchmarks.bench_pipeline import run_benchmark
+print(json.dumps(run_benchmark({name!r}, {size})))
+"""
+
+#####################################
+# Helpers
+#####################################
+
+
+def _message_chunks(count: int, chunk_size: int = CHUNK_SIZE, seed: int = 1):
+    """Yield generated messages in lists of up to chunk_size (generated untimed)."""
+    from producers.producer_rogers import generate_message_batches
+
+    batches = generate_message_batches(chunk_size, seed=seed)
+    while count > 0:
+        batch = next(batches)
+        yield batch[:count]
+        count -= len(batch)
+
+
+def _scratch_db(tmp: str, rows: int) -> pathlib.Path:
+    """Create a database in tmp holding `rows` generated messages."""
+    from consumers.db_sqlite_rogers import init_db, insert_messages
+
+    db_path = pathlib.Path(tmp) / "bench.sqlite"
+    init_db(db_path, reset=True)
+    for chunk in _message_chunks(rows, chunk_size=10_000):
+        insert_messages(chunk, db_path)
+    return db_path
+
+
+def _timed(operation, *args) -> float:
+    started = time.perf_counter()
+    operation(*args)
+    return time.perf_counter() - started
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unavailable, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+#####################################
+# Benchmarks
+#####################################
+# Each takes a size and returns (items processed, per-operation latencies in seconds).
+
+
+def bench_generate_messages(size: int):
+    from producers.producer_rogers import generate_messages
+
+    messages = generate_messages()
+    # warm up: the first message pays for one-off setup
+    next(messages)
+    latencies = []
+    for start in range(0, size, CHUNK_SIZE):
+        latencies.append(_timed(list, islice(messages, min(CHUNK_SIZE, size - start))))
+    return size, latencies
+
+
+def bench_generate_message_batches(size: int):
+    from producers.producer_rogers import generate_message_batches
+
+    batches = generate_message_batches(CHUNK_SIZE, seed=1)
+    next(batches)
+    latencies = [_timed(next, batches) for _ in range(max(size // CHUNK_SIZE, 1))]
+    return max(size // CHUNK_SIZE, 1) * CHUNK_SIZE, latencies
+
+
+def bench_process_message(size: int):
+    from consumers.kafka_consumer_rogers import process_message
+
+    def process_chunk(chunk):
+        for message in chunk:
+            process_message(message)
+
+    latencies = [_timed(process_chunk, chunk) for chunk in _message_chunks(size)]
+    return size, latencies
+
+
+def bench_insert_message(size: int):
+    from consumers.db_sqlite_rogers import insert_message
+    from consumers.sqlite_connection_rogers import close_all
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = _scratch_db(tmp, size)
+        messages = next(_message_chunks(SINGLE_INSERTS, chunk_size=SINGLE_INSERTS, seed=2))
+        latencies = [_timed(insert_message, message, db_path) for message in messages]
+        close_all()
+    return len(messages), latencies
+
+
+def bench_insert_messages(size: int):
+    import utils.utils_config as config
+    from consumers.db_sqlite_rogers import insert_messages
+    from consumers.sqlite_connection_rogers import close_all
+
+    batch_size = config.get_sqlite_batch_size()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = _scratch_db(tmp, size)
+        latencies = [
+            _timed(insert_messages, chunk, db_path)
+            for chunk in _message_chunks(BATCH_INSERTS * batch_size, batch_size, seed=2)
+        ]
+        close_all()
+    return BATCH_INSERTS * batch_size, latencies
+
+
+def bench_fetch_data(size: int):
+    import utils.utils_config as config
+    from consumers.dashboard_rogers import DashboardData
+    from consumers.db_sqlite_rogers import insert_messages
+    from consumers.sqlite_connection_rogers import close_all
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = _scratch_db(tmp, size)
+        data = DashboardData(
+            db_path, config.get_chart_critic(), config.get_chart_genre(), config.get_chart_max_points()
+        )
+        # the first refresh loads the whole series; time the incremental ones after it
+        data.refresh()
+        latencies = []
+        for chunk in _message_chunks(REFRESHES * 100, chunk_size=100, seed=2):
+            insert_messages(chunk, db_path)
+            latencies.append(_timed(data.refresh))
+        close_all()
+    return REFRESHES, latencies
+
+
+def bench_ingest(size: int):
+    import utils.utils_config as config
+    from consumers.db_sqlite_rogers import init_db, insert_messages
+    from consumers.kafka_consumer_rogers import process_messages
+    from consumers.sqlite_connection_rogers import close_all
+    from utils.utils_codec import decode_record, encode_record, get_codec
+
+    codec = get_codec(config.get_message_codec())
+
+    def ingest_batch(batch, db_path):
+        records = [encode_record(message, codec) for message in batch]
+        messages = [decode_record(value, headers) for value, headers in records]
+        insert_messages(process_messages(messages), db_path)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = pathlib.Path(tmp) / "bench.sqlite"
+        init_db(db_path, reset=True)
+        latencies = [
+            _timed(ingest_batch, batch, db_path)
+            for batch in _message_chunks(size, config.get_sqlite_batch_size())
+        ]
+        close_all()
+    return size, latencies
+
+
+# name -> (function, what one timed operation is)
+BENCHMARKS = {
+    "generate_messages": (bench_generate_messages, f"{CHUNK_SIZE} messages"),
+    "generate_message_batches": (bench_generate_message_batches, f"batch of {CHUNK_SIZE}"),
+    "process_message": (bench_process_message, f"{CHUNK_SIZE} messages"),
+    "insert_message": (bench_insert_message, "1 message (1 transaction)"),
+    "insert_messages": (bench_insert_messages, "SQLITE_BATCH_SIZE messages"),
+    "fetch_data": (bench_fetch_data, "1 refresh after 100 new rows"),
+    "ingest": (bench_ingest, "SQLITE_BATCH_SIZE messages end to end"),
+}
+
+
+def run_benchmark(name: str, size: int) -> dict:
+    """
+    Run one benchmark in this process.
+
+    Returns:
+        dict: name, size, op, items, items/sec, p50/p99 op latency (ms)
+        and peak RSS (MB) of this process.
+    """
+    function, op = BENCHMARKS[name]
+    items, latencies = function(size)
+    elapsed = sum(latencies)
+    latencies.sort()
+    return {
+        "name": name,
+        "size": size,
+        "op": op,
+        "items": items,
+        "ops": len(latencies),
+        "items_per_sec": items / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_isolated(name: str, size: int) -> dict:
+    """Run one benchmark in a fresh interpreter and return its result."""
+    env = dict(
+        os.environ,
+        PYTHONPATH=str(PROJECT_ROOT),
+        MPLBACKEND="Agg",
+        LOG_LEVEL="WARNING",
+        LOG_CONSOLE_LEVEL="WARNING",
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(name=name, size=size)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+#####################################
+# Baseline Comparison
+#####################################
+
+
+def compare(results: list, baseline: list, threshold: float) -> list:
+    """
+    Compare results with a baseline run.
+
+    Returns:
+        list: One message per regression: items/sec down, or p99 up,
+        by more than threshold (a fraction, e.g. 0.25). p99 is skipped
+        for runs with too few operations to be stable, and benchmarks
+        missing from either run are skipped.
+    """
+    previous = {(result["name"], result["size"]): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result["name"], result["size"]))
+        if before is None:
+            continue
+        label = f"{result['name']} @ {result['size']}"
+        if before["items_per_sec"] and (
+            result["items_per_sec"] < before["items_per_sec"] * (1 - threshold)
+        ):
+            regressions.append(
+                f"{label}: {result['items_per_sec']:.0f} items/s "
+                f"vs {before['items_per_sec']:.0f} in the baseline"
+            )
+        enough_ops = min(result["ops"], before["ops"]) >= MIN_OPS_FOR_P99
+        if enough_ops and before["p99_ms"] and result["p99_ms"] > before["p99_ms"] * (1 + threshold):
+            regressions.append(
+                f"{label}: p99 {result['p99_ms']:.3f} ms vs {before['p99_ms']:.3f} ms in the baseline"
+            )
+    return regressions
+
+
+#####################################
+# Define Main Function
+#####################################
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as 1000, 100k or 1m."""
+    text = text.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    try:
+        size = int(float(text.rstrip("km")) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {text}")
+    if size <= 0:
+        raise argparse.ArgumentTypeError("size must be positive")
+    return size
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages without Kafka.")
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Benchmarks to run.")
+    parser.add_argument("--output", type=pathlib.Path, help="Write results to this JSON file.")
+    parser.add_argument("--baseline", type=pathlib.Path, help="Compare with this results file.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Allowed slowdown as a fraction (0.25 = 25%%)."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    names = args.only or list(BENCHMARKS)
+
+    print(
+        f"{'benchmark':26} {'size':>9} {'items/s':>12} {'p50 ms':>9} {'p99 ms':>9} {'RSS MB':>8}  op"
+    )
+    results = []
+    for name in names:
+        for size in args.sizes:
+            result = run_isolated(name, size)
+            results.append(result)
+            rss = result["peak_rss_mb"]
+            print(
+                f"{name:26} {size:9d} {result['items_per_sec']:12.0f} {result['p50_ms']:9.3f} "
+                f"{result['p99_ms']:9.3f} {rss if rss is None else f'{rss:8.1f}':>8}  {result['op']}",
+                flush=True,
+            )
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}.")
+
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+bench_startup.py
+
+Measure how long it takes to import the pipeline's entry-point modules.
+
+Each module is imported in a fresh interpreter (so nothing is cached
+from a previous import) several times; the median wall time is reported
+along with whether the import pulled in matplotlib or the Kafka client.
+Ingest-only modules should import neither GUI code nor need a display.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs N] [MODULE ...]
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from standard library
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).parent.parent
+
+# modules timed by default
+DEFAULT_MODULES = [
+    "utils.utils_config",
+    "consumers.db_sqlite_rogers",
+    "consumers.kafka_consumer_rogers",
+    "consumers.file_consumer_rogers",
+    "consumers.backfill_rogers",
+    "consumers.consumer_group_rogers",
+    "consumers.dashboard_rogers",
+    "producers.producer_rogers",
+]
+
+# run in the child: import the module, then report the time and what was loaded
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "matplotlib": "matplotlib" in sys.modules,
+    "kafka": "kafka" in sys.modules,
+}}))
+"""
+
+#####################################
+# Measure
+#####################################
+
+
+def time_import(module: str, runs: int = 5) -> dict:
+    """
+    Import a module in `runs` fresh interpreters.
+
+    Returns:
+        dict: module, median and min seconds, and whether matplotlib
+        and kafka were imported.
+    """
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT), MPLBACKEND="Agg")
+    samples = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=PROJECT_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    seconds = [sample["seconds"] for sample in samples]
+    return {
+        "module": module,
+        "median_secs": statistics.median(seconds),
+        "min_secs": min(seconds),
+        "matplotlib": samples[-1]["matplotlib"],
+        "kafka": samples[-1]["kafka"],
+    }
+
+
+#####################################
+# Define Main Function
+#####################################
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time imports of the pipeline entry points.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to import.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    results = [time_import(module, args.runs) for module in args.modules]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'module':40} {'median ms':>10} {'min ms':>8}  matplotlib  kafka")
+    for result in results:
+        print(
+            f"{result['module']:40} {result['median_secs'] * 1000:10.1f} "
+            f"{result['min_secs'] * 1000:8.1f}  {str(result['matplotlib']):10}  {result['kafka']}"
+        )
+
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""
+aggregate_store_rogers.py
+
+In-memory, NumPy-backed aggregates for the consumer.
+
+Has the following:
+- to_datetime64: Timestamp conversion that turns malformed values into NaT.
+- AggregateStore: Current per-genre sentiment totals, per-critic review
+  counts and a ring buffer of recent (timestamp, critic, genre, sentiment)
+  points, held in arrays indexed by genre and critic ids and updated
+  with vectorized operations once per batch.
+- StoreDashboardData: Adapter that serves an AggregateStore to the
+  dashboard with the same interface as dashboard_rogers.DashboardData.
+
+The consumer updates the store after each committed batch, so readers in
+the same process (the chart, the coordinator in later modes) never have
+to query SQLite for aggregates - SQLite is only needed for durability
+and to seed the store on start.
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from standard library
+import pathlib
+import threading
+
+# import external modules
+import numpy as np
+
+# import from local modules
+from utils.utils_logger import logger
+from consumers.sqlite_connection_rogers import get_connection_manager
+
+#####################################
+# Timestamps
+#####################################
+
+
+def to_datetime64(values) -> np.ndarray:
+    """
+    Convert timestamps to datetime64[s], with NaT for any that don't parse.
+
+    The whole batch is converted at once when it can be; otherwise each
+    value is tried on its own, so one malformed timestamp costs its point
+    on the chart instead of failing the batch.
+    """
+    try:
+        return np.array(values, dtype="datetime64[s]")
+    except (TypeError, ValueError):
+        pass
+    out = np.empty(len(values), dtype="datetime64[s]")
+    for i, value in enumerate(values):
+        try:
+            out[i] = np.datetime64(value, "s")
+        except (TypeError, ValueError):
+            out[i] = np.datetime64("NaT")
+    return out
+
+
+#####################################
+# Aggregate Store
+#####################################
+
+
+class AggregateStore:
+    """
+    Per-genre and per-critic aggregates plus recent sentiment points.
+
+    Genre and critic names are mapped to small integer ids; the totals live
+    in NumPy arrays indexed by those ids and grow as new names appear.
+    All methods are thread-safe.
+    """
+
+    def __init__(self, series_capacity: int = 100_000):
+        """
+        Args:
+            series_capacity (int): Recent points kept for the sentiment series.
+        """
+        self._lock = threading.Lock()
+        self.version = 0
+
+        self.genres = []
+        self._genre_ids = {}
+        self.critics = []
+        self._critic_ids = {}
+
+        self.genre_sum = np.zeros(0, dtype=np.float64)
+        self.genre_count = np.zeros(0, dtype=np.int64)
+        self.critic_count = np.zeros(0, dtype=np.int64)
+
+        # ring buffer of recent points (next write position and fill level);
+        # appended counts every point ever added, so it works as a high-water mark
+        self.appended = 0
+        self._capacity = series_capacity
+        self._ts = np.zeros(series_capacity, dtype="datetime64[s]")
+        self._sentiment = np.zeros(series_capacity, dtype=np.float64)
+        self._point_genre = np.zeros(series_capacity, dtype=np.int32)
+        self._point_critic = np.zeros(series_capacity, dtype=np.int32)
+        self._head = 0
+        self._size = 0
+
+    #####################################
+    # Id Mapping
+    #####################################
+
+    @staticmethod
+    def _ids_for(names, ids: dict, known: list) -> np.ndarray:
+        """Map names to ids, registering new names as they appear."""
+        out = np.empty(len(names), dtype=np.int32)
+        for i, name in enumerate(names):
+            idx = ids.get(name)
+            if idx is None:
+                idx = ids[name] = len(known)
+                known.append(name)
+            out[i] = idx
+        return out
+
+    def _grow(self) -> None:
+        """Extend the total arrays to cover newly registered names."""
+        if len(self.genres) > len(self.genre_sum):
+            extra = len(self.genres) - len(self.genre_sum)
+            self.genre_sum = np.concatenate([self.genre_sum, np.zeros(extra)])
+            self.genre_count = np.concatenate([self.genre_count, np.zeros(extra, dtype=np.int64)])
+        if len(self.critics) > len(self.critic_count):
+            extra = len(self.critics) - len(self.critic_count)
+            self.critic_count = np.concatenate([self.critic_count, np.zeros(extra, dtype=np.int64)])
+
+    #####################################
+    # Updates
+    #####################################
+
+    def update(self, messages: list) -> None:
+        """
+        Fold one batch of processed messages into the aggregates.
+        A timestamp that doesn't parse still counts towards the totals;
+        only its point is dropped from the series.
+
+        Args:
+            messages (list): Processed messages (dicts) from one committed batch.
+        """
+        if not messages:
+            return
+        genres = [message["genre"] for message in messages]
+        critics = [message["critic"] for message in messages]
+        sentiment = np.fromiter(
+            (message["sentiment"] for message in messages), dtype=np.float64, count=len(messages)
+        )
+        timestamps = to_datetime64([message["timestamp"] for message in messages])
+
+        with self._lock:
+            genre_idx = self._ids_for(genres, self._genre_ids, self.genres)
+            critic_idx = self._ids_for(critics, self._critic_ids, self.critics)
+            self._grow()
+
+            self.genre_sum += np.bincount(genre_idx, weights=sentiment, minlength=len(self.genres))
+            self.genre_count += np.bincount(genre_idx, minlength=len(self.genres))
+            self.critic_count += np.bincount(critic_idx, minlength=len(self.critics))
+
+            self._append_points(timestamps, sentiment, genre_idx, critic_idx)
+            self.version += 1
+
+    def add_points(self, points: list) -> None:
+        """
+        Append (timestamp, critic, genre, sentiment) points to the series
+        buffer without touching the totals (used when merging workers).
+        """
+        if not points:
+            return
+        timestamps, critics, genres, sentiment = zip(*points)
+        with self._lock:
+            genre_idx = self._ids_for(genres, self._genre_ids, self.genres)
+            critic_idx = self._ids_for(critics, self._critic_ids, self.critics)
+            self._grow()
+            self._append_points(
+                to_datetime64(timestamps),
+                np.array(sentiment, dtype=np.float64),
+                genre_idx,
+                critic_idx,
+            )
+            self.version += 1
+
+    def totals(self) -> dict:
+        """
+        Return the current totals as plain data (picklable, for sending
+        between processes).
+
+        Returns:
+            dict: {"genres": {genre: (sentiment_sum, count)}, "critics": {critic: count}}
+        """
+        with self._lock:
+            return {
+                "genres": {
+                    genre: (total, count)
+                    for genre, total, count in zip(
+                        self.genres, self.genre_sum.tolist(), self.genre_count.tolist()
+                    )
+                },
+                "critics": dict(zip(self.critics, self.critic_count.tolist())),
+            }
+
+    def replace_totals(self, totals: dict) -> None:
+        """Overwrite the totals with the values from a totals() dict."""
+        genres = list(totals["genres"])
+        critics = list(totals["critics"])
+        with self._lock:
+            genre_idx = self._ids_for(genres, self._genre_ids, self.genres)
+            critic_idx = self._ids_for(critics, self._critic_ids, self.critics)
+            self._grow()
+            self.genre_sum[:] = 0
+            self.genre_count[:] = 0
+            self.critic_count[:] = 0
+            self.genre_sum[genre_idx] = [totals["genres"][genre][0] for genre in genres]
+            self.genre_count[genre_idx] = [totals["genres"][genre][1] for genre in genres]
+            self.critic_count[critic_idx] = [totals["critics"][critic] for critic in critics]
+            self.version += 1
+
+    def _append_points(self, timestamps, sentiment, genre_idx, critic_idx) -> None:
+        n = len(sentiment)
+        self.appended += n
+        if n >= self._capacity:
+            timestamps, sentiment = timestamps[-self._capacity:], sentiment[-self._capacity:]
+            genre_idx, critic_idx = genre_idx[-self._capacity:], critic_idx[-self._capacity:]
+            n = self._capacity
+        positions = (self._head + np.arange(n)) % self._capacity
+        self._ts[positions] = timestamps
+        self._sentiment[positions] = sentiment
+        self._point_genre[positions] = genre_idx
+        self._point_critic[positions] = critic_idx
+        self._head = (self._head + n) % self._capacity
+        self._size = min(self._size + n, self._capacity)
+
+    def load_from_db(self, db_path: pathlib.Path) -> None:
+        """
+        Seed the store from the aggregate tables and the most recent messages,
+        so a restart without a reset picks up where it left off.
+
+        Args:
+            db_path (pathlib.Path): Path to the SQLite database file.
+        """
+        with get_connection_manager(db_path).reader() as conn:
+            genre_rows = conn.execute(
+                "SELECT genre, sentiment_sum, sentiment_count FROM sentiment_per_genre"
+            ).fetchall()
+            critic_rows = conn.execute(
+                "SELECT critic, review_count FROM critic_entry_counts"
+            ).fetchall()
+            recent = conn.execute(
+                """
+                SELECT timestamp, critic, genre, sentiment FROM (
+                    SELECT id, timestamp, critic, genre, sentiment FROM streamed_messages
+                    ORDER BY id DESC LIMIT ?
+                ) ORDER BY id
+            """,
+                (self._capacity,),
+            ).fetchall()
+
+        with self._lock:
+            genre_idx = self._ids_for([row[0] for row in genre_rows], self._genre_ids, self.genres)
+            critic_idx = self._ids_for([row[0] for row in critic_rows], self._critic_ids, self.critics)
+            self._grow()
+            self.genre_sum[genre_idx] = [row[1] for row in genre_rows]
+            self.genre_count[genre_idx] = [row[2] for row in genre_rows]
+            self.critic_count[critic_idx] = [row[1] for row in critic_rows]
+            if recent:
+                timestamps, critics, genres, sentiment = zip(*recent)
+                self._append_points(
+                    to_datetime64(timestamps),
+                    np.array(sentiment, dtype=np.float64),
+                    self._ids_for(genres, self._genre_ids, self.genres),
+                    self._ids_for(critics, self._critic_ids, self.critics),
+                )
+                self._grow()
+            self.version += 1
+        logger.info(
+            f"Loaded aggregates for {len(self.genres)} genres, {len(self.critics)} critics "
+            f"and {len(recent)} recent points from {db_path}."
+        )
+
+    #####################################
+    # Reads
+    #####################################
+
+    def genre_rows(self) -> list:
+        """Return (genre, avg_sentiment) rows, like the sentiment_per_genre query."""
+        with self._lock:
+            counts = np.maximum(self.genre_count, 1)
+            averages = (self.genre_sum / counts).tolist()
+            return [
+                (genre, avg)
+                for genre, avg, count in zip(self.genres, averages, self.genre_count.tolist())
+                if count
+            ]
+
+    def critic_rows(self) -> list:
+        """Return (critic, review_count) rows, like the critic_entry_counts query."""
+        with self._lock:
+            return [
+                (critic, count)
+                for critic, count in zip(self.critics, self.critic_count.tolist())
+                if count
+            ]
+
+    def series(self, critic: str, genre: str, max_points: int = None) -> list:
+        """
+        Return recent (timestamp, sentiment) points for one critic and genre,
+        oldest first. Points whose timestamp did not parse are left out.
+        """
+        with self._lock:
+            selected = self._select(critic, genre)
+            if max_points:
+                selected = selected[-max_points:]
+            return self._points(selected)
+
+    def new_points(self, critic: str, genre: str, since: int) -> tuple:
+        """
+        Return the series points for one critic and genre added after the
+        first `since` points, like series() after a row id high-water mark.
+
+        Returns:
+            tuple: (points, the mark to pass next time)
+        """
+        with self._lock:
+            return self._points(self._select(critic, genre, since)), self.appended
+
+    def _select(self, critic: str, genre: str, since: int = 0) -> np.ndarray:
+        """Return ring positions of one critic and genre's points, oldest first."""
+        critic_id = self._critic_ids.get(critic)
+        genre_id = self._genre_ids.get(genre)
+        if critic_id is None or genre_id is None or not self._size:
+            return np.zeros(0, dtype=np.int64)
+        # the oldest point in the buffer is number appended - size
+        skip = min(max(since - (self.appended - self._size), 0), self._size)
+        order = (self._head - self._size + np.arange(skip, self._size)) % self._capacity
+        mask = (
+            (self._point_critic[order] == critic_id)
+            & (self._point_genre[order] == genre_id)
+            & ~np.isnat(self._ts[order])
+        )
+        return order[mask]
+
+    def _points(self, selected: np.ndarray) -> list:
+        timestamps = np.datetime_as_string(self._ts[selected], unit="s").tolist()
+        sentiment = self._sentiment[selected].tolist()
+        return [(ts.replace("T", " "), value) for ts, value in zip(timestamps, sentiment)]
+
+
+#####################################
+# Dashboard Adapter
+#####################################
+
+
+class StoreDashboardData:
+    """
+    Serve an AggregateStore to the dashboard.
+
+    Same interface as dashboard_rogers.DashboardData (refresh(), genre_rows,
+    critic_rows, series, new_timestamps), but reads process memory instead
+    of SQLite.
+    """
+
+    def __init__(self, store: AggregateStore, critic: str, genre: str, max_points: int):
+        self.store = store
+        self.critic = critic
+        self.genre = genre
+        self.max_points = max_points
+        self.genre_rows = []
+        self.critic_rows = []
+        self.series = []
+        self.new_timestamps = []
+        self._version = None
+        self._appended = 0
+
+    def refresh(self) -> bool:
+        """
+        Pick up the store's current values if they changed.
+
+        Returns:
+            bool: True if any dashboard data changed.
+        """
+        self.new_timestamps = []
+        version = self.store.version
+        if version == self._version:
+            return False
+        # new points first, so every one of them is also in the series read after
+        new_points, self._appended = self.store.new_points(self.critic, self.genre, self._appended)
+        self.new_timestamps = [timestamp for timestamp, _ in new_points[-self.max_points:]]
+        self.genre_rows = self.store.genre_rows()
+        self.critic_rows = self.store.critic_rows()
+        self.series = self.store.series(self.critic, self.genre, self.max_points)
+        self._version = version
+        return True
@@ -0,0 +1,319 @@
+"""
+backfill_rogers.py
+
+Bulk-load archived JSONL (e.g. data/project_live.json and its rotated
+copies) into the SQLite database.
+
+Much faster than replaying messages through insert_message():
+
+- Files are streamed in large chunks cut at line boundaries.
+- Chunks are parsed into rows by a pool of worker processes.
+- Rows are loaded with executemany() in large transactions. A fresh
+  load (the database is reset first) runs with no journal and no
+  fsync - safe because a failed fresh load is simply rerun. With
+  --append the existing rows have to survive a failure, so the load
+  keeps a WAL journal: a failed run rolls back only its current
+  transaction and logs how many rows it had already committed.
+- The streamed_messages indexes are dropped during the load and rebuilt once.
+- The aggregate tables are rebuilt once at the end, not per row.
+
+Progress (rows, bytes, rows/sec) is logged every few seconds.
+
+Usage:
+    python -m consumers.backfill_rogers [FILE ...] [--append] [--workers N]
+
+Files are loaded in the order given (oldest first for rotated copies,
+e.g. project_live.json.2 project_live.json.1 project_live.json).
+Defaults to the live data file. Without --append the database is reset first.
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from standard library
+import argparse
+import json
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+from collections import deque
+
+# import from local modules
+import utils.utils_config as config
+from utils.utils_logger import logger
+from consumers.db_sqlite_rogers import STREAMED_MESSAGES_INDEXES, init_db, rebuild_aggregates
+from consumers.sqlite_connection_rogers import SQLiteConnectionManager, close_all
+
+# bulk-load profile for a fresh database: nothing to protect until the load finishes
+BACKFILL_PROFILE = {
+    "journal_mode": "OFF",
+    "synchronous": "OFF",
+    "cache_size": -262144,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+# --append profile: existing rows must survive a failed load, so keep a journal
+APPEND_PROFILE = dict(BACKFILL_PROFILE, journal_mode="WAL", synchronous="NORMAL")
+
+#####################################
+# Read and Parse Chunks
+#####################################
+
+
+def read_chunks(path: pathlib.Path, chunk_bytes: int):
+    """
+    Yield chunks of whole lines (bytes) from a file.
+
+    Args:
+        path (pathlib.Path): JSONL file.
+        chunk_bytes (int): Approximate chunk size.
+    """
+    remainder = b""
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                break
+            data = remainder + data
+            end = data.rfind(b"\n")
+            if end < 0:
+                remainder = data
+                continue
+            remainder = data[end + 1 :]
+            yield data[: end + 1]
+    if remainder.strip():
+        yield remainder
+
+
+def _to_row(message: dict) -> tuple:
+    """Return the streamed_messages row for a message (same conversions as process_message())."""
+    return (
+        message.get("title"),
+        message.get("review"),
+        message.get("critic"),
+        message.get("timestamp"),
+        message.get("genre"),
+        float(message.get("sentiment", 0.0)),
+        int(message.get("message_length", 0)),
+    )
+
+
+def parse_chunk(chunk: bytes) -> tuple:
+    """
+    Parse a chunk of JSONL into streamed_messages rows.
+
+    The chunk is first parsed as one JSON array (a single json.loads()
+    call for all lines); if any line is malformed it falls back to
+    parsing line by line and skips the bad ones.
+
+    Returns:
+        tuple: (rows, bytes in chunk, lines skipped)
+    """
+    lines = [line for line in chunk.splitlines() if line.strip()]
+    try:
+        return [_to_row(message) for message in json.loads(b"[" + b",".join(lines) + b"]")], len(chunk), 0
+    except (ValueError, TypeError, AttributeError):
+        pass
+
+    rows = []
+    skipped = 0
+    for line in lines:
+        try:
+            rows.append(_to_row(json.loads(line)))
+        except (ValueError, TypeError, AttributeError):
+            skipped += 1
+    return rows, len(chunk), skipped
+
+
+def parse_chunks(chunks, workers: int):
+    """
+    Yield parse_chunk() results in input order, parsing up to
+    2 x workers chunks ahead in a process pool (bounded, so a large
+    archive is never read into memory all at once).
+    With one worker, parse inline - the pool would only add pickling.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield parse_chunk(chunk)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.apply_async(parse_chunk, (chunk,)))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().get()
+        while in_flight:
+            yield in_flight.popleft().get()
+
+
+#####################################
+# Backfill
+#####################################
+
+
+def backfill(
+    paths: list,
+    db_path: pathlib.Path,
+    append: bool = False,
+    workers: int = None,
+    chunk_bytes: int = 8 << 20,
+    transaction_rows: int = 200_000,
+    progress_secs: float = 2.0,
+) -> dict:
+    """
+    Load JSONL files into streamed_messages and rebuild the aggregates.
+
+    Args:
+        paths (list): JSONL files, loaded in order.
+        db_path (pathlib.Path): Path to the SQLite database file.
+        append (bool): Keep existing rows instead of resetting the database.
+        workers (int): Parser processes (default or 0: CPU count).
+        chunk_bytes (int): Bytes read per chunk.
+        transaction_rows (int): Rows per commit.
+        progress_secs (float): Seconds between progress logs.
+
+    Returns:
+        dict: rows loaded, lines skipped, bytes read, seconds and rows/sec.
+    """
+    paths = [pathlib.Path(path) for path in paths]
+    total_bytes = sum(path.stat().st_size for path in paths)
+    workers = workers or os.cpu_count() or 1
+
+    init_db(db_path, reset=not append)
+    close_all()
+
+    manager = SQLiteConnectionManager(db_path, APPEND_PROFILE if append else BACKFILL_PROFILE)
+    with manager.writer() as conn:
+        # rebuilt once by init_db() below instead of maintained row by row
+        for name in STREAMED_MESSAGES_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+    rows_loaded = 0
+    skipped = 0
+    bytes_read = 0
+    pending = []
+    started = time.perf_counter()
+    last_progress = started
+
+    def commit(rows):
+        with manager.writer() as conn:
+            conn.executemany(
+                """
+                INSERT INTO streamed_messages(
+                    title, review, critic, timestamp, genre, sentiment, message_length
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+
+    chunks = (chunk for path in paths for chunk in read_chunks(path, chunk_bytes))
+    try:
+        for rows, chunk_size, chunk_skipped in parse_chunks(chunks, workers):
+            pending.extend(rows)
+            bytes_read += chunk_size
+            skipped += chunk_skipped
+            if len(pending) >= transaction_rows:
+                commit(pending)
+                rows_loaded += len(pending)
+                pending = []
+
+            now = time.perf_counter()
+            if now - last_progress >= progress_secs:
+                last_progress = now
+                logger.info(
+                    f"Backfill: {rows_loaded} rows, {bytes_read / max(total_bytes, 1):.0%} "
+                    f"of {total_bytes} bytes, {rows_loaded / (now - started):.0f} rows/sec."
+                )
+        if pending:
+            commit(pending)
+            rows_loaded += len(pending)
+    except Exception as e:
+        if append:
+            logger.error(f"ERROR: Backfill failed after committing {rows_loaded} rows: {e}")
+        else:
+            logger.error(f"ERROR: Backfill failed; rerun it to reload from scratch: {e}")
+        raise
+    finally:
+        manager.close()
+
+    load_secs = time.perf_counter() - started
+    init_db(db_path, reset=False)
+    rebuild_aggregates(db_path)
+    close_all()
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "rows": rows_loaded,
+        "skipped": skipped,
+        "bytes": bytes_read,
+        "load_secs": load_secs,
+        "seconds": elapsed,
+        "rows_per_sec": rows_loaded / elapsed if elapsed else 0.0,
+    }
+    logger.info(
+        f"Backfill done: {rows_loaded} rows ({skipped} bad lines skipped) in {elapsed:.1f}s "
+        f"({load_secs:.1f}s load, {elapsed - load_secs:.1f}s index and aggregates), "
+        f"{result['rows_per_sec']:.0f} rows/sec."
+    )
+    return result
+
+
+#####################################
+# Define Main Function
+#####################################
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk-load archived JSONL messages into SQLite.")
+    parser.add_argument("files", nargs="*", type=pathlib.Path, help="JSONL files, oldest first.")
+    parser.add_argument("--append", action="store_true", help="Keep existing rows.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.get_backfill_workers(),
+        help="Parser processes (default BACKFILL_WORKERS; 0 = CPU count).",
+    )
+    parser.add_argument(
+        "--chunk-mb",
+        type=int,
+        default=config.get_backfill_chunk_mb(),
+        help="Megabytes read per chunk (default BACKFILL_CHUNK_MB).",
+    )
+    parser.add_argument(
+        "--transaction-rows",
+        type=int,
+        default=config.get_backfill_transaction_rows(),
+        help="Rows per commit (default BACKFILL_TRANSACTION_ROWS).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    paths = args.files or [config.get_live_data_path()]
+    missing = [path for path in paths if not pathlib.Path(path).exists()]
+    if missing:
+        logger.error(f"ERROR: Input file(s) not found: {missing}")
+        sys.exit(1)
+
+    backfill(
+        paths,
+        config.get_sqlite_path(),
+        append=args.append,
+        workers=args.workers,
+        chunk_bytes=args.chunk_mb << 20,
+        transaction_rows=args.transaction_rows,
+    )
+
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+consumer_group_rogers.py
+
+Partition-parallel consumer group.
+
+Runs N worker processes in the same Kafka consumer group, so each one is
+assigned its own share of the topic's partitions (KAFKA_NUM_PARTITIONS).
+Every worker polls in batches, writes through its own SQLite connection
+and keeps its own AggregateStore. The coordinator (this process) merges
+the per-worker aggregates into one store for the dashboard and reports
+each worker's throughput.
+
+Usage:
+    python -m consumers.consumer_group_rogers --workers 4
+
+Workers beyond the number of partitions sit idle - grow the topic first.
+Environment variables are in utils/utils_config module.
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from standard library
+import argparse
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+
+# import from local modules
+import utils.utils_config as config
+from utils.utils_logger import logger
+from utils.utils_metrics import start_metrics_server
+from consumers.aggregate_store_rogers import AggregateStore, StoreDashboardData
+from consumers.db_sqlite_rogers import init_db
+from consumers.sqlite_connection_rogers import close_all
+
+#####################################
+# Worker Process
+#####################################
+
+
+def run_worker(
+    worker_id: int, topic: str, kafka_url: str, group: str, reports, stop_event, settings=None
+) -> None:
+    """
+    Consume this worker's partitions and send periodic reports to the coordinator.
+
+    Each report carries the worker's cumulative totals (so a lost report
+    costs nothing), the series points stored since the last report and
+    the throughput over the report interval.
+
+    Args:
+        worker_id (int): Worker number, for logs and reports.
+        topic (str): Kafka topic to consume.
+        kafka_url (str): Kafka broker address.
+        group (str): Consumer group ID shared by all workers.
+        reports (multiprocessing.Queue): Where to send reports.
+        stop_event (multiprocessing.Event): Set by the coordinator to stop.
+        settings (config.Settings, optional): The coordinator's settings,
+            so the worker doesn't parse the environment again.
+    """
+    if settings is not None:
+        config.set_settings(settings)
+    if config.get_metrics_port():
+        # each worker serves its own metrics on the next ports after the coordinator's
+        start_metrics_server(config.get_metrics_port() + worker_id)
+    # imported here so the coordinator doesn't pay for the Kafka client
+    from consumers.kafka_consumer_rogers import consume_messages_from_kafka
+
+    interval_secs = config.get_consumer_report_interval_seconds()
+    store = AggregateStore(series_capacity=1)
+    new_points = []
+    processed_total = 0
+    interval_count = 0
+    last_report = time.monotonic()
+
+    def on_batch(messages: list) -> None:
+        nonlocal processed_total, interval_count, last_report
+        for message in messages:
+            new_points.append(
+                (message["timestamp"], message["critic"], message["genre"], message["sentiment"])
+            )
+        processed_total += len(messages)
+        interval_count += len(messages)
+
+        now = time.monotonic()
+        if now - last_report >= interval_secs:
+            reports.put(
+                {
+                    "worker_id": worker_id,
+                    "totals": store.totals(),
+                    "points": list(new_points),
+                    "processed": processed_total,
+                    "msgs_per_sec": interval_count / (now - last_report),
+                }
+            )
+            new_points.clear()
+            interval_count = 0
+            last_report = now
+
+    logger.info(f"Consumer worker {worker_id} starting.")
+    try:
+        consume_messages_from_kafka(
+            topic, kafka_url, group, store=store, stop_event=stop_event, on_batch=on_batch
+        )
+    finally:
+        # send whatever is left so the coordinator's totals are complete
+        reports.put(
+            {
+                "worker_id": worker_id,
+                "totals": store.totals(),
+                "points": list(new_points),
+                "processed": processed_total,
+                "msgs_per_sec": 0.0,
+            }
+        )
+        close_all()
+        logger.info(f"Consumer worker {worker_id} stopped after {processed_total} messages.")
+
+
+#####################################
+# Coordinator
+#####################################
+
+
+class Coordinator:
+    """
+    Merge per-worker reports into one AggregateStore and track throughput.
+
+    Merged totals = totals already in SQLite when the group started
+    + the latest cumulative totals from each worker.
+    """
+
+    def __init__(self, base_totals: dict, series_capacity: int):
+        self.store = AggregateStore(series_capacity)
+        self.base_totals = base_totals
+        self.worker_totals = {}
+        self.worker_rates = {}
+        self.worker_processed = {}
+        self.store.replace_totals(base_totals)
+
+    def apply(self, report: dict) -> None:
+        """Fold one worker report into the merged store."""
+        worker_id = report["worker_id"]
+        self.worker_totals[worker_id] = report["totals"]
+        self.worker_rates[worker_id] = report["msgs_per_sec"]
+        self.worker_processed[worker_id] = report["processed"]
+
+        genres = {genre: list(value) for genre, value in self.base_totals["genres"].items()}
+        critics = dict(self.base_totals["critics"])
+        for totals in self.worker_totals.values():
+            for genre, (total, count) in totals["genres"].items():
+                merged = genres.setdefault(genre, [0.0, 0])
+                merged[0] += total
+                merged[1] += count
+            for critic, count in totals["critics"].items():
+                critics[critic] = critics.get(critic, 0) + count
+        self.store.replace_totals({"genres": genres, "critics": critics})
+        self.store.add_points(report["points"])
+
+    def log_throughput(self) -> None:
+        rates = ", ".join(
+            f"worker {worker_id}: {rate:.1f} msgs/s ({self.worker_processed[worker_id]} total)"
+            for worker_id, rate in sorted(self.worker_rates.items())
+        )
+        logger.info(
+            f"Consumer group throughput {sum(self.worker_rates.values()):.1f} msgs/s - {rates}"
+        )
+
+    def drain(self, reports, stop_event) -> None:
+        """Apply reports until stop_event is set (run in a background thread)."""
+        while not stop_event.is_set():
+            try:
+                report = reports.get(timeout=1)
+            except queue.Empty:
+                continue
+            self.apply(report)
+            if report["msgs_per_sec"]:
+                self.log_throughput()
+
+
+#####################################
+# Define Main Function
+#####################################
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a partition-parallel consumer group.")
+    parser.add_argument("--workers", type=int, default=config.get_consumer_workers())
+    parser.add_argument(
+        "--no-chart", action="store_true", help="Don't show the dashboard; just log throughput."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    start_metrics_server()
+    topic = config.get_kafka_topic()
+    kafka_url = config.get_kafka_broker_address()
+    group_id = config.get_kafka_consumer_group_id()
+    db_path = config.get_sqlite_path()
+
+    partitions = config.get_kafka_num_partitions()
+    if args.workers > partitions:
+        logger.warning(
+            f"{args.workers} workers but KAFKA_NUM_PARTITIONS={partitions}; "
+            f"{args.workers - partitions} worker(s) will sit idle."
+        )
+
+    init_db(db_path, reset=config.get_sqlite_reset_on_start())
+    base = AggregateStore(series_capacity=1)
+    base.load_from_db(db_path)
+    coordinator = Coordinator(base.totals(), config.get_aggregate_series_capacity())
+    # workers open their own connections
+    close_all()
+
+    reports = multiprocessing.Queue()
+    stop_event = multiprocessing.Event()
+    workers = [
+        multiprocessing.Process(
+            target=run_worker,
+            args=(n + 1, topic, kafka_url, group_id, reports, stop_event, config.get_settings()),
+            name=f"consumer-worker-{n + 1}",
+        )
+        for n in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    logger.info(f"Started {len(workers)} consumer workers in group '{group_id}'.")
+
+    drain_stop = threading.Event()
+    drain_thread = threading.Thread(
+        target=coordinator.drain, args=(reports, drain_stop), daemon=True
+    )
+    drain_thread.start()
+
+    try:
+        if args.no_chart:
+            while any(worker.is_alive() for worker in workers):
+                time.sleep(1)
+        else:
+            from consumers.dashboard_rogers import update_chart
+
+            update_chart(
+                StoreDashboardData(
+                    coordinator.store,
+                    config.get_chart_critic(),
+                    config.get_chart_genre(),
+                    config.get_chart_max_points(),
+                )
+            )
+    except KeyboardInterrupt:
+        logger.warning("Consumer group interrupted by user.")
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.join(timeout=30)
+            if worker.is_alive():
+                worker.terminate()
+        drain_stop.set()
+        drain_thread.join()
+        # apply the workers' final reports
+        while True:
+            try:
+                coordinator.apply(reports.get_nowait())
+            except queue.Empty:
+                break
+        coordinator.log_throughput()
+        logger.info("Consumer group shutting down.")
+
+    if any(worker.exitcode for worker in workers):
+        sys.exit(1)
+
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""
+dashboard_rogers.py
+
+Live dashboard for the movie review stream.
+
+Reads the SQLite store through a read-only connection and plots:
+- average sentiment per genre
+- number of reviews per critic
+- the sentiment time series for one critic/genre pair (CHART_CRITIC, CHART_GENRE)
+
+It can run in the same process as the consumer
+or as its own process, independent of ingest:
+
+    python -m consumers.dashboard_rogers
+
+Environment variables are in utils/utils_config module.
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from standard library
+import pathlib
+import sys
+import time
+from collections import deque
+
+# import external modules
+import matplotlib.pyplot as plt
+import matplotlib.gridspec as gridspec
+import matplotlib.dates as mdates
+import numpy as np
+
+# import from local modules
+import utils.utils_config as config
+from utils.utils_logger import logger
+from utils.utils_metrics import LAG_BUCKETS, histogram, observe_lag, start_metrics_server
+from consumers.aggregate_store_rogers import to_datetime64
+from consumers.db_sqlite_rogers import fetch_new_sentiment_points
+from consumers.sqlite_connection_rogers import close_all, get_connection_manager
+
+_REFRESH_SECONDS = histogram("buzz_dashboard_refresh_seconds", "Time to refresh the dashboard data.")
+_RENDER_SECONDS = histogram("buzz_dashboard_render_seconds", "Time to render one dashboard frame.")
+_VISIBLE_LAG = histogram(
+    "buzz_e2e_visible_lag_seconds",
+    "Seconds from a message's timestamp until its point was drawn in the sentiment series.",
+    LAG_BUCKETS,
+)
+
+#####################################
+# Figure Layout
+#####################################
+
+
+def create_figure():
+    """Create the dashboard figure and its 2x2 grid (only when a chart is shown)."""
+    fig = plt.figure(figsize=(10,8))
+    fig.patch.set_facecolor('cadetblue')
+    gs = gridspec.GridSpec(2, 2, height_ratios=[1,1])
+    return fig, gs
+
+
+#####################################
+# Incremental Dashboard Data
+#####################################
+
+
+class DashboardData:
+    """
+    Incrementally refreshed data for the live dashboard.
+
+    Keeps a high-water mark (last seen row id) for the sentiment
+    series and only fetches rows written after it; their timestamps are
+    left in new_timestamps until the next refresh. The aggregate tables are
+    re-read only when SQLite reports that another connection has committed
+    (PRAGMA data_version), so an idle refresh costs one pragma.
+    """
+
+    def __init__(self, db_path: pathlib.Path, critic: str, genre: str, max_points: int):
+        self.db_path = db_path
+        self.critic = critic
+        self.genre = genre
+        self.genre_rows = []
+        self.critic_rows = []
+        self.series = deque(maxlen=max_points)
+        self.new_timestamps = []
+        self._last_id = 0
+        self._data_version = None
+
+    def _reset_series_if_table_recreated(self, conn) -> None:
+        # init_db(reset=True) recreates streamed_messages and restarts ids
+        row = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'streamed_messages'"
+        ).fetchone()
+        if (row[0] if row else 0) < self._last_id:
+            logger.info("streamed_messages was recreated; resetting dashboard series.")
+            self.series.clear()
+            self._last_id = 0
+
+    def refresh(self) -> bool:
+        """
+        Pull whatever changed since the last refresh.
+
+        Returns:
+            bool: True if any dashboard data changed.
+        """
+        self.new_timestamps = []
+        try:
+            with get_connection_manager(self.db_path).reader() as conn:
+                data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+                if data_version == self._data_version:
+                    return False
+                self._reset_series_if_table_recreated(conn)
+
+                cursor = conn.cursor()
+                cursor.execute("SELECT genre, avg_sentiment FROM sentiment_per_genre")
+                self.genre_rows = cursor.fetchall()
+
+                cursor.execute("SELECT critic, review_count FROM critic_entry_counts")
+                self.critic_rows = cursor.fetchall()
+
+            new_points = fetch_new_sentiment_points(
+                self.critic, self.genre, self.db_path, self._last_id
+            )
+            if new_points:
+                self._last_id = new_points[-1][0]
+                self.series.extend((timestamp, sentiment) for _, timestamp, sentiment in new_points)
+                self.new_timestamps = [
+                    timestamp for _, timestamp, _ in new_points[-self.series.maxlen:]
+                ]
+            self._data_version = data_version
+            return True
+        except Exception as e:
+            logger.error(f"Error Fetching data: {e}")
+            return False
+
+
+_dashboard_data = None
+
+
+def get_dashboard_data() -> DashboardData:
+    """Return the SQLite-backed dashboard data, created on first use."""
+    global _dashboard_data
+    if _dashboard_data is None:
+        _dashboard_data = DashboardData(
+            config.get_sqlite_path(),
+            config.get_chart_critic(),
+            config.get_chart_genre(),
+            config.get_chart_max_points(),
+        )
+    return _dashboard_data
+
+
+def fetch_data():
+    """
+    Refresh the dashboard data incrementally and return it.
+
+    Returns:
+        tuple: (genre rows, critic rows, series points) - the same shapes as
+        the sentiment_per_genre, critic_entry_counts and series queries.
+    """
+    dashboard_data = get_dashboard_data()
+    dashboard_data.refresh()
+    return dashboard_data.genre_rows, dashboard_data.critic_rows, list(dashboard_data.series)
+
+  
+#####################################
+# Persistent-Artist Chart
+#####################################
+
+
+class LiveChart:
+    """
+    The three dashboard panels, built once and updated in place.
+
+    Axes, bars and the series line are created on first use; later frames
+    only call set_height()/set_data(). When the backend supports it,
+    frames are blitted: the static background (axes, ticks, labels) is
+    cached and only the data artists are redrawn. A full draw happens only
+    when categories or axis limits change.
+    """
+
+    def __init__(self, fig, gs, critic: str, genre: str, use_blit: bool = True):
+        self.fig = fig
+        self.canvas = fig.canvas
+        self.use_blit = use_blit and getattr(self.canvas, "supports_blit", False)
+        self.render_times = deque(maxlen=100)
+        self._frames = 0
+        self._background = None
+        self._needs_full_draw = True
+
+        self.ax1 = fig.add_subplot(gs[0, 0])
+        self.ax1.set_title("Average Sentiment per Category")
+        self.ax1.set_ylabel("avg_sentiment")
+        self.ax1.set_xlabel("genre")
+        self.ax1.set_facecolor("lightyellow")
+        self.ax1.set_ylim(0, 1)
+
+        self.ax2 = fig.add_subplot(gs[0, 1])
+        self.ax2.set_title("Number of Reviews per Critic")
+        self.ax2.set_ylabel("review_count")
+        self.ax2.set_xlabel("critic")
+        self.ax2.set_facecolor("lightyellow")
+        self.ax2.set_ylim(0, 25)
+
+        self.ax3 = fig.add_subplot(gs[1, :])
+        self.ax3.set_title(f"{critic} {genre} Sentiment")
+        self.ax3.set_ylabel("Sentiment")
+        self.ax3.set_xlabel("timestamp")
+        self.ax3.set_facecolor("lightyellow")
+        self.ax3.set_ylim(0, 1)
+        self.ax3.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M:%S"))
+        (self.line,) = self.ax3.plot(
+            [], [], marker="o", linestyle="-", color="lawngreen", animated=self.use_blit
+        )
+
+        self._genre_bars = None
+        self._genre_labels = ()
+        self._critic_bars = None
+        self._critic_labels = ()
+
+        fig.tight_layout()
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event) -> None:
+        # a full draw (first show, resize, limit change) invalidates the cached background
+        if self.use_blit:
+            self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+            self._draw_animated()
+
+    def _animated_artists(self) -> list:
+        artists = [self.line]
+        for bars in (self._genre_bars, self._critic_bars):
+            if bars is not None:
+                artists.extend(bars.patches)
+        return artists
+
+    def _draw_animated(self) -> None:
+        for artist in self._animated_artists():
+            artist.axes.draw_artist(artist)
+
+    def _update_bars(self, ax, bars, labels, rows, color, edgecolor):
+        """Update bar heights in place; rebuild only when the categories change."""
+        new_labels, heights = zip(*rows)
+        if new_labels != labels:
+            if bars is not None:
+                bars.remove()
+            bars = ax.bar(new_labels, heights, color=color, edgecolor=edgecolor)
+            for patch in bars.patches:
+                patch.set_animated(self.use_blit)
+            self._needs_full_draw = True
+        else:
+            for patch, height in zip(bars.patches, heights):
+                patch.set_height(height)
+        return bars, new_labels, max(heights)
+
+    def update(self, genre_rows: list, critic_rows: list, series: list) -> float:
+        """
+        Push new data into the artists and render one frame.
+
+        Returns:
+            float: Render time for this frame in milliseconds.
+        """
+        started = time.perf_counter()
+
+        if genre_rows:
+            self._genre_bars, self._genre_labels, _ = self._update_bars(
+                self.ax1, self._genre_bars, self._genre_labels, genre_rows, "blueviolet", "red"
+            )
+
+        if critic_rows:
+            self._critic_bars, self._critic_labels, top = self._update_bars(
+                self.ax2, self._critic_bars, self._critic_labels, critic_rows, "lawngreen", "orange"
+            )
+            if top > self.ax2.get_ylim()[1]:
+                self.ax2.set_ylim(0, top * 1.25)
+                self._needs_full_draw = True
+
+        if series:
+            timestamps, sentiment = zip(*series)
+            times = to_datetime64(timestamps)
+            # points whose timestamp doesn't parse can't be placed; leave them out
+            valid = ~np.isnat(times)
+            x = mdates.date2num(times[valid])
+            sentiment = np.asarray(sentiment, dtype=np.float64)[valid]
+            if len(x):
+                self.line.set_data(x, sentiment)
+                left, right = self.ax3.get_xlim()
+                if x[0] < left or x[-1] > right:
+                    # leave headroom so the limits (and background) don't change every frame
+                    span = max(x[-1] - x[0], 1 / 1440)
+                    self.ax3.set_xlim(x[0] - span * 0.02, x[-1] + span * 0.25)
+                    self._needs_full_draw = True
+
+        if not self.use_blit:
+            self.canvas.draw_idle()
+        elif self._needs_full_draw or self._background is None:
+            self.canvas.draw()  # triggers _on_draw, which recaptures the background
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.fig.bbox)
+        self._needs_full_draw = False
+        self.canvas.flush_events()
+
+        render_ms = (time.perf_counter() - started) * 1000
+        self.render_times.append(render_ms)
+        self._frames += 1
+        logger.debug(f"Rendered dashboard frame in {render_ms:.1f} ms.")
+        if self._frames % 30 == 0:
+            logger.info(
+                f"Dashboard render time over last {len(self.render_times)} frames: "
+                f"avg {sum(self.render_times) / len(self.render_times):.1f} ms, "
+                f"max {max(self.render_times):.1f} ms (blit={self.use_blit})."
+            )
+        return render_ms
+
+
+#####################################
+# Render Loop
+#####################################
+
+
+def update_chart(data=None):
+    """
+    Refresh the dashboard every CHART_REFRESH_SECONDS,
+    rendering a frame only when the data changed. A frame that fails
+    to render is logged and skipped, so the window stays up.
+
+    Args:
+        data: Data source with refresh(), genre_rows, critic_rows, series and
+              new_timestamps (points added by the last refresh). Defaults to
+              the SQLite-backed get_dashboard_data(); the consumer passes an
+              in-memory aggregate_store_rogers.StoreDashboardData instead.
+    """
+    data = data or get_dashboard_data()
+    refresh_secs = config.get_chart_refresh_seconds()
+    fig, gs = create_figure()
+    chart = LiveChart(
+        fig, gs, config.get_chart_critic(), config.get_chart_genre(), use_blit=config.get_chart_blit()
+    )
+    plt.show(block=False)
+    while plt.fignum_exists(fig.number):
+        with _REFRESH_SECONDS.time():
+            changed = data.refresh()
+        if changed:
+            series = list(data.series)
+            try:
+                _RENDER_SECONDS.observe(chart.update(data.genre_rows, data.critic_rows, series) / 1000)
+            except Exception as e:
+                # skip the frame; the next change renders again
+                logger.error(f"Error rendering dashboard frame: {e}")
+            else:
+                observe_lag(_VISIBLE_LAG, data.new_timestamps)
+        # run the GUI event loop without plt.pause(), which would force a full redraw
+        fig.canvas.start_event_loop(refresh_secs)
+
+
+#####################################
+# Define Main Function
+#####################################
+
+
+def main() -> None:
+    """
+    Run the dashboard as a standalone viewer process.
+
+    Waits for the consumer to create the database, then refreshes
+    the charts until the window is closed.
+    """
+    start_metrics_server()
+    db_path = config.get_sqlite_path()
+    logger.info(f"Starting dashboard viewer for {db_path}.")
+    while not db_path.exists():
+        logger.info("Waiting for the consumer to create the database...")
+        time.sleep(config.get_chart_refresh_seconds())
+
+    try:
+        update_chart()
+    except KeyboardInterrupt:
+        logger.warning("Dashboard interrupted by user.")
+    except Exception as e:
+        logger.error(f"ERROR: Dashboard failed: {e}")
+        sys.exit(1)
+    finally:
+        close_all()
+        logger.info("Dashboard shutting down.")
+
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,13 @@
 Has the following functions:
 - init_db(config): Initialize the SQLite database and create the 'streamed_messages' table if it doesn't exist.
 - insert_message(message, config): Insert a single processed message into the SQLite database.
+- insert_messages(messages, db_path): Insert a batch of processed messages in one transaction.
+- BatchWriter: Buffer processed messages and flush them by size or time threshold.
+- load_file_checkpoint(path, db_path) / save_file_checkpoint(cursor, ...):
+  Byte-offset checkpoints for the live file source (file_consumer_rogers.py).
+- fetch_sentiment_series(critic, genre, db_path): Sentiment time series for one critic/genre pair.
+- fetch_new_sentiment_points(...): Series points after an id high-water mark.
+- rebuild_aggregates(db_path): Recompute the aggregate tables from streamed_messages.
 
 Example JSON message
 {
@@ -24,39 +31,124 @@ Example JSON message
 # import from standard library
 import os
 import pathlib
+from collections import Counter
 import sqlite3
+import time
 
 # import from local modules
 import utils.utils_config as config
-from utils.utils_logger import logger
+from utils.utils_logger import SampledLogger, logger
+from utils.utils_metrics import LAG_BUCKETS, counter, histogram, observe_lag
+from consumers.sqlite_connection_rogers import close_all, get_connection_manager
+
+_sample = SampledLogger()
+
+_ROWS_INSERTED = counter("buzz_db_rows_inserted_total", "Messages committed to streamed_messages.")
+_INSERT_FAILURES = counter("buzz_db_insert_failures_total", "Insert transactions that failed.")
+_INSERT_SECONDS = histogram("buzz_db_insert_seconds", "Time to insert and commit one batch.")
+_COMMIT_LAG = histogram(
+    "buzz_e2e_commit_lag_seconds",
+    "Seconds from a message's timestamp until its row was committed.",
+    LAG_BUCKETS,
+)
 
 #####################################
 # Define Function to Initialize SQLite Database
 #####################################
 
+# secondary indexes on streamed_messages (name -> columns), created by init_db();
+# bulk loads drop them all and let init_db() rebuild them once
+STREAMED_MESSAGES_INDEXES = {
+    # covering index for per-critic/per-genre time series
+    "idx_streamed_messages_critic_genre_ts": "critic, genre, timestamp, sentiment",
+    # (critic, genre, id) seeks for the dashboard's incremental fetch (id is the rowid)
+    "idx_streamed_messages_critic_genre": "critic, genre",
+}
+
+
+
+def _column_types(cursor: sqlite3.Cursor, table: str) -> dict:
+    """Return {column name: declared type} for a table (empty if it doesn't exist)."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1]: row[2].upper() for row in cursor.fetchall()}
+
+
+def _upgrade_aggregate_tables(cursor: sqlite3.Cursor) -> bool:
+    """
+    Bring aggregate tables created by older versions up to the current schema
+    so a database can be reopened without a reset.
 
-def init_db(db_path: pathlib.Path):
+    Returns:
+    - bool: True if the aggregates must be rebuilt from streamed_messages.
+    """
+    needs_rebuild = False
+    genre_columns = _column_types(cursor, "sentiment_per_genre")
+    if genre_columns and "sentiment_sum" not in genre_columns:
+        logger.info("Upgrading sentiment_per_genre to running totals.")
+        cursor.execute("DROP TABLE sentiment_per_genre")
+        needs_rebuild = True
+
+    critic_columns = _column_types(cursor, "critic_entry_counts")
+    if critic_columns and critic_columns.get("review_count") != "INTEGER":
+        logger.info("Upgrading critic_entry_counts.review_count to INTEGER.")
+        cursor.execute("ALTER TABLE critic_entry_counts RENAME TO critic_entry_counts_old")
+        _create_critic_entry_counts(cursor)
+        cursor.execute(
+            """
+            INSERT INTO critic_entry_counts (critic, review_count)
+            SELECT critic, CAST(review_count AS INTEGER) FROM critic_entry_counts_old
+        """
+        )
+        cursor.execute("DROP TABLE critic_entry_counts_old")
+    return needs_rebuild
+
+
+def _create_critic_entry_counts(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS critic_entry_counts (
+        critic TEXT PRIMARY KEY,
+        review_count INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+
+
+def init_db(db_path: pathlib.Path, reset: bool = True):
     """
     Initialize the SQLite database -
     if it doesn't exist, create the 'streamed_messages' table
     and if it does, recreate it.
 
+    With reset=False existing tables are kept (and upgraded if needed),
+    so the aggregate tables carry over from the last run without a rescan.
+
     Args:
     - db_path (pathlib.Path): Path to the SQLite database file.
+    - reset (bool): Drop streamed_messages and its aggregates first.
 
     """
-    logger.info("Calling SQLite init_db() with {db_path=}.")
+    logger.info(f"Calling SQLite init_db() with {db_path=} {reset=}.")
     try:
         # Ensure the directories for the db exist
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
-        with sqlite3.connect(db_path) as conn:
+        with get_connection_manager(db_path).writer() as conn:
             cursor = conn.cursor()
             logger.info("SUCCESS: Got a cursor to execute SQL.")
 
-            cursor.execute("DROP TABLE IF EXISTS streamed_messages")
+            # tilly_sentiment is replaced by fetch_sentiment_series()
             cursor.execute("DROP TABLE IF EXISTS tilly_sentiment")
 
+            needs_rebuild = False
+            if reset:
+                cursor.execute("DROP TABLE IF EXISTS streamed_messages")
+                # running totals are derived from streamed_messages, so reset them too
+                cursor.execute("DROP TABLE IF EXISTS sentiment_per_genre")
+                cursor.execute("DROP TABLE IF EXISTS critic_entry_counts")
+                # offsets point into data that was just dropped - reread from the start
+                cursor.execute("DROP TABLE IF EXISTS file_checkpoints")
+            else:
+                needs_rebuild = _upgrade_aggregate_tables(cursor)
+
             cursor.execute(
                 """
                 CREATE TABLE IF NOT EXISTS streamed_messages (
@@ -72,116 +164,474 @@ def init_db(db_path: pathlib.Path):
             """
             )
 
+            for name, columns in STREAMED_MESSAGES_INDEXES.items():
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON streamed_messages ({columns})"
+                )
+
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS sentiment_per_genre (
                 genre TEXT PRIMARY KEY,
+                sentiment_sum REAL NOT NULL DEFAULT 0,
+                sentiment_count INTEGER NOT NULL DEFAULT 0,
                 avg_sentiment REAL
             )
             """)
 
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS critic_entry_counts (
-                critic TEXT PRIMARY KEY,
-                review_count REAL
-            )
-            """)
-
+            _create_critic_entry_counts(cursor)
 
+            # how far the file source has read each live file (same transaction as its inserts)
             cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tilly_sentiment (
-                critic TEXT,
-                timestamp DATE,
-                genre TEXT,
-                sentiment REAL
+            CREATE TABLE IF NOT EXISTS file_checkpoints (
+                path TEXT PRIMARY KEY,
+                inode INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                fingerprint TEXT,
+                updated_at TEXT NOT NULL
             )
             """)
+            if "fingerprint" not in _column_types(cursor, "file_checkpoints"):
+                cursor.execute("ALTER TABLE file_checkpoints ADD COLUMN fingerprint TEXT")
 
-            conn.commit()
+            if needs_rebuild:
+                _rebuild_aggregate_tables(cursor)
         logger.info(f"SUCCESS: Database initialized and table ready at {db_path}.")
     except Exception as e:
         logger.error(f"ERROR: Failed to initialize a sqlite database at {db_path}: {e}")
 
 
 #####################################
-# Define Function to Insert a Processed Message into the Database
+# Define Functions to Insert Processed Messages into the Database
 #####################################
 
 
-def insert_message(message: dict, db_path: pathlib.Path) -> None:
+def _message_row(message: dict) -> tuple:
+    """Return the streamed_messages column values for one processed message."""
+    return (
+        message["title"],
+        message["review"],
+        message["critic"],
+        message["timestamp"],
+        message["genre"],
+        message["sentiment"],
+        message["message_length"],
+    )
+
+
+def insert_messages(messages: list, db_path: pathlib.Path, before_commit=None) -> bool:
     """
-    Insert a single processed message into the SQLite database.
+    Insert a batch of processed messages into the SQLite database
+    using executemany() inside a single transaction.
 
     Args:
-    - message (dict): Processed message to insert.
+    - messages (list): Processed messages (dicts) to insert.
     - db_path (pathlib.Path): Path to the SQLite database file.
+    - before_commit (callable, optional): Called with the cursor after the
+      inserts, inside the same transaction (e.g. to save a source checkpoint).
+
+    Returns:
+    - bool: True if the batch was committed, False otherwise.
     """
-    logger.info("Calling SQLite insert_message() with:")
-    logger.info(f"{message=}")
-    logger.info(f"{db_path=}")
+    if not messages and before_commit is None:
+        return True
 
-    STR_PATH = str(db_path)
+    started = time.perf_counter()
     try:
-        with sqlite3.connect(STR_PATH) as conn:
+        genre_totals = {}
+        for message in messages:
+            total = genre_totals.setdefault(message["genre"], [0.0, 0])
+            total[0] += message["sentiment"]
+            total[1] += 1
+        critic_counts = Counter(message["critic"] for message in messages)
+
+        with get_connection_manager(db_path).writer() as conn:
             cursor = conn.cursor()
-            cursor.execute(
+            cursor.executemany(
                 """
                 INSERT INTO streamed_messages(
                     title,review, critic, timestamp, genre, sentiment, message_length
                 ) VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
-                (
-                    message["title"],
-                    message["review"],
-                    message["critic"],
-                    message["timestamp"],
-                    message["genre"],
-                    message["sentiment"],
-                    message["message_length"],
-                ),
+                [_message_row(message) for message in messages],
             )
 
-                        # Update category sentiment (calculate average)
-            cursor.execute(
+            # Update category sentiment from running totals (no rescan of streamed_messages)
+            cursor.executemany(
                 """
-                INSERT INTO sentiment_per_genre (genre, avg_sentiment)
-                VALUES (?, ?)
-                ON CONFLICT(genre) DO UPDATE SET avg_sentiment = (
-                    SELECT AVG(sentiment) FROM streamed_messages WHERE genre = ?
-                )
-            """, (message["genre"],
-                  message["sentiment"],
-                  message["genre"],
-                ))
-            
-            cursor.execute(
+                INSERT INTO sentiment_per_genre (
+                    genre, sentiment_sum, sentiment_count, avg_sentiment
+                ) VALUES (?, ?, ?, ?)
+                ON CONFLICT(genre) DO UPDATE SET
+                    sentiment_sum = sentiment_sum + excluded.sentiment_sum,
+                    sentiment_count = sentiment_count + excluded.sentiment_count,
+                    avg_sentiment = (sentiment_sum + excluded.sentiment_sum)
+                        / (sentiment_count + excluded.sentiment_count)
+            """,
+                [
+                    (genre, total, count, total / count)
+                    for genre, (total, count) in sorted(genre_totals.items())
+                ],
+            )
+
+            # Increment review counters with one grouped upsert per batch
+            cursor.executemany(
                 """
                 INSERT INTO critic_entry_counts (critic, review_count)
                 VALUES (?, ?)
-                ON CONFLICT(critic) DO UPDATE SET review_count = (
-                    SELECT COUNT(title) FROM streamed_messages WHERE critic = ?
-                )
-            """, (message["critic"],
-                  message["title"],
-                  message["critic"],
-                ))
-            
-            cursor.execute(
-                """
-                INSERT INTO tilly_sentiment(
-                    critic, timestamp, genre, sentiment
-                ) VALUES (?, ?, ?, ?)
+                ON CONFLICT(critic) DO UPDATE SET
+                    review_count = review_count + excluded.review_count
             """,
-                (
-                    message["critic"],
-                    message["timestamp"],
-                    message["genre"],
-                    message["sentiment"]
-                ),
+                sorted(critic_counts.items()),
             )
-            conn.commit()
-        logger.info("Inserted one message into the database.")
+
+            if before_commit is not None:
+                before_commit(cursor)
+        _INSERT_SECONDS.observe(time.perf_counter() - started)
+        _ROWS_INSERTED.inc(len(messages))
+        observe_lag(_COMMIT_LAG, [message["timestamp"] for message in messages])
+        logger.debug(f"Inserted {len(messages)} messages into the database.")
+        return True
     except Exception as e:
-        logger.error(f"ERROR: Failed to insert message into the database: {e}")
+        _INSERT_FAILURES.inc()
+        logger.error(f"ERROR: Failed to insert {len(messages)} messages into the database: {e}")
+        return False
+
+
+def insert_message(message: dict, db_path: pathlib.Path) -> None:
+    """
+    Insert a single processed message into the SQLite database.
+
+    Prefer BatchWriter (or insert_messages) on hot paths -
+    this commits one transaction per message.
+
+    Args:
+    - message (dict): Processed message to insert.
+    - db_path (pathlib.Path): Path to the SQLite database file.
+    """
+    _sample.debug("Calling SQLite insert_message() with {} for {}", lambda: message, lambda: db_path)
+
+    insert_messages([message], db_path)
+
+
+#####################################
+# Define a Batching Writer for Processed Messages
+#####################################
+
+
+class BatchWriter:
+    """
+    Buffer processed messages and flush them to SQLite in one transaction
+    when the batch size or the flush interval is reached.
+
+    Messages from a failed flush stay buffered and are retried, up to
+    max_buffered; after that, adding more blocks and retries the flush
+    with a growing delay until it succeeds, so a database outage slows
+    the source down instead of growing the buffer without bound.
+
+    Use close() (or a with block) to flush whatever is left on shutdown.
+    """
+
+    # longest wait between flush retries while the buffer is full
+    MAX_RETRY_DELAY_SECONDS = 5.0
+
+    def __init__(
+        self,
+        db_path: pathlib.Path,
+        batch_size: int = None,
+        flush_interval_secs: float = None,
+        on_flush=None,
+        max_buffered: int = None,
+    ):
+        """
+        Args:
+        - db_path (pathlib.Path): Path to the SQLite database file.
+        - batch_size (int): Flush when this many messages are buffered.
+          Defaults to SQLITE_BATCH_SIZE.
+        - flush_interval_secs (float): Flush when the oldest buffered message
+          has waited this long. Defaults to SQLITE_FLUSH_INTERVAL_SECONDS.
+        - on_flush (callable, optional): Called with each batch after it commits
+          (e.g. AggregateStore.update). Errors it raises are logged, not raised.
+        - max_buffered (int): Most messages held while flushes fail.
+          Defaults to 10 batches.
+        """
+        self.db_path = db_path
+        self.on_flush = on_flush
+        self.batch_size = batch_size or config.get_sqlite_batch_size()
+        if flush_interval_secs is None:
+            flush_interval_secs = config.get_sqlite_flush_interval_seconds()
+        self.flush_interval_secs = flush_interval_secs
+        self.max_buffered = max_buffered or 10 * self.batch_size
+        self._buffer = []
+        self._first_buffered_at = None
+        # before_commit of the last write_batch() that has not been stored yet
+        self._before_commit = None
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, message: dict) -> int:
+        """
+        Buffer one processed message and flush if a threshold is hit.
+
+        Returns:
+        - int: Number of messages written by this call (0 if only buffered).
+        """
+        self._wait_for_room(1)
+        if not self._buffer:
+            self._first_buffered_at = time.monotonic()
+        self._buffer.append(message)
+        if len(self._buffer) >= self.batch_size:
+            return self.flush()
+        return self.maybe_flush()
+
+    def write_batch(self, messages: list, before_commit=None) -> bool:
+        """
+        Buffer a whole batch (e.g. one Kafka poll) and flush it in one transaction.
+
+        Args:
+        - messages (list): Processed messages to write.
+        - before_commit (callable, optional): Passed to insert_messages(),
+          so a source position can be saved atomically with the batch.
+          If this flush fails, it is kept and used by the next flush
+          (unless a newer one is given), so the position is never
+          stored without the messages read up to it.
+
+        Returns:
+        - bool: True if nothing is left buffered, i.e. everything
+          received so far is committed.
+        """
+        self._wait_for_room(len(messages))
+        if messages and not self._buffer:
+            self._first_buffered_at = time.monotonic()
+        self._buffer.extend(messages)
+        if before_commit is not None:
+            self._before_commit = before_commit
+        self.flush()
+        return not self._buffer
+
+    def _wait_for_room(self, incoming: int) -> None:
+        """Block, retrying the flush with a growing delay, until incoming messages fit."""
+        delay = 0.1
+        while self._buffer and len(self._buffer) + incoming > self.max_buffered:
+            logger.warning(
+                f"{len(self._buffer)} messages are waiting to be stored; "
+                f"retrying in {delay:.1f}s before accepting more."
+            )
+            time.sleep(delay)
+            self.flush()
+            delay = min(delay * 2, self.MAX_RETRY_DELAY_SECONDS)
+
+    def maybe_flush(self) -> int:
+        """Flush if the oldest buffered message is older than the flush interval."""
+        if (
+            self._buffer
+            and time.monotonic() - self._first_buffered_at >= self.flush_interval_secs
+        ):
+            return self.flush()
+        return 0
+
+    def flush(self, before_commit=None) -> int:
+        """
+        Write all buffered messages in a single transaction.
+        On failure the messages stay buffered so the next flush retries them.
+
+        Args:
+        - before_commit (callable, optional): Passed to insert_messages().
+          Defaults to the one kept from a failed write_batch(). If there is
+          one, the transaction runs even with nothing buffered.
+
+        Returns:
+        - int: Number of messages written.
+        """
+        before_commit = before_commit or self._before_commit
+        if not self._buffer and before_commit is None:
+            return 0
+        batch = self._buffer
+        if not insert_messages(batch, self.db_path, before_commit):
+            return 0
+        self._buffer = []
+        self._first_buffered_at = None
+        self._before_commit = None
+        if self.on_flush is not None:
+            # the batch is committed; a failing callback must not stop the
+            # caller from committing its source position
+            try:
+                self.on_flush(batch)
+            except Exception as e:
+                logger.error(f"ERROR: on_flush failed for {len(batch)} stored messages: {e}")
+        return len(batch)
+
+    def close(self) -> None:
+        """Flush remaining messages."""
+        if self._buffer:
+            logger.info(f"Final flush of {len(self._buffer)} buffered messages.")
+        self.flush()
+
+
+#####################################
+# Define Functions for File Source Checkpoints
+#####################################
+
+
+def load_file_checkpoint(path: pathlib.Path, db_path: pathlib.Path):
+    """
+    Return the saved read position for a live file.
+
+    Args:
+    - path (pathlib.Path): The live file being tailed.
+    - db_path (pathlib.Path): Path to the SQLite database file.
+
+    Returns:
+    - tuple: (inode, offset, fingerprint, saved_at), or None if there is no
+      checkpoint yet. fingerprint identifies the file's content (None for
+      checkpoints saved before it was recorded); saved_at is when the
+      checkpoint was saved, in epoch seconds.
+    """
+    with get_connection_manager(db_path).reader() as conn:
+        row = conn.execute(
+            """
+            SELECT inode, offset, fingerprint, (julianday(updated_at) - 2440587.5) * 86400.0
+            FROM file_checkpoints WHERE path = ?
+        """,
+            (str(pathlib.Path(path).resolve()),),
+        ).fetchone()
+    return tuple(row) if row else None
+
+
+def save_file_checkpoint(
+    cursor: sqlite3.Cursor, path: pathlib.Path, inode: int, offset: int, fingerprint: str = None
+) -> None:
+    """
+    Save a live file read position. Call inside the transaction that inserts
+    the messages read up to that position (see insert_messages(before_commit=...)).
+    """
+    cursor.execute(
+        """
+        INSERT INTO file_checkpoints (path, inode, offset, fingerprint, updated_at)
+        VALUES (?, ?, ?, ?, strftime('%Y-%m-%d %H:%M:%f', 'now'))
+        ON CONFLICT(path) DO UPDATE SET
+            inode = excluded.inode,
+            offset = excluded.offset,
+            fingerprint = excluded.fingerprint,
+            updated_at = excluded.updated_at
+    """,
+        (str(pathlib.Path(path).resolve()), inode, offset, fingerprint),
+    )
+
+
+#####################################
+# Define Function to Query a Sentiment Time Series
+#####################################
+
+
+def fetch_sentiment_series(
+    critic: str, genre: str, db_path: pathlib.Path, since: str = None
+) -> list:
+    """
+    Fetch the sentiment time series for one critic and genre,
+    served from the covering (critic, genre, timestamp, sentiment) index.
+
+    Args:
+    - critic (str): Critic to filter on.
+    - genre (str): Genre to filter on.
+    - db_path (pathlib.Path): Path to the SQLite database file.
+    - since (str): Only return points with a timestamp after this one.
+
+    Returns:
+    - list: (timestamp, sentiment) tuples in timestamp order.
+    """
+    sql = """
+        SELECT timestamp, sentiment FROM streamed_messages
+        WHERE critic = ? AND genre = ?
+    """
+    params = [critic, genre]
+    if since is not None:
+        sql += " AND timestamp > ?"
+        params.append(since)
+    sql += " ORDER BY timestamp"
+    with get_connection_manager(db_path).reader() as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def fetch_new_sentiment_points(
+    critic: str, genre: str, db_path: pathlib.Path, last_id: int
+) -> list:
+    """
+    Fetch only the series points written after a high-water mark.
+
+    The mark is the row id alone: ids increase with every insert, while
+    timestamps need not (several consumer processes write in parallel).
+
+    Args:
+    - critic (str): Critic to filter on.
+    - genre (str): Genre to filter on.
+    - db_path (pathlib.Path): Path to the SQLite database file.
+    - last_id (int): id of the last point already seen (0 for none).
+
+    Returns:
+    - list: (id, timestamp, sentiment) tuples in id (insert) order.
+    """
+    with get_connection_manager(db_path).reader() as conn:
+        return conn.execute(
+            """
+            SELECT id, timestamp, sentiment FROM streamed_messages
+            WHERE critic = ? AND genre = ? AND id > ?
+            ORDER BY id
+        """,
+            (critic, genre, last_id),
+        ).fetchall()
+
+
+#####################################
+# Define Function to Rebuild Aggregate Tables
+#####################################
+
+
+def _rebuild_aggregate_tables(cursor: sqlite3.Cursor) -> None:
+    """Recompute every aggregate table from streamed_messages (one full scan each)."""
+    cursor.execute("DELETE FROM sentiment_per_genre")
+    cursor.execute(
+        """
+        INSERT INTO sentiment_per_genre (
+            genre, sentiment_sum, sentiment_count, avg_sentiment
+        )
+        SELECT genre, SUM(sentiment), COUNT(*), AVG(sentiment)
+        FROM streamed_messages
+        GROUP BY genre
+    """
+    )
+    cursor.execute("DELETE FROM critic_entry_counts")
+    cursor.execute(
+        """
+        INSERT INTO critic_entry_counts (critic, review_count)
+        SELECT critic, COUNT(*)
+        FROM streamed_messages
+        GROUP BY critic
+    """
+    )
+
+
+def rebuild_aggregates(db_path: pathlib.Path) -> None:
+    """
+    Recompute the aggregate tables from streamed_messages in one transaction.
+    Use after bulk edits or deletes that bypass the insert path.
+
+    Args:
+    - db_path (pathlib.Path): Path to the SQLite database file.
+    """
+    logger.info(f"Rebuilding aggregate tables in {db_path}.")
+    try:
+        with get_connection_manager(db_path).writer() as conn:
+            _rebuild_aggregate_tables(conn.cursor())
+        logger.info("SUCCESS: Aggregate tables rebuilt.")
+    except Exception as e:
+        logger.error(f"ERROR: Failed to rebuild aggregate tables: {e}")
 
 
 #####################################
@@ -191,18 +641,48 @@ def insert_message(message: dict, db_path: pathlib.Path) -> None:
 
 def delete_message(message_id: int, db_path: pathlib.Path) -> None:
     """
-    Delete a message from the SQLite database by its ID.
+    Delete a message from the SQLite database by its ID
+    and take it back out of the running aggregates
+    (removing a genre or critic row once its count reaches zero).
 
     Args:
     - message_id (int): ID of the message to delete.
     - db_path (pathlib.Path): Path to the SQLite database file.
     """
-    STR_PATH = str(db_path)
     try:
-        with sqlite3.connect(STR_PATH) as conn:
+        with get_connection_manager(db_path).writer() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM streamed_messages WHERE id = ?", (message_id,))
-            conn.commit()
+            cursor.execute(
+                "DELETE FROM streamed_messages WHERE id = ? RETURNING genre, critic, sentiment",
+                (message_id,),
+            )
+            row = cursor.fetchone()
+            if row:
+                genre, critic, sentiment = row
+                cursor.execute(
+                    """
+                    UPDATE sentiment_per_genre SET
+                        sentiment_sum = sentiment_sum - ?,
+                        sentiment_count = sentiment_count - 1,
+                        avg_sentiment = CASE WHEN sentiment_count > 1
+                            THEN (sentiment_sum - ?) / (sentiment_count - 1) END
+                    WHERE genre = ?
+                """,
+                    (sentiment, sentiment, genre),
+                )
+                cursor.execute(
+                    "UPDATE critic_entry_counts SET review_count = review_count - 1 WHERE critic = ?",
+                    (critic,),
+                )
+                # drop aggregates with nothing left (an empty genre has no average to chart)
+                cursor.execute(
+                    "DELETE FROM sentiment_per_genre WHERE genre = ? AND sentiment_count <= 0",
+                    (genre,),
+                )
+                cursor.execute(
+                    "DELETE FROM critic_entry_counts WHERE critic = ? AND review_count <= 0",
+                    (critic,),
+                )
         logger.info(f"Deleted message with id {message_id} from the database.")
     except Exception as e:
         logger.error(f"ERROR: Failed to delete message from the database: {e}")
@@ -215,7 +695,7 @@ def main():
     logger.info("Starting db testing.")
 
     # Use config to make a path to a parallel test database
-    DATA_PATH: pathlib.path = config.get_base_data_path
+    DATA_PATH: pathlib.Path = config.get_base_data_path()
     TEST_DB_PATH: pathlib.Path = DATA_PATH / "test_buzz.sqlite"
 
     # Initialize the SQLite database by passing in the path
@@ -224,7 +704,7 @@ def main():
 
     test_message = {
         "title": "Just a test title",
-        "message": "I just shared a meme! It was amazing.",
+        "review": "I just shared a meme! It was amazing.",
         "critic": "Charlie",
         "timestamp": "2025-01-29 14:35:20",
         "genre": "comedy",
@@ -236,11 +716,11 @@ def main():
 
     # Retrieve the ID of the inserted test message
     try:
-        with sqlite3.connect(TEST_DB_PATH, timeout=1.0) as conn:
+        with get_connection_manager(TEST_DB_PATH).reader() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT id FROM streamed_messages WHERE message = ? AND author = ?",
-                (test_message["message"], test_message["author"]),
+                "SELECT id FROM streamed_messages WHERE review = ? AND critic = ?",
+                (test_message["review"], test_message["critic"]),
             )
             row = cursor.fetchone()
             if row:
@@ -252,6 +732,7 @@ def main():
     except Exception as e:
         logger.error(f"ERROR: Failed to retrieve or delete test message: {e}")
 
+    close_all()
     logger.info("Finished testing.")
 
 
@@ -0,0 +1,384 @@
+"""
+file_consumer_rogers.py
+
+Consume json messages from the producer's live data file.
+Insert the processed messages into a database.
+
+Use this source when Kafka is down - the producer keeps writing
+data/project_live.json either way. The file is followed incrementally:
+
+- The read position (file inode, byte offset and a fingerprint of the
+  file's first bytes) is saved in the file_checkpoints table in the
+  same transaction as the messages read up to it, so a restart resumes
+  exactly where the last batch ended.
+- Rotation (the file renamed to <name>.1 and a new one started) is
+  detected by inode: the old file is read to its end first, then the
+  new one from the start. A restart after a rotation finds the
+  checkpointed file among the rotated copies by inode and fingerprint,
+  so a new file that reuses the inode is not mistaken for it. If the
+  checkpointed file is gone, reading continues with the oldest copy
+  written since the checkpoint (copies older than that were already
+  read and are not replayed) and logs that lines may have been lost.
+- A line longer than the read size is skipped with a warning.
+- Truncation in place (the file shrank below the offset) restarts
+  from the beginning of the file.
+- When no new lines arrive the poll delay doubles, from
+  FILE_POLL_MIN_SECONDS up to FILE_POLL_MAX_SECONDS, so an idle
+  consumer barely uses the CPU.
+
+Messages go through the same process_message() and batched inserts
+as the Kafka consumer.
+
+Usage:
+    python -m consumers.file_consumer_rogers [--no-reset]
+
+Environment variables are in utils/utils_config module.
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from standard library
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import sys
+import time
+
+# import from local modules
+import utils.utils_config as config
+from utils.utils_logger import RateSummary, logger
+from utils.utils_metrics import start_metrics_server
+from consumers.db_sqlite_rogers import (
+    BatchWriter,
+    init_db,
+    load_file_checkpoint,
+    save_file_checkpoint,
+)
+from consumers.kafka_consumer_rogers import process_messages
+from consumers.sqlite_connection_rogers import close_all
+
+#####################################
+# Follow a Live File
+#####################################
+
+# leading bytes hashed to tell a file apart from a later one that reuses its inode
+FINGERPRINT_BYTES = 4096
+
+
+def _hash_prefix(file, length: int) -> str:
+    """Hash the first length bytes of an open binary file."""
+    file.seek(0)
+    return hashlib.blake2b(file.read(length), digest_size=16).hexdigest()
+
+
+
+class FileTailer:
+    """
+    Read complete lines appended to a file, following rotation and truncation.
+
+    `inode`, `offset` and `fingerprint()` are the position just after the
+    last line returned - save them once those lines are stored.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        inode: int = None,
+        offset: int = 0,
+        fingerprint: str = None,
+        saved_at: float = None,
+    ):
+        """
+        Args:
+            path (pathlib.Path): The live file to follow.
+            inode (int, optional): Checkpointed inode to resume from.
+            offset (int): Checkpointed byte offset in that inode.
+            fingerprint (str, optional): Checkpointed fingerprint() of that file.
+                Without one, the inode alone identifies it.
+            saved_at (float, optional): When the checkpoint was saved (epoch
+                seconds). If the file is gone, rotated copies last written
+                before then are not read again.
+        """
+        self.path = pathlib.Path(path)
+        self._file = None
+        self._fingerprint = None
+        self.inode = None
+        self.offset = 0
+
+        if inode is not None:
+            for candidate in [self.path] + sorted(self.path.parent.glob(f"{self.path.name}.*")):
+                if self._inode_of(candidate) == inode and self._matches(candidate, offset, fingerprint):
+                    self._open(candidate, offset)
+                    if candidate != self.path:
+                        logger.info(f"Resuming rotated file {candidate} at byte {offset}.")
+                    break
+            else:
+                start = self._oldest_since(saved_at)
+                logger.warning(
+                    f"Checkpointed file (inode {inode}) for {self.path} is gone and any lines "
+                    f"left in it are lost; starting at the beginning of {start}."
+                )
+                self._open(start, 0)
+        if self._file is None:
+            self._open(self.path, 0)
+
+    @staticmethod
+    def _inode_of(path: pathlib.Path):
+        try:
+            return os.stat(path).st_ino
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _matches(path: pathlib.Path, offset: int, fingerprint: str) -> bool:
+        """Return True if path starts with the bytes the fingerprint was taken from."""
+        if fingerprint is None:
+            return True
+        try:
+            with open(path, "rb") as file:
+                matches = _hash_prefix(file, min(offset, FINGERPRINT_BYTES)) == fingerprint
+        except FileNotFoundError:
+            return False
+        if not matches:
+            logger.warning(f"{path} reuses the checkpointed inode but is a different file.")
+        return matches
+
+    def _open(self, path: pathlib.Path, offset: int) -> None:
+        self._fingerprint = None
+        try:
+            self._file = open(path, "rb")
+        except FileNotFoundError:
+            self._file = None
+            return
+        self.inode = os.fstat(self._file.fileno()).st_ino
+        self.offset = offset
+
+    def fingerprint(self) -> str:
+        """
+        Return a hash of the first FINGERPRINT_BYTES bytes read so far from
+        the current file. Those bytes never change once written, so a file
+        that later reuses the inode will not match it.
+        """
+        length = min(self.offset, FINGERPRINT_BYTES)
+        if self._fingerprint is None or self._fingerprint[0] != length:
+            self._fingerprint = (length, _hash_prefix(self._file, length))
+        return self._fingerprint[1]
+
+    def read_lines(self, max_bytes: int = 1 << 20) -> list:
+        """
+        Return complete lines (bytes, without newlines) appended since the
+        last call, up to about max_bytes. A trailing partial line is left
+        for the next call.
+        """
+        if self._file is None:
+            self._open(self.path, 0)
+            if self._file is None:
+                return []
+
+        path_inode = self._inode_of(self.path)
+        if path_inode == self.inode and os.fstat(self._file.fileno()).st_size < self.offset:
+            logger.warning(f"{self.path} was truncated; reading from the start.")
+            self.offset = 0
+            self._fingerprint = None
+
+        self._file.seek(self.offset)
+        data = self._file.read(max_bytes)
+        end = data.rfind(b"\n")
+        if end >= 0:
+            self.offset += end + 1
+            return data[:end].split(b"\n")
+        if len(data) == max_bytes and self._skip_long_line(max_bytes):
+            return self.read_lines(max_bytes)
+
+        if path_inode is not None and path_inode != self.inode:
+            # the file we hold was rotated away and is fully read - move to the next one
+            if data:
+                logger.warning(f"Dropping {len(data)} bytes of incomplete last line in rotated file.")
+            successor = self._successor()
+            logger.info(f"{self.path} was rotated; following {successor}.")
+            self._file.close()
+            self._open(successor, 0)
+            return self.read_lines(max_bytes)
+        return []
+
+    def _skip_long_line(self, max_bytes: int) -> bool:
+        """
+        Skip a line longer than max_bytes that starts at the current offset.
+
+        Returns:
+            bool: True if the line was complete and skipped; False if its
+            end has not been written yet (try again later).
+        """
+        skipped = max_bytes
+        while chunk := self._file.read(max_bytes):
+            newline = chunk.find(b"\n")
+            if newline >= 0:
+                skipped += newline + 1
+                logger.warning(
+                    f"Skipping a {skipped}-byte line at byte {self.offset} of {self.path} "
+                    f"(longer than {max_bytes} bytes)."
+                )
+                self.offset += skipped
+                return True
+            skipped += len(chunk)
+        return False
+
+    def _rotated(self) -> list:
+        """Return the existing rotated copies, newest (<name>.1) first."""
+        rotated = []
+        while (path := self.path.with_name(f"{self.path.name}.{len(rotated) + 1}")).exists():
+            rotated.append(path)
+        return rotated
+
+    def _oldest_since(self, saved_at: float = None) -> pathlib.Path:
+        """
+        Return the oldest rotated copy written to at or after saved_at (any
+        copy if saved_at is None), or the live file if there is none.
+        """
+        rotated = [
+            path for path in self._rotated() if saved_at is None or os.stat(path).st_mtime >= saved_at
+        ]
+        return rotated[-1] if rotated else self.path
+
+    def _successor(self) -> pathlib.Path:
+        """
+        Return the file written after the one we hold. If it now sits at
+        <name>.N, that is <name>.N-1 (several rotations may have happened
+        while we were behind). If it has been rotated past the last kept
+        copy (or deleted), the files written right after it are gone too,
+        so continue with the oldest copy that is left.
+        """
+        rotated = self._rotated()
+        for n, path in enumerate(rotated, start=1):
+            if self._inode_of(path) == self.inode:
+                return self.path if n == 1 else rotated[n - 2]
+        # only copies written after ours (not older ones, if ours was deleted by hand)
+        last_written = os.fstat(self._file.fileno()).st_mtime
+        newer = [path for path in rotated if os.stat(path).st_mtime >= last_written]
+        if newer:
+            logger.warning(
+                f"The file being read was rotated out or deleted before {self.path} was "
+                f"caught up; lines in any copies removed since are lost. "
+                f"Continuing with the oldest kept copy, {newer[-1]}."
+            )
+            return newer[-1]
+        return self.path
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+#####################################
+# Consume Messages from the Live File
+#####################################
+
+
+def parse_line(line: bytes) -> dict:
+    """Decode one JSON line; returns None (and logs) if it is malformed."""
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        logger.error(f"Skipping malformed line: {e}")
+        return None
+
+
+def consume_messages_from_file(
+    live_data_path: pathlib.Path, db_path: pathlib.Path, store=None, stop_event=None
+) -> None:
+    """
+    Follow the live data file and store its messages in batches.
+
+    Args:
+    - live_data_path (pathlib.Path): File written by the producer.
+    - db_path (pathlib.Path): Path to the SQLite database file.
+    - store (AggregateStore, optional): In-memory aggregates to update
+      after each committed batch.
+    - stop_event (threading.Event, optional): Return once it is set.
+    """
+    min_delay = config.get_file_poll_min_seconds()
+    max_delay = config.get_file_poll_max_seconds()
+
+    checkpoint = load_file_checkpoint(live_data_path, db_path)
+    if checkpoint:
+        logger.info(f"Resuming {live_data_path} from inode {checkpoint[0]}, byte {checkpoint[1]}.")
+        tailer = FileTailer(live_data_path, *checkpoint)
+    else:
+        tailer = FileTailer(live_data_path)
+
+    writer = BatchWriter(db_path, on_flush=store.update if store is not None else None)
+    rate = RateSummary("File consumer")
+    delay = min_delay
+    try:
+        while stop_event is None or not stop_event.is_set():
+            start_position = (tailer.inode, tailer.offset)
+            lines = tailer.read_lines()
+            if (tailer.inode, tailer.offset) == start_position:
+                time.sleep(delay)
+                delay = min(delay * 2, max_delay)
+                continue
+            delay = min_delay
+
+            processed = process_messages(parse_line(line) for line in lines if line.strip())
+            inode, offset, fingerprint = tailer.inode, tailer.offset, tailer.fingerprint()
+            if not writer.write_batch(
+                processed,
+                before_commit=lambda cursor: save_file_checkpoint(
+                    cursor, live_data_path, inode, offset, fingerprint
+                ),
+            ):
+                logger.warning("Batch not stored; checkpoint not advanced, will retry.")
+            else:
+                rate.add(len(processed))
+    except KeyboardInterrupt:
+        logger.warning("File consumer interrupted by user.")
+    finally:
+        writer.close()
+        tailer.close()
+
+
+#####################################
+# Define Main Function
+#####################################
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Consume movie reviews from the live data file into SQLite.")
+    parser.add_argument(
+        "--no-reset",
+        action="store_true",
+        help="Keep stored messages (and the file checkpoint) even if SQLITE_RESET_ON_START is true.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    start_metrics_server()
+    logger.info("Starting file consumer to run continuously.")
+
+    live_data_path = config.get_live_data_path()
+    db_path = config.get_sqlite_path()
+
+    try:
+        init_db(db_path, reset=config.get_sqlite_reset_on_start() and not args.no_reset)
+        consume_messages_from_file(live_data_path, db_path)
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        sys.exit(4)
+    finally:
+        close_all()
+        logger.info("File consumer shutting down.")
+
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,16 @@ kafka_consumer_rogers.py
 Consume json messages from a live data file. 
 Insert the processed messages into a database.
 
+Run modes (--mode, or CONSUMER_MODE in .env):
+- combined: consumer thread plus the dashboard in one process (default)
+- ingest: consume and store only, no dashboard
+- supervisor: ingest and the dashboard (consumers/dashboard_rogers.py)
+  as separate processes, each restarted on its own if it crashes
+
+--no-chart runs headless: combined becomes ingest and the supervisor
+starts no viewers. matplotlib is only imported when a chart is shown,
+so importing this module (e.g. for process_message()) stays cheap.
+
 Example JSON message
 {
     "title" : "Python, the Rise of code"
@@ -24,119 +34,65 @@ Environment variables are in utils/utils_config module.
 #####################################
 
 # import from standard library
-import json
+import argparse
 import os
-import pathlib
+import subprocess
 import sys
-import sqlite3
-import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
-from matplotlib import colors as mcolors
-
-
+import threading
+import time
 
 # import external modules
 from kafka import KafkaConsumer
 
 # import from local modules
 import utils.utils_config as config
-from utils.utils_consumer import create_kafka_consumer
-from utils.utils_logger import logger
-from utils.utils_producer import verify_services, is_topic_available
+from utils.utils_codec import decode_record
+from utils.utils_consumer import create_kafka_consumer, offset_and_metadata
+from utils.utils_logger import RateSummary, SampledLogger, logger
+from utils.utils_metrics import counter, histogram, start_metrics_server
 
 # Ensure the parent directory is in sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from consumers.db_sqlite_rogers import init_db, insert_message
-
-fig = plt.figure(figsize=(10,8))
-fig.patch.set_facecolor('cadetblue')
-gs = gridspec.GridSpec(2, 2, height_ratios=[1,1])
-plt.ion()
+from consumers.db_sqlite_rogers import init_db, BatchWriter
+from consumers.sqlite_connection_rogers import close_all
+from consumers.aggregate_store_rogers import AggregateStore, StoreDashboardData
 
+# per-message details are sampled; throughput is summarized instead
+_sample = SampledLogger()
 
-DB_PATH = config.get_sqlite_path()
+_PROCESSED = counter("buzz_consumer_messages_processed_total", "Messages processed.")
+_INVALID = counter("buzz_consumer_messages_invalid_total", "Messages that could not be processed.")
+_PROCESS_SECONDS = histogram(
+    "buzz_consumer_process_seconds", "Time to process one message (averaged over its batch)."
+)
 
-def fetch_data():
-    try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
 
-            cursor.execute("SELECT genre, avg_sentiment FROM sentiment_per_genre")
-            visual_data1 = cursor.fetchall()
+#####################################
+# Function to decode a single Kafka record
+#####################################
 
-            cursor.execute("SELECT critic, review_count FROM critic_entry_counts")
-            critic_data = cursor.fetchall()
 
-           
-            cursor.execute("SELECT critic,timestamp,genre,sentiment FROM tilly_sentiment WHERE critic =? AND genre =?", ("Tilly", "Action"))
-            tilly_data = cursor.fetchall()
+def decode_message(record) -> dict:
+    """
+    Decode a Kafka record's value with the codec named in its headers.
 
+    Args:
+        record (ConsumerRecord): The record as returned by the consumer.
 
-        return visual_data1, critic_data, tilly_data
+    Returns:
+        dict: The message, or None (logged and counted as invalid) if the
+        codec is unknown or the value is corrupt, so one bad record is
+        skipped instead of stopping the consumer.
+    """
+    try:
+        return decode_record(record.value, record.headers)
     except Exception as e:
-        logger.error(f"Error Fetching data: {e}")
-
-  
-def update_chart():
-    while True:
-        visual_data1, critic_data, tilly_data = fetch_data() 
-
-
-        if visual_data1:
-
-            ax1 = fig.add_subplot(gs[0,0])
-            ax1.clear() #clear previous chart
-
-            genre, avg_sentiment = zip(*visual_data1)
-
-        
-
-            ax1.bar(genre, avg_sentiment, color="blueviolet", edgecolor ='red')
-            ax1.set_title("Average Sentiment per Category")
-            ax1.set_ylabel("avg_sentiment")
-            ax1.set_xlabel("genre")
-            ax1.set_facecolor("lightyellow")
-            ax1.set_ylim(0,1)
-
-        #visual 2
-        if critic_data:
-
-            critic, review_count = zip(*critic_data)
-
-            ax2 = fig.add_subplot(gs[0,1])
-            ax2.clear()
-
-            ax2.bar(critic, review_count, color="lawngreen", edgecolor ='orange')
-            ax2.set_title("Number of Reviews per Critic")
-            ax2.set_ylabel("review_count")
-            ax2.set_xlabel("critic")
-            ax2.set_facecolor("lightyellow")
-            ax2.set_ylim(0,25)
-
-        #visual 3
-        if tilly_data:
-
-            critic, timestamp, genre, sentiment  = zip(*tilly_data)
-            ax3 = fig.add_subplot(gs[1, :])
-            ax3.clear()
-        
-            ax3.plot(timestamp, sentiment, marker ='o', linestyle = '-', color="lawngreen")
-            ax3.set_title("Tilly Action Sentiment")
-            ax3.set_ylabel("Sentiment")
-            ax3.set_xlabel("timestamp")
-            ax3.set_facecolor("lightyellow")
-            ax3.set_ylim(0,1)
-       
-
-        
-
-        plt.tight_layout()
-        plt.draw()
-        plt.pause(2)
-
-   
+        _INVALID.inc()
+        logger.error(
+            f"Skipping undecodable record {record.topic}[{record.partition}]@{record.offset}: {e}"
+        )
+        return None
 
- 
 
 #####################################
 # Function to process a single message
@@ -151,8 +107,6 @@ def process_message(message: dict) -> None:
     Args:
         message (dict): The JSON message as a Python dictionary.
     """
-    logger.info("Called process_message() with:")
-    logger.info(f"   {message=}")
     try:
         processed_message = {
             "title": message.get("title"),
@@ -163,12 +117,38 @@ def process_message(message: dict) -> None:
             "sentiment": float(message.get("sentiment", 0.0)),
             "message_length": int(message.get("message_length", 0)),
         }
-        logger.info(f"Processed message: {processed_message}")
+        _sample.debug("Processed message: {}", lambda: processed_message)
         return processed_message
-        #insert_message(processed_message, DB_PATH)
+        #insert_message(processed_message, config.get_sqlite_path())
     except Exception as e:
+        _INVALID.inc()
         logger.error(f"Error processing message: {e}")
         return None
+
+
+def process_messages(messages) -> list:
+    """
+    Process a batch of messages, skipping any that fail.
+
+    Metrics are recorded once per batch rather than per message, so they
+    add almost nothing to the per-message cost.
+
+    Args:
+        messages (iterable): JSON messages as Python dictionaries (None entries are skipped).
+
+    Returns:
+        list: The processed messages.
+    """
+    started = time.perf_counter()
+    processed = [
+        processed_message
+        for message in messages
+        if message and (processed_message := process_message(message))
+    ]
+    if processed:
+        _PROCESSED.inc(len(processed))
+        _PROCESS_SECONDS.observe((time.perf_counter() - started) / len(processed), len(processed))
+    return processed
     
 
 
@@ -180,29 +160,60 @@ def process_message(message: dict) -> None:
 def consume_messages_from_kafka(
     topic: str,
     kafka_url: str,
-    group: str
+    group: str,
+    store: AggregateStore = None,
+    stop_event=None,
+    on_batch=None,
 ):
     """
     Consume new messages from Kafka topic and process them.
-    Each message is expected to be JSON-formatted.
+    Each message is decoded with the codec named in its headers
+    (see utils/utils_codec.py); messages without one are JSON.
+
+    In batch mode (KAFKA_POLL_MODE=batch, the default) each poll() of up to
+    KAFKA_POLL_MAX_RECORDS records is processed and inserted in one
+    transaction, and the offsets of exactly those records are committed
+    only after that transaction succeeds - records polled but not yet
+    stored are never committed, even on shutdown. In record mode messages
+    are iterated one at a time with auto-commit, buffered, and written in
+    batches (see SQLITE_BATCH_SIZE and SQLITE_FLUSH_INTERVAL_SECONDS).
+    Anything still buffered is flushed on shutdown.
 
     Args:
     - topic (str): Kafka topic to consume messages from.
     - kafka_url (str): Kafka broker address.
     - group (str): Consumer group ID for Kafka.
-    - sql_path (pathlib.Path): Path to the SQLite database file.
-    - interval_secs (int): Interval between reads from the file.
+    - store (AggregateStore, optional): In-memory aggregates to update
+      after each committed batch.
+    - stop_event (threading.Event or multiprocessing.Event, optional):
+      Return (after a final flush and commit) once it is set.
+    - on_batch (callable, optional): Called after each poll with the list
+      of processed messages that were stored.
+
+    Record mode blocks in the consumer iterator and can honour neither,
+    so a caller passing stop_event or on_batch (e.g. a consumer group
+    worker) always gets batch mode.
     """
     logger.info("Called consume_messages_from_kafka() with:")
     logger.info(f"   {topic=}")
     logger.info(f"   {kafka_url=}")
     logger.info(f"   {group=}")
 
+    poll_mode = config.get_kafka_poll_mode()
+    if poll_mode != "batch" and (stop_event is not None or on_batch is not None):
+        logger.info(f"KAFKA_POLL_MODE={poll_mode} ignored: stop_event/on_batch need batch mode.")
+        poll_mode = "batch"
+    max_records = config.get_kafka_poll_max_records()
+    timeout_ms = config.get_kafka_poll_timeout_ms()
+
     try:
         consumer: KafkaConsumer = create_kafka_consumer(
             topic,
             group,
-            value_deserializer_provided=lambda x: json.loads(x.decode("utf-8")),
+            # values stay raw bytes; decode_message() decodes each one with its header's codec
+            value_deserializer_provided=lambda x: x,
+            enable_auto_commit=poll_mode != "batch",
+            max_poll_records=max_records,
         )
     except Exception as e:
         logger.error(f"ERROR: Could not create Kafka consumer: {e}")
@@ -212,28 +223,200 @@ def consume_messages_from_kafka(
         logger.error("ERROR: Consumer is None. Exiting.")
         sys.exit(13)
 
+    writer = BatchWriter(config.get_sqlite_path(), on_flush=store.update if store is not None else None)
+    rate = RateSummary("Kafka consumer")
+    # next offset per partition for records handed to the writer, committed once they are stored
+    pending_offsets = {}
     try:
-        for message in consumer:
-            processed_message = process_message(message.value)
-            if processed_message:
-                insert_message(processed_message, DB_PATH)
+        if poll_mode == "batch":
+            while stop_event is None or not stop_event.is_set():
+                records = consumer.poll(timeout_ms=timeout_ms, max_records=max_records)
+                if not records:
+                    if on_batch is not None:
+                        on_batch([])
+                    continue
+                processed = process_messages(
+                    decode_message(record)
+                    for partition_records in records.values()
+                    for record in partition_records
+                )
+                stored = writer.write_batch(processed)
+                for partition, partition_records in records.items():
+                    pending_offsets[partition] = offset_and_metadata(partition_records[-1].offset + 1)
+                if stored:
+                    consumer.commit(offsets=dict(pending_offsets))
+                    pending_offsets.clear()
+                    rate.add(len(processed))
+                    if on_batch is not None:
+                        on_batch(processed)
+                else:
+                    logger.warning("Batch not stored; offsets not committed, will retry.")
+        else:
+            for record in consumer:
+                for processed_message in process_messages([decode_message(record)]):
+                    writer.add(processed_message)
+                    rate.add()
     
     except KeyboardInterrupt:
         logger.warning("Consumer interrupted by user")
     except Exception as e:
         logger.error(f"ERROR: Could not consume messages from Kafka: {e}")
         raise
+    finally:
+        writer.close()
+        if pending_offsets and not len(writer):
+            # the final flush stored the records behind these offsets
+            try:
+                consumer.commit(offsets=pending_offsets)
+            except Exception as e:
+                logger.warning(f"Could not commit final offsets: {e}")
+        consumer.close()
+
+#####################################
+# Supervise Ingest and Dashboard Processes
+#####################################
+
+
+def supervisor_commands(ingest_processes: int, viewer_processes: int, metrics_port: int = 0) -> dict:
+    """
+    Return name -> (command, environment) for the supervisor's children.
+
+    With METRICS_PORT set, each child serves its own metrics on the next
+    port (ingest-1 on METRICS_PORT, ingest-2 on METRICS_PORT + 1, then the
+    viewers); the supervisor itself serves none.
+    """
+    commands = {}
+    for n in range(ingest_processes):
+        commands[f"ingest-{n + 1}"] = [
+            sys.executable, "-m", "consumers.kafka_consumer_rogers", "--mode", "ingest", "--no-reset",
+        ]
+    for n in range(viewer_processes):
+        commands[f"viewer-{n + 1}"] = [sys.executable, "-m", "consumers.dashboard_rogers"]
+    if not metrics_port:
+        return {name: (command, None) for name, command in commands.items()}
+    return {
+        name: (command, dict(os.environ, METRICS_PORT=str(metrics_port + index)))
+        for index, (name, command) in enumerate(commands.items())
+    }
+
+
+def run_supervisor(ingest_processes: int = 1, viewer_processes: int = 1) -> None:
+    """
+    Run ingest and the dashboard as independent child processes.
+
+    A crashed child is restarted (with a growing delay if it keeps failing).
+    A viewer that exits cleanly - the chart window was closed - is not
+    restarted, and ingest keeps running. Stop everything with Ctrl+C.
+
+    Args:
+        ingest_processes (int): Ingest processes to run (same consumer group).
+        viewer_processes (int): Dashboard viewer processes to run.
+    """
+    commands = supervisor_commands(ingest_processes, viewer_processes, config.get_metrics_port())
+
+    children = {}
+    started_at = {}
+    restart_at = {}
+    restart_delays = {name: 1.0 for name in commands}
+
+    def start(name):
+        command, env = commands[name]
+        children[name] = subprocess.Popen(command, env=env)
+        started_at[name] = time.monotonic()
+        logger.info(f"Started {name} (pid {children[name].pid}).")
+
+    for name in commands:
+        start(name)
+
+    try:
+        while children or restart_at:
+            time.sleep(1)
+            now = time.monotonic()
+            for name, due in list(restart_at.items()):
+                if now >= due:
+                    del restart_at[name]
+                    start(name)
+            for name, child in list(children.items()):
+                returncode = child.poll()
+                if returncode is None:
+                    continue
+                del children[name]
+                if name.startswith("viewer") and returncode == 0:
+                    logger.info(f"{name} closed; ingest keeps running.")
+                    continue
+                if now - started_at[name] > 60:
+                    restart_delays[name] = 1.0  # it ran fine for a while - not a crash loop
+                logger.warning(
+                    f"{name} exited with code {returncode}; restarting in {restart_delays[name]:.0f}s."
+                )
+                restart_at[name] = now + restart_delays[name]
+                restart_delays[name] = min(restart_delays[name] * 2, 60.0)
+    finally:
+        for name, child in children.items():
+            if child.poll() is None:
+                child.terminate()
+        for name, child in children.items():
+            try:
+                child.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                child.kill()
+        logger.info("Supervisor stopped all child processes.")
+
 
 #####################################
 # Define Main Function
 #####################################
-def main():
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Consume movie reviews from Kafka into SQLite.")
+    parser.add_argument(
+        "--mode",
+        choices=["combined", "ingest", "supervisor"],
+        default=config.get_consumer_mode(),
+        help=(
+            "combined: ingest thread + dashboard in one process; "
+            "ingest: consume only; "
+            "supervisor: ingest and dashboard as separate, restartable processes"
+        ),
+    )
+    parser.add_argument(
+        "--no-reset",
+        action="store_true",
+        help="Keep stored messages even if SQLITE_RESET_ON_START is true.",
+    )
+    parser.add_argument(
+        "--no-chart",
+        action="store_true",
+        help=(
+            "Headless: never import matplotlib. Combined mode runs as ingest; "
+            "supervisor mode starts no dashboard viewers."
+        ),
+    )
+    parser.add_argument(
+        "--ingest-processes", type=int, default=1, help="Supervisor mode: ingest processes to run."
+    )
+    parser.add_argument(
+        "--viewer-processes", type=int, default=1, help="Supervisor mode: dashboard processes to run."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """
     Main function to run the consumer process.
 
     Reads configuration, initializes the database, and starts consumption.
     """
-    logger.info("Starting Consumer to run continuously.")
+    args = parse_args(argv)
+    if args.no_chart:
+        if args.mode == "combined":
+            args.mode = "ingest"
+        args.viewer_processes = 0
+    if args.mode != "supervisor":
+        # supervised children serve metrics on their own ports instead
+        start_metrics_server()
+    logger.info(f"Starting Consumer to run continuously in {args.mode} mode.")
     logger.info("Things can fail or get interrupted, so use a try block.")
     logger.info("Moved .env variables into a utils config module.")
 
@@ -242,48 +425,66 @@ def main():
         topic = config.get_kafka_topic()
         kafka_url = config.get_kafka_broker_address()
         group_id = config.get_kafka_consumer_group_id()
-
-        
-
-
+        db_path = config.get_sqlite_path()
     except Exception as e:
         logger.error(f"ERROR: Failed to read environment variables: {e}")
         sys.exit(1)
 
-
-
-
     logger.info("STEP 3. Initialize a new database with an empty table.")
     try:
-        init_db(DB_PATH)
+        init_db(db_path, reset=config.get_sqlite_reset_on_start() and not args.no_reset)
     except Exception as e:
         logger.error(f"ERROR: Failed to create db table: {e}")
         sys.exit(3)
 
     logger.info("STEP 4. Begin consuming and storing messages.")
+    stop_event = threading.Event()
+    consumer_thread = None
     try:
-
-        #consume_messages_from_kafka(
-        #topic, kafka_url, group_id
-        #)
-
-        import threading
-        consumer_thread = threading.Thread(target= consume_messages_from_kafka, args=(topic,kafka_url,group_id))
-        consumer_thread.daemon = True
-        consumer_thread.start()
-
-        update_chart()
-
-    
-
+        if args.mode == "supervisor":
+            # release the writer so child processes start from a closed database
+            close_all()
+            run_supervisor(args.ingest_processes, args.viewer_processes)
+        elif args.mode == "ingest":
+            consume_messages_from_kafka(topic, kafka_url, group_id)
+        else:
+            # the chart reads aggregates from memory; SQLite is only for durability
+            store = AggregateStore(config.get_aggregate_series_capacity())
+            store.load_from_db(db_path)
+            consumer_thread = threading.Thread(
+                target=consume_messages_from_kafka,
+                args=(topic, kafka_url, group_id, store),
+                kwargs={"stop_event": stop_event},
+            )
+            consumer_thread.daemon = True
+            consumer_thread.start()
+
+            # imported here so ingest-only runs never load matplotlib or need a display
+            from consumers.dashboard_rogers import update_chart
+
+            update_chart(
+                StoreDashboardData(
+                    store,
+                    config.get_chart_critic(),
+                    config.get_chart_genre(),
+                    config.get_chart_max_points(),
+                )
+            )
 
     except KeyboardInterrupt:
         logger.warning("Consumer interrupted by user.")
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
+        sys.exit(4)
     finally:
+        if consumer_thread is not None:
+            # let ingest flush its last batch and commit offsets before the connections close
+            stop_event.set()
+            consumer_thread.join(timeout=30)
+            if consumer_thread.is_alive():
+                logger.warning("Consumer thread did not stop within 30s.")
+        close_all()
         logger.info("Consumer shutting down.")
-    
 
 
 #####################################
@@ -0,0 +1,39 @@
+"""
+rebuild_aggregates_rogers.py
+
+One-shot command to recompute the aggregate tables
+(e.g. sentiment_per_genre) from the streamed_messages table.
+
+The consumer keeps the aggregates up to date incrementally,
+so this is only needed after editing streamed_messages directly.
+
+Usage:
+    python -m consumers.rebuild_aggregates_rogers
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from local modules
+import utils.utils_config as config
+from utils.utils_logger import logger
+from consumers.db_sqlite_rogers import rebuild_aggregates
+
+#####################################
+# Define Main Function
+#####################################
+
+
+def main() -> None:
+    db_path = config.get_sqlite_path()
+    logger.info(f"Rebuilding aggregates for {db_path}.")
+    rebuild_aggregates(db_path)
+
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+sqlite_connection_rogers.py
+
+Connection management for the SQLite store.
+
+Has the following:
+- get_pragma_profile(): Build the writer pragma profile from utils_config.
+- SQLiteConnectionManager: Holds one long-lived, tuned writer connection
+  and hands out cached read-only connections to readers.
+- get_connection_manager(db_path): Return the shared manager for a database file.
+- close_all(): Close every cached connection (call on shutdown).
+
+With WAL journaling the chart reader no longer blocks the writer
+(and vice versa), and the writer no longer pays connect/teardown
+plus a full fsync for every transaction.
+
+Run this module directly to measure writer throughput and
+reader latency under concurrent load for the configured profile
+against SQLite's default settings:
+
+    python -m consumers.sqlite_connection_rogers
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from standard library
+import os
+import pathlib
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# import from local modules
+import utils.utils_config as config
+from utils.utils_logger import logger
+from utils.utils_metrics import percentile
+
+#####################################
+# Pragma Profiles
+#####################################
+
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+TEMP_STORE_MODES = {"DEFAULT", "FILE", "MEMORY"}
+
+# SQLite's own defaults - used as the comparison point in main()
+DEFAULT_PROFILE = {
+    "journal_mode": "DELETE",
+    "synchronous": "FULL",
+    "cache_size": -2000,
+    "mmap_size": 0,
+    "temp_store": "DEFAULT",
+    "busy_timeout": 5000,
+}
+
+
+def get_pragma_profile() -> dict:
+    """
+    Build the writer pragma profile from the environment (see utils_config).
+
+    Returns:
+        dict: pragma name -> value.
+    """
+    return {
+        "journal_mode": config.get_sqlite_journal_mode(),
+        "synchronous": config.get_sqlite_synchronous(),
+        "cache_size": config.get_sqlite_cache_size(),
+        "mmap_size": config.get_sqlite_mmap_size(),
+        "temp_store": config.get_sqlite_temp_store(),
+        "busy_timeout": config.get_sqlite_busy_timeout_ms(),
+    }
+
+
+def _validated(profile: dict) -> dict:
+    """Check enumerated pragma values (pragmas can't take bound parameters)."""
+    checked = dict(profile)
+    for name, allowed in (
+        ("journal_mode", JOURNAL_MODES),
+        ("synchronous", SYNCHRONOUS_MODES),
+        ("temp_store", TEMP_STORE_MODES),
+    ):
+        value = str(checked[name]).upper()
+        if value not in allowed:
+            raise ValueError(f"Invalid SQLite {name} '{value}'. Use one of {sorted(allowed)}.")
+        checked[name] = value
+    for name in ("cache_size", "mmap_size", "busy_timeout"):
+        checked[name] = int(checked[name])
+    return checked
+
+
+#####################################
+# Connection Manager
+#####################################
+
+
+class SQLiteConnectionManager:
+    """
+    One persistent writer connection plus per-thread read-only connections
+    for a single SQLite database file.
+
+    The writer is shared across threads and guarded by a lock;
+    use it through writer(), which commits on success and rolls back on error.
+    """
+
+    def __init__(self, db_path: pathlib.Path, pragmas: dict = None):
+        """
+        Args:
+            db_path (pathlib.Path): Path to the SQLite database file.
+            pragmas (dict): Pragma profile. Defaults to get_pragma_profile().
+        """
+        self.db_path = pathlib.Path(db_path)
+        self.pragmas = _validated(pragmas or get_pragma_profile())
+        self._writer = None
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+
+    def _open_writer(self) -> sqlite3.Connection:
+        os.makedirs(self.db_path.parent, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout = {self.pragmas['busy_timeout']}")
+        mode = conn.execute(f"PRAGMA journal_mode = {self.pragmas['journal_mode']}").fetchone()[0]
+        conn.execute(f"PRAGMA synchronous = {self.pragmas['synchronous']}")
+        conn.execute(f"PRAGMA cache_size = {self.pragmas['cache_size']}")
+        conn.execute(f"PRAGMA mmap_size = {self.pragmas['mmap_size']}")
+        conn.execute(f"PRAGMA temp_store = {self.pragmas['temp_store']}")
+        logger.info(f"Opened SQLite writer for {self.db_path} (journal_mode={mode}).")
+        return conn
+
+    def _open_reader(self) -> sqlite3.Connection:
+        uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout = {self.pragmas['busy_timeout']}")
+        conn.execute(f"PRAGMA cache_size = {self.pragmas['cache_size']}")
+        conn.execute(f"PRAGMA mmap_size = {self.pragmas['mmap_size']}")
+        conn.execute(f"PRAGMA temp_store = {self.pragmas['temp_store']}")
+        with self._readers_lock:
+            self._readers.append(conn)
+        return conn
+
+    @contextmanager
+    def writer(self):
+        """
+        Yield the shared writer connection inside one transaction.
+        Commits on success, rolls back and re-raises on error.
+        """
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._open_writer()
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    @contextmanager
+    def reader(self):
+        """Yield this thread's cached read-only connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_reader()
+            self._local.conn = conn
+        yield conn
+
+    def close(self) -> None:
+        """Close the writer and every reader connection opened by this manager."""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers = []
+        self._local = threading.local()
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path: pathlib.Path) -> SQLiteConnectionManager:
+    """
+    Return the process-wide connection manager for a database file,
+    creating it on first use.
+
+    Args:
+        db_path (pathlib.Path): Path to the SQLite database file.
+    """
+    key = str(pathlib.Path(db_path).resolve())
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = SQLiteConnectionManager(db_path)
+            _managers[key] = manager
+        return manager
+
+
+def close_all() -> None:
+    """Close every cached connection manager."""
+    with _managers_lock:
+        for manager in _managers.values():
+            manager.close()
+        _managers.clear()
+
+
+#####################################
+# Concurrent Load Measurement
+#####################################
+
+
+def measure_concurrent_load(
+    pragmas: dict, seconds: float = 5.0, batch_size: int = 100
+) -> dict:
+    """
+    Run one writer thread inserting batches and one reader thread
+    running the dashboard queries against a scratch database.
+
+    Args:
+        pragmas (dict): Pragma profile to test.
+        seconds (float): How long to run.
+        batch_size (int): Messages per write transaction.
+
+    Returns:
+        dict: writer msgs/sec and reader latency percentiles (ms).
+    """
+    # import here to avoid a circular import (db_sqlite_rogers uses this module)
+    from consumers.db_sqlite_rogers import init_db, insert_messages
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = pathlib.Path(tmp) / "load_test.sqlite"
+        manager = SQLiteConnectionManager(db_path, pragmas)
+        # register the test manager so init_db() writes through the profile under test
+        with _managers_lock:
+            _managers[str(db_path.resolve())] = manager
+        init_db(db_path)
+
+        # a few critics and genres so the aggregate upserts insert and update rows
+        batch = [
+            {
+                "title": "A title",
+                "review": "A review",
+                "critic": ("Bob", "Eve", "Ann")[i % 3],
+                "timestamp": "2025-02-20 07:53:22",
+                "genre": ("Action", "Drama", "Comedy", "Romance")[i % 4],
+                "sentiment": 0.5,
+                "message_length": 8,
+            }
+            for i in range(batch_size)
+        ]
+        stop = threading.Event()
+        written = 0
+        latencies = []
+
+        def write_loop():
+            nonlocal written
+            while not stop.is_set():
+                # the consumer's write path: messages plus the running-sum upserts
+                if insert_messages(batch, db_path):
+                    written += batch_size
+
+        def read_loop():
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    with manager.reader() as conn:
+                        conn.execute("SELECT genre, avg_sentiment FROM sentiment_per_genre").fetchall()
+                        conn.execute("SELECT critic, review_count FROM critic_entry_counts").fetchall()
+                        conn.execute("SELECT COUNT(*) FROM streamed_messages").fetchone()
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"Reader blocked: {e}")
+                latencies.append((time.perf_counter() - started) * 1000)
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=write_loop), threading.Thread(target=read_loop)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        with _managers_lock:
+            _managers.pop(str(db_path.resolve()), None)
+        manager.close()
+
+    latencies.sort()
+    return {
+        "writer_msgs_per_sec": written / elapsed,
+        "reader_queries": len(latencies),
+        "reader_p50_ms": percentile(latencies, 0.50),
+        "reader_p99_ms": percentile(latencies, 0.99),
+        "reader_max_ms": latencies[-1] if latencies else 0.0,
+    }
+
+
+#####################################
+# Define Main Function
+#####################################
+
+
+def main() -> None:
+    logger.info("Measuring SQLite writer throughput and reader latency under load.")
+    for name, pragmas in (("default", DEFAULT_PROFILE), ("configured", get_pragma_profile())):
+        result = measure_concurrent_load(pragmas)
+        logger.info(
+            f"{name} profile {pragmas}: "
+            f"writer {result['writer_msgs_per_sec']:.0f} msgs/sec, "
+            f"reader p50 {result['reader_p50_ms']:.2f} ms, "
+            f"p99 {result['reader_p99_ms']:.2f} ms, "
+            f"max {result['reader_max_ms']:.2f} ms "
+            f"over {result['reader_queries']} queries"
+        )
+
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == "__main__":
+    main()
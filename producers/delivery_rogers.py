@@ -0,0 +1,116 @@
+"""
+delivery_rogers.py
+
+Delivery accounting for the Kafka producer.
+
+DeliveryTracker attaches success/failure callbacks to each send() future
+and keeps counters; send-to-acknowledgement latency goes into the
+buzz_producer_delivery_seconds histogram (utils_metrics), and the logged
+percentiles are read from it. Callbacks run on the producer's I/O thread,
+so all updates take a lock.
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from standard library
+import threading
+import time
+
+# import from local modules
+from utils.utils_logger import logger
+from utils.utils_metrics import HistogramMetric, counter, histogram
+
+# delivery latency bucket upper bounds in seconds (1 ms to 5 s)
+DELIVERY_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+_DELIVERED = counter("buzz_producer_records_delivered_total", "Records acknowledged by Kafka.")
+_FAILED = counter("buzz_producer_records_failed_total", "Records Kafka failed to deliver.")
+_DELIVERY_SECONDS = histogram(
+    "buzz_producer_delivery_seconds",
+    "Time from send() to the broker's acknowledgement.",
+    DELIVERY_BUCKETS,
+)
+
+#####################################
+# Delivery Tracker
+#####################################
+
+
+class DeliveryTracker:
+    """Count sent, delivered and failed records and observe delivery latency."""
+
+    def __init__(self, report_interval_secs: float = 10.0, latency: HistogramMetric = None):
+        """
+        Args:
+            report_interval_secs (float): Seconds between maybe_log() reports.
+            latency (HistogramMetric, optional): Where delivery latency (seconds)
+                is observed. Defaults to buzz_producer_delivery_seconds.
+        """
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.delivered = 0
+        self.failed = 0
+        self.latency = latency or _DELIVERY_SECONDS
+        self.last_error = None
+        self.report_interval_secs = report_interval_secs
+        self._last_report = time.monotonic()
+
+    def track(self, future) -> None:
+        """
+        Register callbacks on a KafkaProducer.send() future.
+
+        Args:
+            future (FutureRecordMetadata): Returned by producer.send().
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self.sent += 1
+        future.add_callback(self._on_success, started)
+        future.add_errback(self._on_error, started)
+
+    def _on_success(self, started: float, record_metadata) -> None:
+        latency_secs = time.perf_counter() - started
+        with self._lock:
+            self.delivered += 1
+        _DELIVERED.inc()
+        self.latency.observe(latency_secs)
+
+    def _on_error(self, started: float, exception) -> None:
+        with self._lock:
+            self.failed += 1
+            self.last_error = exception
+        _FAILED.inc()
+        logger.error(f"Kafka delivery failed: {exception}")
+
+    def snapshot(self) -> dict:
+        """Return the counters and latency summary (from the histogram) as plain data."""
+        with self._lock:
+            stats = {
+                "sent": self.sent,
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "pending": self.sent - self.delivered - self.failed,
+            }
+        count = self.latency.count
+        stats["latency_avg_ms"] = self.latency.total / count * 1000 if count else 0.0
+        stats["latency_p50_ms"] = self.latency.percentile(0.5) * 1000
+        stats["latency_p99_ms"] = self.latency.percentile(0.99) * 1000
+        return stats
+
+    def log_summary(self) -> None:
+        stats = self.snapshot()
+        logger.info(
+            f"Kafka delivery: {stats['sent']} sent, {stats['delivered']} delivered, "
+            f"{stats['failed']} failed, {stats['pending']} pending; latency avg "
+            f"{stats['latency_avg_ms']:.1f} ms, p50 <= {stats['latency_p50_ms']:g} ms, "
+            f"p99 <= {stats['latency_p99_ms']:g} ms."
+        )
+
+    def maybe_log(self) -> None:
+        """Log a summary if report_interval_secs have passed since the last one."""
+        now = time.monotonic()
+        if now - self._last_report >= self.report_interval_secs:
+            self._last_report = now
+            self.log_summary()
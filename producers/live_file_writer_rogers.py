@@ -0,0 +1,208 @@
+"""
+live_file_writer_rogers.py
+
+Buffered writer for the producer's live data file (one JSON message per line).
+
+Keeps the file open and writes lines in groups instead of opening,
+appending and closing the file for every message.
+
+- Lines are buffered and written when the buffer reaches flush_bytes
+  or flush_interval_secs have passed since the last write to disk.
+- fsync policy: "never" (leave it to the OS), "interval" (at most once per
+  fsync_interval_secs) or "always" (write and fsync every line).
+- When the file reaches rotate_bytes it is renamed to <name>.1
+  (older copies shift to .2, .3, ...) and a new file is started.
+
+Time spent flushing, syncing and rotating is counted in stats() and
+exported as buzz_live_file_* metrics (see utils_metrics), so it can be
+watched while the producer runs, not only in the summary logged at close().
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from standard library
+import os
+import pathlib
+import time
+
+# import from local modules
+from utils.utils_logger import logger
+from utils.utils_metrics import counter, histogram
+
+FSYNC_POLICIES = {"never", "interval", "always"}
+
+_BYTES_WRITTEN = counter("buzz_live_file_bytes_written_total", "Bytes written to the live data file.")
+_WRITE_SECONDS = histogram("buzz_live_file_write_seconds", "Time to write one buffer to the live data file.")
+_FSYNC_SECONDS = histogram("buzz_live_file_fsync_seconds", "Time to fsync the live data file.")
+_ROTATE_SECONDS = histogram("buzz_live_file_rotate_seconds", "Time to rotate the live data file.")
+
+#####################################
+# Live File Writer
+#####################################
+
+
+class LiveFileWriter:
+    """Append lines to the live data file with buffering, fsync policy and rotation."""
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        flush_bytes: int = 65536,
+        flush_interval_secs: float = 1.0,
+        fsync_policy: str = "never",
+        fsync_interval_secs: float = 5.0,
+        rotate_bytes: int = 0,
+        rotate_backups: int = 3,
+    ):
+        """
+        Args:
+            path (pathlib.Path): Live data file.
+            flush_bytes (int): Write the buffer once it holds this many bytes.
+            flush_interval_secs (float): Write the buffer if this long has passed.
+            fsync_policy (str): never, interval or always.
+            fsync_interval_secs (float): Minimum seconds between fsyncs for "interval".
+            rotate_bytes (int): Rotate once the file reaches this size (0 = never).
+            rotate_backups (int): Rotated files to keep.
+        """
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy '{fsync_policy}'. Use one of {sorted(FSYNC_POLICIES)}.")
+        self.path = pathlib.Path(path)
+        self.flush_bytes = flush_bytes
+        self.flush_interval_secs = flush_interval_secs
+        self.fsync_policy = fsync_policy
+        self.fsync_interval_secs = fsync_interval_secs
+        self.rotate_bytes = rotate_bytes
+        self.rotate_backups = rotate_backups
+
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._last_fsync = self._last_flush
+        self._file = None
+        self._size = 0
+        self._stats = {
+            "lines": 0,
+            "bytes": 0,
+            "flushes": 0,
+            "flush_secs": 0.0,
+            "fsyncs": 0,
+            "fsync_secs": 0.0,
+            "rotations": 0,
+            "rotate_secs": 0.0,
+        }
+        self._open()
+
+    def _open(self) -> None:
+        os.makedirs(self.path.parent, exist_ok=True)
+        # unbuffered: this class does the buffering, so a flush is normally one write() call
+        self._file = open(self.path, "ab", buffering=0)
+        self._size = os.fstat(self._file.fileno()).st_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, line: str) -> None:
+        """
+        Buffer one line (a newline is added) and flush if a threshold is reached.
+
+        Args:
+            line (str): The line to append, without a trailing newline.
+        """
+        data = (line + "\n").encode("utf-8")
+        self._buffer.append(data)
+        self._buffered_bytes += len(data)
+        self._stats["lines"] += 1
+        if (
+            self.fsync_policy == "always"
+            or self._buffered_bytes >= self.flush_bytes
+            or time.monotonic() - self._last_flush >= self.flush_interval_secs
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered lines to the file, then fsync and rotate as configured."""
+        if self._buffer:
+            started = time.perf_counter()
+            data = memoryview(b"".join(self._buffer))
+            # a raw file may write only part of the data; write the rest
+            while data:
+                data = data[self._file.write(data):]
+            elapsed = time.perf_counter() - started
+            self._stats["flush_secs"] += elapsed
+            _WRITE_SECONDS.observe(elapsed)
+            _BYTES_WRITTEN.inc(self._buffered_bytes)
+            self._stats["flushes"] += 1
+            self._stats["bytes"] += self._buffered_bytes
+            self._size += self._buffered_bytes
+            self._buffer = []
+            self._buffered_bytes = 0
+        now = time.monotonic()
+        self._last_flush = now
+
+        if self.fsync_policy == "always" or (
+            self.fsync_policy == "interval" and now - self._last_fsync >= self.fsync_interval_secs
+        ):
+            self._fsync()
+            self._last_fsync = now
+
+        if self.rotate_bytes and self._size >= self.rotate_bytes:
+            self._rotate()
+
+    def _fsync(self) -> None:
+        started = time.perf_counter()
+        os.fsync(self._file.fileno())
+        elapsed = time.perf_counter() - started
+        self._stats["fsync_secs"] += elapsed
+        _FSYNC_SECONDS.observe(elapsed)
+        self._stats["fsyncs"] += 1
+
+    def _rotate(self) -> None:
+        """Rename the full file to .1 (shifting older copies) and start a new one."""
+        started = time.perf_counter()
+        if self.fsync_policy != "never":
+            self._fsync()
+        self._file.close()
+        for n in range(self.rotate_backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{n}")
+            if older.exists():
+                older.replace(self.path.with_name(f"{self.path.name}.{n + 1}"))
+        if self.rotate_backups > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._open()
+        elapsed = time.perf_counter() - started
+        self._stats["rotate_secs"] += elapsed
+        _ROTATE_SECONDS.observe(elapsed)
+        self._stats["rotations"] += 1
+        logger.info(f"Rotated live data file {self.path} ({self._stats['rotations']} rotations).")
+
+    def stats(self) -> dict:
+        """Return counts and seconds spent on flush, fsync and rotation."""
+        return dict(self._stats)
+
+    def log_stats(self) -> None:
+        stats = self._stats
+        logger.info(
+            f"Live file I/O: {stats['lines']} lines, {stats['bytes']} bytes in {stats['flushes']} writes "
+            f"({stats['flush_secs'] * 1000:.1f} ms), {stats['fsyncs']} fsyncs "
+            f"({stats['fsync_secs'] * 1000:.1f} ms), {stats['rotations']} rotations "
+            f"({stats['rotate_secs'] * 1000:.1f} ms)."
+        )
+
+    def close(self) -> None:
+        """Flush what is buffered, fsync unless the policy is never, and close the file."""
+        if self._file is None:
+            return
+        self.flush()
+        if self.fsync_policy == "interval":
+            # "always" already synced in flush()
+            self._fsync()
+        self._file.close()
+        self._file = None
+        self.log_stats()
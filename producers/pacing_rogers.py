@@ -0,0 +1,135 @@
+"""
+pacing_rogers.py
+
+Rate control for the producer.
+
+Has the following:
+- TokenBucket: Paces calls to a target messages-per-second rate.
+  Tokens refill from the monotonic clock, so time lost to slow sends or
+  oversleeping is made up on the next calls (up to the burst size)
+  instead of drifting. A rate of math.inf means unthrottled (max rate).
+- RateReporter: Logs the achieved rate against the target every few
+  seconds and once more at the end.
+"""
+
+#####################################
+# Import Modules
+#####################################
+
+# import from standard library
+import math
+import time
+
+# import from local modules
+from utils.utils_logger import logger
+
+#####################################
+# Token Bucket
+#####################################
+
+
+class TokenBucket:
+    """
+    Token-bucket pacer.
+
+    Each acquire() takes one token, sleeping first if none is available.
+    Tokens accrue at `rate` per second up to `burst`, so short stalls are
+    caught up without exceeding the target rate over any longer window.
+    """
+
+    def __init__(self, rate: float, burst: float = None, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            rate (float): Target messages per second (fractions allowed);
+                math.inf disables pacing.
+            burst (float): Most tokens that can accrue. Defaults to
+                0.1 seconds' worth of messages, at least 1.
+            clock (callable): Monotonic time source (seconds).
+            sleep (callable): Sleep function.
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}.")
+        self.rate = rate
+        self.unthrottled = math.isinf(rate)
+        if burst:
+            self.burst = float(burst)
+        else:
+            self.burst = 1.0 if self.unthrottled else max(1.0, rate * 0.1)
+        self._clock = clock
+        self._sleep = sleep
+        # start with one token: the first message goes out at once, without a burst
+        self._tokens = 1.0
+        self._last = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        if self.unthrottled:
+            return
+        self._refill()
+        if self._tokens < 1.0:
+            self._sleep((1.0 - self._tokens) / self.rate)
+            self._refill()
+        # may dip slightly below zero if the sleep was short; the next call waits longer
+        self._tokens -= 1.0
+
+
+#####################################
+# Rate Reporter
+#####################################
+
+
+class RateReporter:
+    """Track messages sent and log the achieved rate against the target."""
+
+    def __init__(self, target_rate: float, interval_secs: float = 10.0, clock=time.monotonic):
+        """
+        Args:
+            target_rate (float): Target messages per second (math.inf for max rate).
+            interval_secs (float): Seconds between progress reports.
+            clock (callable): Monotonic time source (seconds).
+        """
+        self.target_rate = target_rate
+        self.interval_secs = interval_secs
+        self._clock = clock
+        self.started = clock()
+        self.count = 0
+        self._interval_start = self.started
+        self._interval_count = 0
+
+    def _describe_target(self) -> str:
+        return "max" if math.isinf(self.target_rate) else f"{self.target_rate:g} msgs/s"
+
+    def record(self, n: int = 1) -> None:
+        """Count n sent messages, logging a report if the interval has passed."""
+        self.count += n
+        self._interval_count += n
+        now = self._clock()
+        if now - self._interval_start >= self.interval_secs:
+            rate = self._interval_count / (now - self._interval_start)
+            logger.info(
+                f"Producer rate {rate:.1f} msgs/s (target {self._describe_target()}), "
+                f"{self.count} messages sent."
+            )
+            self._interval_start = now
+            self._interval_count = 0
+
+    def achieved_rate(self) -> float:
+        """Average messages per second since the reporter was created."""
+        elapsed = self._clock() - self.started
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> None:
+        """Log the overall achieved rate against the target."""
+        achieved = self.achieved_rate()
+        if math.isinf(self.target_rate):
+            logger.info(f"Producer sent {self.count} messages at {achieved:.1f} msgs/s (max rate).")
+        else:
+            logger.info(
+                f"Producer sent {self.count} messages at {achieved:.1f} msgs/s, "
+                f"{achieved / self.target_rate:.1%} of the {self.target_rate:g} msgs/s target."
+            )
@@ -22,6 +22,7 @@ Environment variables are in utils/utils_config module.
 #####################################
 
 # import from standard library
+import argparse
 import json
 import os
 import pathlib
@@ -31,12 +32,25 @@ import time
 from datetime import datetime
 
 # import external modules
-from kafka import KafkaProducer
+import numpy as np
 
 # import from local modules
 import utils.utils_config as config
-from utils.utils_producer import verify_services, create_kafka_topic
-from utils.utils_logger import logger
+from utils.utils_codec import encode_record, get_codec
+from utils.utils_producer import verify_services, create_kafka_producer, create_kafka_topic
+from utils.utils_logger import SampledLogger, logger
+from utils.utils_metrics import counter, histogram, start_metrics_server
+from producers.pacing_rogers import RateReporter, TokenBucket
+from producers.live_file_writer_rogers import LiveFileWriter
+from producers.delivery_rogers import DeliveryTracker
+
+_PRODUCED = counter("buzz_producer_messages_total", "Messages generated and written to the live file.")
+_GENERATE_SECONDS = histogram(
+    "buzz_producer_generate_seconds", "Time to generate one message (averaged over its batch)."
+)
+_SEND_SECONDS = histogram(
+    "buzz_producer_send_seconds", "Time to encode a message and hand it to the Kafka client."
+)
 
 #####################################
 # Stub Sentiment Analysis Function
@@ -55,37 +69,38 @@ def assess_sentiment(text: str) -> float:
 # Define Message Generator
 #####################################
 
+TITLE_INTRO = ["Python, ",
+         "Untouchable:",
+         "Clear as Mud: ",
+         "Stronger, "
+         ]
+TITLE_END = ["Masters of the Code", 
+          "the Rise of Code", 
+          "an Underdog Story", 
+          "A kafka Story"
+          ]
+GENRE = ["Comdey", "Action", "Romance", "Sci-Fi"]
+REVIEW = ["This was the best movie I have seen",
+          "This movie had me laughing from start to end",
+          "Horrible film",
+          "Would watch again",
+          "Was a complete waste of time",
+          "Great story",
+          "Movie of the YEAR",
+          "I wish that I could get my money back",
+          "Life changing",
+          "Two thumbs way down",
+          "two thumbs way up"]
+CRITICS = ["Frank", "Bob", "Charlie", "Eve", "Sally", "George", "Tilly"]
+STARS = [1,3,4,5]
+
 
 def generate_messages():
     """
     Generate a stream of JSON messages.
     """
-    TITLE_INTRO = ["Python, ",
-             "Untouchable:",
-             "Clear as Mud: ",
-             "Stronger, "
-             ]
-    TITLE_END = ["Masters of the Code", 
-              "the Rise of Code", 
-              "an Underdog Story", 
-              "A kafka Story"
-              ]
-    GENRE = ["Comdey", "Action", "Romance", "Sci-Fi"]
-    REVIEW = ["This was the best movie I have seen",
-              "This movie had me laughing from start to end",
-              "Horrible film",
-              "Would watch again",
-              "Was a complete waste of time",
-              "Great story",
-              "Movie of the YEAR",
-              "I wish that I could get my money back",
-              "Life changing",
-              "Two thumbs way down",
-              "two thumbs way up"]
-    CRITICS = ["Frank", "Bob", "Charlie", "Eve", "Sally", "George", "Tilly"]
-    STARS = [1,3,4,5]
-
     while True:
+        started = time.perf_counter()
         title_intro = random.choice(TITLE_INTRO)
         title_end = random.choice(TITLE_END)
         genre =random.choice(GENRE)
@@ -111,15 +126,96 @@ def generate_messages():
             "message_length": len(review),
         }
 
+        _GENERATE_SECONDS.observe(time.perf_counter() - started)
         yield json_message
 
 
+def generate_message_batches(batch_size: int = 10_000, seed: int = None):
+    """
+    Generate lists of batch_size messages in the same format as generate_messages().
+
+    Choices are drawn as NumPy index arrays into precomputed tables
+    (every title, and each review with its length), and the timestamp is
+    formatted once per second, so the per-message cost is just building
+    the dict - fast enough for load tests at hundreds of thousands of
+    messages per second.
+
+    Args:
+        batch_size (int): Messages per yielded list.
+        seed (int, optional): Seed for a reproducible stream.
+    """
+    rng = np.random.default_rng(seed)
+    titles = [f"{title_intro} {title_end}" for title_intro in TITLE_INTRO for title_end in TITLE_END]
+    review_lengths = [len(review) for review in REVIEW]
+    last_second = None
+    timestamp = None
+
+    while True:
+        started = time.perf_counter()
+        second = int(time.time())
+        if second != last_second:
+            timestamp = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+            last_second = second
+
+        title_idx = rng.integers(len(titles), size=batch_size).tolist()
+        review_idx = rng.integers(len(REVIEW), size=batch_size).tolist()
+        critic_idx = rng.integers(len(CRITICS), size=batch_size).tolist()
+        genre_idx = rng.integers(len(GENRE), size=batch_size).tolist()
+        # same distribution as assess_sentiment(): uniform in [0, 1], 2 decimals
+        sentiment = np.round(rng.random(batch_size), 2).tolist()
+
+        batch = [
+            {
+                "title": titles[t],
+                "review": REVIEW[r],
+                "critic": CRITICS[c],
+                "timestamp": timestamp,
+                "genre": GENRE[g],
+                "sentiment": s,
+                "message_length": review_lengths[r],
+            }
+            for t, r, c, g, s in zip(title_idx, review_idx, critic_idx, genre_idx, sentiment)
+        ]
+        if batch:
+            _GENERATE_SECONDS.observe((time.perf_counter() - started) / len(batch), len(batch))
+        yield batch
+
+
 #####################################
 # Define Main Function
 #####################################
 
 
-def main() -> None:
+def parse_rate(text: str) -> float:
+    """Parse a --rate value: messages per second, or "max" for unthrottled."""
+    if text.strip().lower() == "max":
+        return float("inf")
+    rate = float(text)
+    if rate <= 0:
+        raise argparse.ArgumentTypeError("rate must be positive or 'max'")
+    return rate
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Produce movie review messages.")
+    parser.add_argument(
+        "--rate",
+        type=parse_rate,
+        default=None,
+        help=(
+            "Target messages per second (fractions ok) or 'max' for an unthrottled burst. "
+            "Defaults to MESSAGE_RATE_PER_SECOND, else one per MESSAGE_INTERVAL_SECONDS."
+        ),
+    )
+    parser.add_argument(
+        "--burst", type=float, default=None, help="Token-bucket size (default MESSAGE_RATE_BURST)."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    start_metrics_server()
 
     logger.info("Starting Producer to run continuously.")
     logger.info("Things can fail or get interrupted, so use a try block.")
@@ -128,10 +224,18 @@ def main() -> None:
     logger.info("STEP 1. Read required environment variables.")
 
     try:
-        interval_secs: int = config.get_message_interval_seconds_as_int()
-        topic: str = config.get_kafka_topic()
-        kafka_server: str = config.get_kafka_broker_address()
-        live_data_path: pathlib.Path = config.get_live_data_path()
+        settings = config.get_settings()
+        interval_secs: int = settings.message_interval_seconds
+        topic: str = settings.kafka_topic
+        kafka_server: str = settings.kafka_broker_address
+        live_data_path: pathlib.Path = settings.live_data_path
+        codec = get_codec(settings.message_codec)
+        rate: float = (
+            args.rate
+            or settings.message_rate_per_second
+            or (1 / interval_secs if interval_secs > 0 else float("inf"))
+        )
+        burst: float = args.burst if args.burst is not None else settings.message_rate_burst
     except Exception as e:
         logger.error(f"ERROR: Failed to read environment variables: {e}")
         sys.exit(1)
@@ -153,46 +257,85 @@ def main() -> None:
     producer = None
 
     try:
-        verify_services()
-        producer = KafkaProducer(
-            bootstrap_servers=kafka_server,
-            value_serializer=lambda x: json.dumps(x).encode("utf-8"),
-        )
-        logger.info(f"Kafka producer connected to {kafka_server}")
+        if verify_services().ok:
+            # values are encoded per message so the codec can go in a header
+            producer = create_kafka_producer(value_serializer=lambda x: x)
+        else:
+            logger.warning("WARNING: Kafka is not ready; writing the live data file only.")
+        if producer:
+            logger.info(f"Kafka producer connected to {kafka_server} (codec {codec.name})")
     except Exception as e:
         logger.warning(f"WARNING: Kafka connection failed: {e}")
         producer = None
 
     if producer:
         try:
-            create_kafka_topic(topic)
+            create_kafka_topic(topic, settings.kafka_consumer_group_id)
             logger.info(f"Kafka topic '{topic}' is ready.")
         except Exception as e:
             logger.warning(f"WARNING: Failed to create or verify topic '{topic}': {e}")
+            logger.warning("WARNING: Writing the live data file only.")
+            producer.close()
             producer = None
 
-    logger.info("STEP 5. Generate messages continuously.")
+    logger.info(f"STEP 5. Generate messages continuously (target rate {rate:g} msgs/s).")
+    pacer = TokenBucket(rate, burst)
+    deliveries = DeliveryTracker(settings.producer_report_interval_seconds)
+    sample = SampledLogger()
+    reporter = RateReporter(rate, settings.producer_report_interval_seconds)
+    # at high rates generate in blocks of ~0.1 seconds' worth, so timestamps stay current
+    batch_size = int(min(rate / 10, 10_000)) if rate >= 20 else 0
+    if batch_size:
+        messages = (message for batch in generate_message_batches(batch_size) for message in batch)
+    else:
+        messages = generate_messages()
+    try:
+        live_file = LiveFileWriter(
+            live_data_path,
+            flush_bytes=settings.live_data_flush_bytes,
+            flush_interval_secs=settings.live_data_flush_interval_seconds,
+            fsync_policy=settings.live_data_fsync,
+            fsync_interval_secs=settings.live_data_fsync_interval_seconds,
+            rotate_bytes=settings.live_data_rotate_bytes,
+            rotate_backups=settings.live_data_rotate_backups,
+        )
+    except Exception as e:
+        logger.error(f"ERROR: Failed to open live data file: {e}")
+        sys.exit(2)
+
     try:
-        for message in generate_messages():
-            logger.info(message)
+        for message in messages:
+            pacer.acquire()
+            # RateReporter logs throughput; individual messages are sampled at DEBUG
+            sample.debug("Producing message: {}", lambda: message)
 
-            with live_data_path.open("a") as f:
-                f.write(json.dumps(message) + "\n")
-                logger.info(f"STEP 4a Wrote message to file: {message}")
+            live_file.write(json.dumps(message))
+            _PRODUCED.inc()
 
             # Send to Kafka if available
             if producer:
-                producer.send(topic, value=message)
-                logger.info(f"STEP 4b Sent message to Kafka topic '{topic}': {message}")
+                started = time.perf_counter()
+                value, headers = encode_record(message, codec)
+                deliveries.track(producer.send(topic, value=value, headers=headers))
+                _SEND_SECONDS.observe(time.perf_counter() - started)
 
-            time.sleep(interval_secs)
+            reporter.record()
+            deliveries.maybe_log()
 
     except KeyboardInterrupt:
         logger.warning("WARNING: Producer interrupted by user.")
     except Exception as e:
         logger.error(f"ERROR: Unexpected error: {e}")
     finally:
+        live_file.close()
+        reporter.summary()
         if producer:
+            # wait for in-flight batches so the delivery counts are final
+            try:
+                producer.flush(timeout=settings.kafka_producer_flush_timeout_seconds)
+            except Exception as e:
+                logger.warning(f"WARNING: Kafka flush did not complete: {e}")
+            deliveries.log_summary()
             producer.close()
             logger.info("Kafka producer closed.")
         logger.info("TRY/FINALLY: Producer shutting down.")
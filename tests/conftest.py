@@ -0,0 +1,46 @@
+"""
+Shared pytest fixtures.
+
+Every test gets settings built from defaults only (no .env) with its data
+directory under tmp_path, and any SQLite connections it opened are closed
+afterwards.
+"""
+
+import pytest
+
+import utils.utils_config as config
+from consumers.db_sqlite_rogers import init_db
+from consumers.sqlite_connection_rogers import close_all
+
+
+@pytest.fixture(autouse=True)
+def settings(tmp_path):
+    """Install test settings for the duration of one test."""
+    previous = config._settings
+    settings = config.load_settings(env={"BASE_DATA_DIR": str(tmp_path / "data")}, dotenv=False)
+    config.set_settings(settings)
+    yield settings
+    close_all()
+    config.set_settings(previous)
+
+
+@pytest.fixture
+def db_path(settings):
+    """An initialized, empty database."""
+    init_db(settings.sqlite_path, reset=True)
+    return settings.sqlite_path
+
+
+def make_message(**overrides) -> dict:
+    """A processed message with every field set."""
+    message = {
+        "title": "Python,  the Rise of Code",
+        "review": "Great story",
+        "critic": "Bob",
+        "timestamp": "2025-02-20 07:53:22",
+        "genre": "Action",
+        "sentiment": 0.5,
+        "message_length": 11,
+    }
+    message.update(overrides)
+    return message
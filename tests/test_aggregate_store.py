@@ -0,0 +1,131 @@
+"""Tests for consumers/aggregate_store_rogers.py: vectorized totals, the series buffer and seeding."""
+
+import pytest
+
+from consumers.aggregate_store_rogers import AggregateStore, StoreDashboardData
+from consumers.db_sqlite_rogers import BatchWriter, insert_messages
+from tests.conftest import make_message
+
+
+def test_update_folds_a_batch_into_the_totals():
+    store = AggregateStore()
+    store.update(
+        [
+            make_message(genre="Action", critic="Bob", sentiment=0.2),
+            make_message(genre="Action", critic="Eve", sentiment=0.6),
+            make_message(genre="Romance", critic="Bob", sentiment=1.0),
+        ]
+    )
+    genres = dict(store.genre_rows())
+    assert genres["Action"] == pytest.approx(0.4)
+    assert genres["Romance"] == pytest.approx(1.0)
+    assert dict(store.critic_rows()) == {"Bob": 2, "Eve": 1}
+    assert store.version == 1
+
+
+def test_series_is_filtered_by_critic_and_genre_and_capped():
+    store = AggregateStore()
+    store.update(
+        [
+            make_message(critic="Bob", genre="Action", timestamp=f"2025-02-20 07:53:0{i}", sentiment=i / 10)
+            for i in range(5)
+        ]
+        + [make_message(critic="Eve", genre="Action"), make_message(critic="Bob", genre="Drama")]
+    )
+    assert store.series("Bob", "Action", max_points=2) == [
+        ("2025-02-20 07:53:03", 0.3),
+        ("2025-02-20 07:53:04", 0.4),
+    ]
+    assert store.series("Nobody", "Action") == []
+
+
+def test_ring_buffer_keeps_only_the_most_recent_points():
+    store = AggregateStore(series_capacity=3)
+    for i in range(5):
+        store.update([make_message(timestamp=f"2025-02-20 07:53:0{i}", sentiment=float(i))])
+    assert [value for _, value in store.series("Bob", "Action")] == [2.0, 3.0, 4.0]
+    assert dict(store.critic_rows()) == {"Bob": 5}
+
+
+def test_malformed_timestamps_count_but_are_left_off_the_series():
+    store = AggregateStore()
+    store.update(
+        [
+            make_message(timestamp="2025-02-20 07:53:22", sentiment=0.2),
+            make_message(timestamp="20/02/2025 07:53", sentiment=0.4),
+            make_message(timestamp=None, sentiment=0.6),
+        ]
+    )
+    assert dict(store.critic_rows()) == {"Bob": 3}
+    assert dict(store.genre_rows())["Action"] == pytest.approx(0.4)
+    assert store.series("Bob", "Action") == [("2025-02-20 07:53:22", 0.2)]
+
+    store.add_points([("not a time", "Bob", "Action", 0.9)])
+    assert store.series("Bob", "Action") == [("2025-02-20 07:53:22", 0.2)]
+
+
+def test_totals_round_trip_through_replace_totals():
+    source = AggregateStore()
+    source.update([make_message(genre="Action", critic="Bob", sentiment=0.5)])
+    target = AggregateStore()
+    target.update([make_message(genre="Drama", critic="Eve", sentiment=0.1)])
+
+    target.replace_totals(source.totals())
+    assert target.genre_rows() == [("Action", 0.5)]
+    assert target.critic_rows() == [("Bob", 1)]
+
+
+def test_load_from_db_seeds_totals_and_recent_points(db_path):
+    insert_messages(
+        [
+            make_message(timestamp="2025-02-20 07:53:22", sentiment=0.2),
+            make_message(timestamp="2025-02-20 07:53:23", sentiment=0.6),
+        ],
+        db_path,
+    )
+    store = AggregateStore()
+    store.load_from_db(db_path)
+    assert dict(store.genre_rows())["Action"] == pytest.approx(0.4)
+    assert store.critic_rows() == [("Bob", 2)]
+    assert store.series("Bob", "Action") == [("2025-02-20 07:53:22", 0.2), ("2025-02-20 07:53:23", 0.6)]
+
+
+def test_new_points_follow_a_high_water_mark_across_the_ring():
+    store = AggregateStore(series_capacity=4)
+    store.update([make_message(timestamp="2025-02-20 07:53:01"), make_message(critic="Eve")])
+    points, mark = store.new_points("Bob", "Action", 0)
+    assert (points, mark) == ([("2025-02-20 07:53:01", 0.5)], 2)
+
+    # same timestamp again, and more points than the ring holds
+    store.update(
+        [make_message(timestamp="2025-02-20 07:53:01", sentiment=float(i)) for i in range(5)]
+    )
+    points, mark = store.new_points("Bob", "Action", mark)
+    assert [value for _, value in points] == [1.0, 2.0, 3.0, 4.0]
+    assert store.new_points("Bob", "Action", mark) == ([], 7)
+
+
+def test_store_dashboard_data_refreshes_only_on_change():
+    store = AggregateStore()
+    data = StoreDashboardData(store, "Bob", "Action", max_points=10)
+    assert data.refresh()
+    assert not data.refresh()
+
+    store.update([make_message()])
+    assert data.refresh()
+    assert data.critic_rows == [("Bob", 1)]
+    assert data.series == [("2025-02-20 07:53:22", 0.5)]
+    assert data.new_timestamps == ["2025-02-20 07:53:22"]
+
+    store.update([make_message(critic="Eve")])
+    assert data.refresh()
+    assert data.new_timestamps == []
+
+
+def test_batch_writer_survives_a_failing_on_flush(db_path):
+    def on_flush(batch):
+        raise ValueError("boom")
+
+    writer = BatchWriter(db_path, on_flush=on_flush)
+    assert writer.write_batch([make_message()])
+    assert len(writer) == 0
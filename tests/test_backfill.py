@@ -0,0 +1,81 @@
+"""Tests for consumers/backfill_rogers.py: chunked reads, parsing and bulk loads."""
+
+import json
+
+import pytest
+
+import consumers.backfill_rogers as backfill_module
+from consumers.backfill_rogers import backfill, parse_chunk, read_chunks
+from consumers.db_sqlite_rogers import STREAMED_MESSAGES_INDEXES, insert_messages
+from consumers.sqlite_connection_rogers import get_connection_manager
+from tests.conftest import make_message
+
+
+def _rows(db_path, sql):
+    with get_connection_manager(db_path).reader() as conn:
+        return conn.execute(sql).fetchall()
+
+
+def _write_jsonl(path, messages, extra_lines=()):
+    lines = [json.dumps(message) for message in messages] + list(extra_lines)
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_read_chunks_cuts_at_line_boundaries(tmp_path):
+    path = tmp_path / "live.json"
+    path.write_bytes(b"first line\nsecond\nthird without newline")
+    chunks = list(read_chunks(path, chunk_bytes=4))
+    assert b"".join(chunks) == path.read_bytes()
+    assert all(chunk.endswith(b"\n") for chunk in chunks[:-1])
+
+
+def test_parse_chunk_skips_malformed_lines():
+    chunk = json.dumps(make_message(sentiment="0.25")).encode() + b"\n{not json\n"
+    rows, size, skipped = parse_chunk(chunk)
+    assert size == len(chunk)
+    assert skipped == 1
+    assert rows == [("Python,  the Rise of Code", "Great story", "Bob", "2025-02-20 07:53:22", "Action", 0.25, 11)]
+
+
+def test_fresh_backfill_loads_rows_and_rebuilds_indexes_and_aggregates(db_path, tmp_path):
+    insert_messages([make_message(critic="Old")], db_path)
+    path = _write_jsonl(
+        tmp_path / "live.json",
+        [make_message(critic="Bob", sentiment=0.2), make_message(critic="Eve", sentiment=0.6)],
+        ["{broken"],
+    )
+
+    result = backfill([path], db_path, workers=1, transaction_rows=1)
+    assert result["rows"] == 2
+    assert result["skipped"] == 1
+    assert dict(_rows(db_path, "SELECT critic, review_count FROM critic_entry_counts")) == {"Bob": 1, "Eve": 1}
+    assert _rows(db_path, "SELECT genre, avg_sentiment FROM sentiment_per_genre") == [("Action", pytest.approx(0.4))]
+    indexes = {row[0] for row in _rows(db_path, "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert set(STREAMED_MESSAGES_INDEXES) <= indexes
+
+
+def test_append_keeps_existing_rows(db_path, tmp_path):
+    insert_messages([make_message(critic="Old")], db_path)
+    path = _write_jsonl(tmp_path / "live.json", [make_message(critic="Bob")])
+
+    backfill([path], db_path, append=True, workers=1)
+    assert dict(_rows(db_path, "SELECT critic, review_count FROM critic_entry_counts")) == {"Old": 1, "Bob": 1}
+
+
+def test_failed_append_keeps_the_existing_and_committed_rows(db_path, tmp_path, monkeypatch):
+    insert_messages([make_message(critic="Old")], db_path)
+    path = _write_jsonl(tmp_path / "live.json", [make_message(critic="Bob")])
+    row = parse_chunk(json.dumps(make_message(critic="Bob")).encode())[0][0]
+
+    def failing_parse_chunks(chunks, workers):
+        yield [row], 1, 0
+        yield [row], 1, 0
+        raise RuntimeError("parser died")
+
+    monkeypatch.setattr(backfill_module, "parse_chunks", failing_parse_chunks)
+    with pytest.raises(RuntimeError):
+        backfill([path], db_path, append=True, workers=1, transaction_rows=2)
+
+    assert _rows(db_path, "PRAGMA integrity_check") == [("ok",)]
+    assert _rows(db_path, "SELECT critic FROM streamed_messages ORDER BY id") == [("Old",), ("Bob",), ("Bob",)]
@@ -0,0 +1,58 @@
+"""Tests for utils/utils_codec.py: round trips, the codec header and fallbacks."""
+
+import threading
+
+import pytest
+
+from utils.utils_codec import CODECS, decode_record, encode_record, get_codec
+from tests.conftest import make_message
+
+
+@pytest.mark.parametrize("name", sorted(CODECS))
+def test_round_trip(name):
+    message = make_message(title="Stronger,  an Underdog Story", sentiment=0.38)
+    value, headers = encode_record(message, get_codec(name))
+    assert headers == [("codec", name.encode("ascii"))]
+    assert decode_record(value, headers) == message
+
+
+def test_records_without_a_header_are_json():
+    message = make_message()
+    value, _ = encode_record(message, get_codec("json"))
+    assert decode_record(value) == message
+
+
+def test_binary_codec_falls_back_to_json_for_incomplete_messages():
+    message = {"title": "only a title"}
+    value, headers = encode_record(message, get_codec("bin1"))
+    assert headers == [("codec", b"json")]
+    assert decode_record(value, headers) == message
+
+
+def test_unknown_codec_header_raises_value_error():
+    with pytest.raises(ValueError):
+        decode_record(b"{}", [("codec", b"nope")])
+
+
+def test_get_codec_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        get_codec("nope")
+
+
+def test_binary_codec_is_safe_to_share_between_threads():
+    codec = get_codec("bin1")
+    errors = []
+
+    def round_trips(second):
+        message = make_message(timestamp=f"2025-02-20 07:53:{second:02d}")
+        for _ in range(2000):
+            if codec.decode(codec.encode(message)) != message:
+                errors.append(second)
+                return
+
+    threads = [threading.Thread(target=round_trips, args=(second,)) for second in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
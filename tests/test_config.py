@@ -0,0 +1,48 @@
+"""Tests for utils/utils_config.py: parsing and validating settings."""
+
+import pytest
+
+import utils.utils_config as config
+
+
+def _load(**env):
+    return config.load_settings(env=env, dotenv=False)
+
+
+def test_defaults_load():
+    settings = _load()
+    assert settings.message_codec == "json"
+    assert settings.kafka_poll_mode == "batch"
+
+
+@pytest.mark.parametrize("codec", ["json", "bin1", "msgpack", "BIN1"])
+def test_message_codec_accepts_the_supported_codecs(codec):
+    assert _load(MESSAGE_CODEC=codec).message_codec == codec.lower()
+
+
+@pytest.mark.parametrize("codec", ["xml", "json2", "protobuf"])
+def test_message_codec_rejects_other_values(codec):
+    with pytest.raises(ValueError, match="MESSAGE_CODEC"):
+        _load(MESSAGE_CODEC=codec)
+
+
+@pytest.mark.parametrize(
+    "name, value",
+    [
+        ("KAFKA_POLL_MODE", "stream"),
+        ("KAFKA_TOPIC_RESET_MODE", "drain"),
+        ("KAFKA_NUM_PARTITIONS", "0"),
+        ("KAFKA_ACKS", "2"),
+        ("SQLITE_BATCH_SIZE", "many"),
+    ],
+)
+def test_invalid_values_are_rejected(name, value):
+    with pytest.raises(ValueError, match=name):
+        _load(**{name: value})
+
+
+def test_every_error_is_reported_at_once():
+    with pytest.raises(ValueError) as error:
+        _load(MESSAGE_CODEC="xml", KAFKA_POLL_MODE="stream")
+    assert "MESSAGE_CODEC" in str(error.value)
+    assert "KAFKA_POLL_MODE" in str(error.value)
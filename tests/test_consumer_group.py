@@ -0,0 +1,48 @@
+"""Tests for consumers/consumer_group_rogers.py: worker reports and the coordinator merge."""
+
+import dataclasses
+import queue
+import threading
+
+from kafka import TopicPartition
+
+import consumers.kafka_consumer_rogers as kafka_consumer
+from consumers.consumer_group_rogers import Coordinator, run_worker
+from tests.test_kafka_consumer import TOPIC, FakeConsumer, make_record
+
+
+def test_worker_reports_and_stops_in_record_poll_mode(db_path, settings, monkeypatch):
+    settings = dataclasses.replace(
+        settings, kafka_poll_mode="record", consumer_report_interval_seconds=0
+    )
+    stop_event = threading.Event()
+    consumer = FakeConsumer(
+        [{TopicPartition(TOPIC, 0): [make_record(0), make_record(1, critic="Eve")]}], stop_event
+    )
+    monkeypatch.setattr(kafka_consumer, "create_kafka_consumer", lambda *args, **kw: consumer)
+    reports = queue.Queue()
+
+    run_worker(1, TOPIC, "localhost:9092", "test-group", reports, stop_event, settings)
+
+    sent = []
+    while not reports.empty():
+        sent.append(reports.get_nowait())
+    assert any(report["msgs_per_sec"] for report in sent)
+    assert sent[-1]["processed"] == 2
+    assert sent[-1]["totals"]["critics"] == {"Bob": 1, "Eve": 1}
+
+
+def test_coordinator_merges_worker_totals_with_the_base():
+    coordinator = Coordinator({"genres": {"Action": [1.0, 2]}, "critics": {"Bob": 2}}, 100)
+    for worker_id, critic in ((1, "Bob"), (2, "Eve")):
+        coordinator.apply(
+            {
+                "worker_id": worker_id,
+                "totals": {"genres": {"Action": [0.5, 1]}, "critics": {critic: 1}},
+                "points": [],
+                "processed": 1,
+                "msgs_per_sec": 1.0,
+            }
+        )
+    assert dict(coordinator.store.critic_rows()) == {"Bob": 3, "Eve": 1}
+    assert dict(coordinator.store.genre_rows()) == {"Action": 2.0 / 4}
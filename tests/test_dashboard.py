@@ -0,0 +1,40 @@
+"""Tests for consumers/dashboard_rogers.py: rendering frames with the persistent-artist chart."""
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from consumers.dashboard_rogers import LiveChart, create_figure  # noqa: E402
+
+
+def _chart():
+    fig, gs = create_figure()
+    return LiveChart(fig, gs, "Bob", "Action", use_blit=False)
+
+
+def test_update_renders_bars_and_series():
+    chart = _chart()
+    chart.update(
+        [("Action", 0.4), ("Drama", 0.6)],
+        [("Bob", 30)],
+        [("2025-02-20 07:53:22", 0.2), ("2025-02-20 07:53:23", 0.6)],
+    )
+    assert [patch.get_height() for patch in chart._genre_bars.patches] == [0.4, 0.6]
+    assert chart.ax2.get_ylim()[1] > 30
+    assert list(chart.line.get_ydata()) == [0.2, 0.6]
+
+
+def test_update_leaves_out_points_with_malformed_timestamps():
+    chart = _chart()
+    chart.update(
+        [],
+        [],
+        [("2025-02-20 07:53:22", 0.2), ("20/02/2025 07:53", 0.4), (None, 0.5), ("2025-02-20 07:53:24", 0.6)],
+    )
+    assert list(chart.line.get_ydata()) == [0.2, 0.6]
+
+
+def test_update_with_no_parseable_timestamps_keeps_the_line_empty():
+    chart = _chart()
+    chart.update([], [], [("garbage", 0.2)])
+    assert len(chart.line.get_xdata()) == 0
@@ -0,0 +1,261 @@
+"""Tests for consumers/db_sqlite_rogers.py: batched inserts, running aggregates and checkpoints."""
+
+import time
+
+import pytest
+
+from consumers.db_sqlite_rogers import (
+    BatchWriter,
+    delete_message,
+    init_db,
+    insert_messages,
+    load_file_checkpoint,
+    rebuild_aggregates,
+    save_file_checkpoint,
+)
+from consumers.sqlite_connection_rogers import get_connection_manager
+from tests.conftest import make_message
+
+
+def _rows(db_path, sql):
+    with get_connection_manager(db_path).reader() as conn:
+        return conn.execute(sql).fetchall()
+
+
+def test_insert_messages_updates_running_aggregates(db_path):
+    messages = [
+        make_message(genre="Action", critic="Bob", sentiment=0.2),
+        make_message(genre="Action", critic="Eve", sentiment=0.6),
+        make_message(genre="Romance", critic="Bob", sentiment=1.0),
+    ]
+    assert insert_messages(messages[:2], db_path)
+    assert insert_messages(messages[2:], db_path)
+
+    assert _rows(db_path, "SELECT COUNT(*) FROM streamed_messages") == [(3,)]
+    genres = dict(_rows(db_path, "SELECT genre, avg_sentiment FROM sentiment_per_genre"))
+    assert genres["Action"] == pytest.approx(0.4)
+    assert genres["Romance"] == pytest.approx(1.0)
+    assert dict(_rows(db_path, "SELECT critic, review_count FROM critic_entry_counts")) == {
+        "Bob": 2,
+        "Eve": 1,
+    }
+
+
+def test_rebuild_aggregates_recomputes_the_running_totals(db_path):
+    insert_messages([make_message(genre="Action", sentiment=0.2)], db_path)
+    with get_connection_manager(db_path).writer() as conn:
+        conn.execute("UPDATE streamed_messages SET sentiment = 0.8")
+
+    rebuild_aggregates(db_path)
+    assert _rows(
+        db_path, "SELECT genre, sentiment_sum, sentiment_count, avg_sentiment FROM sentiment_per_genre"
+    ) == [("Action", 0.8, 1, 0.8)]
+
+
+def test_reopening_without_reset_keeps_the_counters(db_path):
+    insert_messages([make_message(critic="Bob")], db_path)
+    init_db(db_path, reset=False)
+    insert_messages([make_message(critic="Bob")], db_path)
+    assert _rows(db_path, "SELECT critic, review_count FROM critic_entry_counts") == [("Bob", 2)]
+
+
+def test_reopening_upgrades_a_legacy_real_review_count(db_path):
+    with get_connection_manager(db_path).writer() as conn:
+        conn.execute("DROP TABLE critic_entry_counts")
+        conn.execute("CREATE TABLE critic_entry_counts (critic TEXT PRIMARY KEY, review_count REAL)")
+        conn.execute("INSERT INTO critic_entry_counts VALUES ('Bob', 3.0)")
+
+    init_db(db_path, reset=False)
+    assert _rows(db_path, "SELECT typeof(review_count) FROM critic_entry_counts") == [("integer",)]
+    assert _rows(db_path, "SELECT review_count FROM critic_entry_counts") == [(3,)]
+
+
+def test_reopening_adds_the_checkpoint_fingerprint_column(db_path, tmp_path):
+    live = tmp_path / "live.json"
+    with get_connection_manager(db_path).writer() as conn:
+        conn.execute("DROP TABLE file_checkpoints")
+        conn.execute(
+            "CREATE TABLE file_checkpoints (path TEXT PRIMARY KEY, inode INTEGER NOT NULL, "
+            "offset INTEGER NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO file_checkpoints VALUES (?, 7, 42, datetime('now'))", (str(live.resolve()),)
+        )
+
+    init_db(db_path, reset=False)
+    assert load_file_checkpoint(live, db_path)[:3] == (7, 42, None)
+
+
+def test_deleting_a_genres_last_message_removes_its_aggregates(db_path):
+    insert_messages(
+        [
+            make_message(genre="Action", critic="Bob", sentiment=0.2),
+            make_message(genre="Sci-Fi", critic="Tilly", sentiment=0.9),
+        ],
+        db_path,
+    )
+    delete_message(2, db_path)
+
+    assert _rows(db_path, "SELECT genre, avg_sentiment FROM sentiment_per_genre") == [("Action", 0.2)]
+    assert _rows(db_path, "SELECT critic, review_count FROM critic_entry_counts") == [("Bob", 1)]
+
+
+def test_failed_insert_rolls_back_the_whole_batch(db_path):
+    broken = make_message()
+    del broken["genre"]
+
+    assert not insert_messages([make_message(), broken], db_path)
+
+    assert _rows(db_path, "SELECT COUNT(*) FROM streamed_messages") == [(0,)]
+    assert _rows(db_path, "SELECT COUNT(*) FROM sentiment_per_genre") == [(0,)]
+
+
+def test_failed_before_commit_rolls_back_the_whole_batch(db_path, tmp_path):
+    def fail(cursor):
+        save_file_checkpoint(cursor, tmp_path / "live.json", 1, 100)
+        raise RuntimeError("disk full")
+
+    assert not insert_messages([make_message()], db_path, before_commit=fail)
+
+    assert _rows(db_path, "SELECT COUNT(*) FROM streamed_messages") == [(0,)]
+    assert _rows(db_path, "SELECT COUNT(*) FROM sentiment_per_genre") == [(0,)]
+    assert load_file_checkpoint(tmp_path / "live.json", db_path) is None
+
+
+def test_checkpoint_commits_with_its_messages(db_path, tmp_path):
+    live = tmp_path / "live.json"
+    writer = BatchWriter(db_path)
+    assert writer.write_batch(
+        [make_message()], before_commit=lambda cursor: save_file_checkpoint(cursor, live, 7, 42, "abc")
+    )
+    assert load_file_checkpoint(live, db_path)[:3] == (7, 42, "abc")
+    assert load_file_checkpoint(live, db_path)[3] == pytest.approx(time.time(), abs=5)
+    assert _rows(db_path, "SELECT COUNT(*) FROM streamed_messages") == [(1,)]
+
+
+def test_batch_writer_flushes_at_batch_size(db_path):
+    writer = BatchWriter(db_path, batch_size=3, flush_interval_secs=3600)
+    assert writer.add(make_message()) == 0
+    assert writer.add(make_message()) == 0
+    assert writer.add(make_message()) == 3
+    assert len(writer) == 0
+    assert _rows(db_path, "SELECT COUNT(*) FROM streamed_messages") == [(3,)]
+
+
+def test_batch_writer_keeps_a_failed_batch_for_the_next_flush(db_path, monkeypatch):
+    import consumers.db_sqlite_rogers as db
+
+    monkeypatch.setattr(db, "insert_messages", lambda *args, **kwargs: False)
+    writer = BatchWriter(db_path, batch_size=2)
+    writer.add(make_message())
+    assert writer.add(make_message()) == 0
+    assert len(writer) == 2
+
+    monkeypatch.undo()
+    assert writer.add(make_message()) == 3
+    assert _rows(db_path, "SELECT COUNT(*) FROM streamed_messages") == [(3,)]
+
+
+def test_checkpoint_from_a_failed_batch_is_stored_with_it(db_path, tmp_path, monkeypatch):
+    import consumers.db_sqlite_rogers as db
+
+    live = tmp_path / "live.json"
+    monkeypatch.setattr(db, "insert_messages", lambda *args, **kwargs: False)
+    writer = BatchWriter(db_path)
+    assert not writer.write_batch(
+        [make_message()], before_commit=lambda cursor: save_file_checkpoint(cursor, live, 7, 42, "abc")
+    )
+
+    monkeypatch.undo()
+    writer.close()
+    assert load_file_checkpoint(live, db_path)[:3] == (7, 42, "abc")
+    assert _rows(db_path, "SELECT COUNT(*) FROM streamed_messages") == [(1,)]
+
+
+def test_full_buffer_blocks_until_a_flush_succeeds(db_path, monkeypatch):
+    import consumers.db_sqlite_rogers as db
+
+    insert_messages = db.insert_messages
+    attempts = []
+
+    def fail_three_times(*args, **kwargs):
+        attempts.append(1)
+        return False if len(attempts) <= 3 else insert_messages(*args, **kwargs)
+
+    monkeypatch.setattr(db, "insert_messages", fail_three_times)
+    monkeypatch.setattr(db.time, "sleep", lambda secs: None)
+    writer = BatchWriter(db_path, batch_size=2, max_buffered=4)
+
+    assert not writer.write_batch([make_message()] * 2)
+    assert not writer.write_batch([make_message()] * 2)
+    assert len(writer) == 4
+    # no room for two more: retries (third failure, then success) before buffering them
+    assert writer.write_batch([make_message()] * 2)
+    assert len(attempts) == 5
+    assert _rows(db_path, "SELECT COUNT(*) FROM streamed_messages") == [(6,)]
+
+
+def test_close_flushes_remaining_messages(db_path):
+    with BatchWriter(db_path, batch_size=100, flush_interval_secs=3600) as writer:
+        writer.add(make_message())
+    assert _rows(db_path, "SELECT COUNT(*) FROM streamed_messages") == [(1,)]
+
+
+def test_sentiment_series_filters_and_orders_by_timestamp(db_path):
+    from consumers.db_sqlite_rogers import fetch_sentiment_series
+
+    insert_messages(
+        [
+            make_message(critic="Tilly", genre="Action", timestamp="2025-02-20 07:53:24", sentiment=0.4),
+            make_message(critic="Tilly", genre="Action", timestamp="2025-02-20 07:53:22", sentiment=0.2),
+            make_message(critic="Tilly", genre="Comedy", timestamp="2025-02-20 07:53:23", sentiment=0.9),
+            make_message(critic="Bob", genre="Action", timestamp="2025-02-20 07:53:23", sentiment=0.7),
+        ],
+        db_path,
+    )
+    assert fetch_sentiment_series("Tilly", "Action", db_path) == [
+        ("2025-02-20 07:53:22", 0.2),
+        ("2025-02-20 07:53:24", 0.4),
+    ]
+    assert fetch_sentiment_series("Tilly", "Action", db_path, since="2025-02-20 07:53:22") == [
+        ("2025-02-20 07:53:24", 0.4),
+    ]
+
+
+def test_dashboard_refresh_only_fetches_new_points(db_path):
+    from consumers.dashboard_rogers import DashboardData
+
+    data = DashboardData(db_path, "Bob", "Action", 2)
+    insert_messages([make_message(timestamp="2025-02-20 07:53:20", sentiment=0.1)], db_path)
+    assert data.refresh()
+    assert not data.refresh()
+
+    insert_messages(
+        [
+            make_message(timestamp="2025-02-20 07:53:21", sentiment=0.2),
+            make_message(timestamp="2025-02-20 07:53:22", sentiment=0.3),
+            make_message(critic="Eve", sentiment=0.9),
+        ],
+        db_path,
+    )
+    assert data.refresh()
+    # only the most recent max_points are kept
+    assert [sentiment for _, sentiment in data.series] == [0.2, 0.3]
+    assert dict(data.critic_rows) == {"Bob": 3, "Eve": 1}
+
+
+def test_dashboard_series_uses_the_id_high_water_mark(db_path):
+    from consumers.dashboard_rogers import DashboardData
+
+    data = DashboardData(db_path, "Bob", "Action", 10)
+    insert_messages([make_message(timestamp="2025-02-20 07:53:22", sentiment=0.1)], db_path)
+    assert data.refresh()
+    # a parallel writer commits an earlier timestamp after a later one
+    insert_messages([make_message(timestamp="2025-02-20 07:53:20", sentiment=0.2)], db_path)
+    assert data.refresh()
+    assert [sentiment for _, sentiment in data.series] == [0.1, 0.2]
+    # the earlier timestamp still counts as newly drawn
+    assert data.new_timestamps == ["2025-02-20 07:53:20"]
+    insert_messages([make_message(critic="Eve")], db_path)
+    assert data.refresh()
+    assert data.new_timestamps == []
@@ -0,0 +1,98 @@
+"""Tests for producers/delivery_rogers.py and the producer settings in utils/utils_producer.py."""
+
+import dataclasses
+
+import pytest
+
+import utils.utils_config as config
+from producers.delivery_rogers import DELIVERY_BUCKETS, DeliveryTracker
+from utils.utils_metrics import HistogramMetric
+from utils.utils_producer import PRODUCER_PRESETS, get_producer_settings
+
+
+class FakeFuture:
+    """send() future whose callbacks the test fires by hand."""
+
+    def __init__(self):
+        self.callback = None
+        self.errback = None
+
+    def add_callback(self, callback, *args):
+        self.callback = lambda: callback(*args, "metadata")
+
+    def add_errback(self, errback, *args):
+        self.errback = lambda error: errback(*args, error)
+
+
+def _tracker():
+    return DeliveryTracker(latency=HistogramMetric("test_delivery_seconds", "Test.", DELIVERY_BUCKETS))
+
+
+def test_tracker_counts_sent_delivered_failed_and_pending():
+    tracker = _tracker()
+    futures = [FakeFuture() for _ in range(3)]
+    for future in futures:
+        tracker.track(future)
+    futures[0].callback()
+    futures[1].errback(RuntimeError("broker down"))
+
+    stats = tracker.snapshot()
+    assert (stats["sent"], stats["delivered"], stats["failed"], stats["pending"]) == (3, 1, 1, 1)
+    assert str(tracker.last_error) == "broker down"
+    assert tracker.latency.count == 1
+
+
+def test_latency_summary_is_read_from_the_histogram():
+    tracker = _tracker()
+    for seconds in [0.0005] * 98 + [0.03, 3.0]:
+        tracker.latency.observe(seconds)
+
+    stats = tracker.snapshot()
+    assert stats["latency_p50_ms"] == 1.0
+    assert stats["latency_p99_ms"] == 50.0
+    assert stats["latency_avg_ms"] == pytest.approx((0.0005 * 98 + 3.03) / 100 * 1000)
+
+
+def test_empty_tracker_reports_zero_latency():
+    stats = _tracker().snapshot()
+    assert stats["latency_avg_ms"] == stats["latency_p50_ms"] == stats["latency_p99_ms"] == 0.0
+
+
+def test_tracker_reports_to_the_delivery_metric_by_default():
+    assert DeliveryTracker().latency.name == "buzz_producer_delivery_seconds"
+
+
+def _use(settings, **overrides):
+    config.set_settings(dataclasses.replace(settings, **overrides))
+
+
+@pytest.mark.parametrize("profile", sorted(PRODUCER_PRESETS))
+def test_producer_settings_follow_the_profile(settings, profile):
+    _use(settings, kafka_producer_profile=profile)
+    assert get_producer_settings() == PRODUCER_PRESETS[profile]
+
+
+def test_producer_settings_overrides_win_over_the_profile(settings):
+    _use(
+        settings,
+        kafka_producer_profile="throughput",
+        kafka_linger_ms=5,
+        kafka_compression_type="none",
+        kafka_acks="all",
+    )
+    producer_settings = get_producer_settings()
+    assert producer_settings["linger_ms"] == 5
+    assert producer_settings["compression_type"] is None
+    assert producer_settings["acks"] == "all"
+    assert producer_settings["batch_size"] == PRODUCER_PRESETS["throughput"]["batch_size"]
+
+
+def test_unknown_producer_profile_is_rejected(settings):
+    _use(settings, kafka_producer_profile="turbo")
+    with pytest.raises(ValueError):
+        get_producer_settings()
+
+
+def test_load_settings_rejects_an_unknown_producer_profile():
+    with pytest.raises(ValueError):
+        config.load_settings(env={"KAFKA_PRODUCER_PROFILE": "turbo"}, dotenv=False)
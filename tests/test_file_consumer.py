@@ -0,0 +1,178 @@
+"""Tests for consumers/file_consumer_rogers.py: FileTailer rotation, truncation, resume and long lines."""
+
+import json
+import os
+import threading
+import time
+
+from consumers.file_consumer_rogers import FileTailer, consume_messages_from_file
+from consumers.sqlite_connection_rogers import get_connection_manager
+from tests.conftest import make_message
+
+
+def append(path, *lines, end=b"\n"):
+    with open(path, "ab") as file:
+        for line in lines:
+            file.write(line.encode() + end)
+
+
+def rotate(path, keep: int = 2):
+    """Rotate like LiveFileWriter: <name>.N-1 -> <name>.N (dropping past keep), live -> .1."""
+    oldest = path.with_name(f"{path.name}.{keep}")
+    if oldest.exists():
+        oldest.unlink()
+    for n in range(keep - 1, 0, -1):
+        rotated = path.with_name(f"{path.name}.{n}")
+        if rotated.exists():
+            rotated.rename(path.with_name(f"{path.name}.{n + 1}"))
+    path.rename(path.with_name(f"{path.name}.1"))
+
+
+def read_all(tailer) -> list:
+    lines = []
+    while batch := tailer.read_lines():
+        lines.extend(line.decode() for line in batch)
+    return lines
+
+
+def test_returns_complete_lines_and_keeps_a_partial_one(tmp_path):
+    live = tmp_path / "live.json"
+    append(live, "a", "b")
+    append(live, "c", end=b"")
+    tailer = FileTailer(live)
+    assert read_all(tailer) == ["a", "b"]
+    append(live, "")
+    assert read_all(tailer) == ["c"]
+
+
+def test_truncation_restarts_from_the_beginning(tmp_path):
+    live = tmp_path / "live.json"
+    append(live, "first", "second")
+    tailer = FileTailer(live)
+    assert read_all(tailer) == ["first", "second"]
+    live.write_bytes(b"x\n")
+    assert read_all(tailer) == ["x"]
+
+
+def test_follows_rotation_after_reading_the_old_file(tmp_path):
+    live = tmp_path / "live.json"
+    append(live, "a1")
+    tailer = FileTailer(live)
+    assert read_all(tailer) == ["a1"]
+    append(live, "a2")
+    rotate(live)
+    append(live, "b1")
+    assert read_all(tailer) == ["a2", "b1"]
+
+
+def test_lagging_tailer_continues_with_the_oldest_kept_copy(tmp_path):
+    live = tmp_path / "live.json"
+    append(live, "a1")
+    tailer = FileTailer(live)
+    assert read_all(tailer) == ["a1"]
+    append(live, "a2")
+    # three rotations while the tailer is behind; the file it holds is deleted
+    for name in "bcd":
+        rotate(live, keep=2)
+        append(live, f"{name}1", f"{name}2")
+    assert read_all(tailer) == ["a2", "b1", "b2", "c1", "c2", "d1", "d2"]
+
+
+def test_hand_deleted_file_does_not_reread_older_copies(tmp_path):
+    live = tmp_path / "live.json"
+    append(live, "old")
+    rotate(live)
+    os.utime(live.with_name("live.json.1"), (1_000_000, 1_000_000))
+    append(live, "a1")
+    tailer = FileTailer(live)
+    assert read_all(tailer) == ["a1"]
+    live.unlink()
+    append(live, "b1")
+    assert read_all(tailer) == ["b1"]
+
+
+def test_resumes_a_checkpoint_in_a_rotated_copy(tmp_path):
+    live = tmp_path / "live.json"
+    append(live, "a1", "a2")
+    tailer = FileTailer(live)
+    tailer.read_lines(max_bytes=3)
+    inode, offset = tailer.inode, tailer.offset
+    tailer.close()
+    rotate(live)
+    append(live, "b1")
+    assert read_all(FileTailer(live, inode, offset)) == ["a2", "b1"]
+
+
+def test_a_new_file_reusing_the_inode_is_read_from_the_start(tmp_path):
+    live = tmp_path / "live.json"
+    append(live, "a1", "a2")
+    tailer = FileTailer(live)
+    tailer.read_lines(max_bytes=3)
+    inode, offset, fingerprint = tailer.inode, tailer.offset, tailer.fingerprint()
+    tailer.close()
+    # same inode, different content (as if the file was deleted and its inode reused)
+    live.write_bytes(b"b1\nb2\n")
+    assert live.stat().st_ino == inode
+    assert read_all(FileTailer(live, inode, offset, fingerprint, time.time())) == ["b1", "b2"]
+
+
+def test_fingerprint_matches_the_checkpointed_file(tmp_path):
+    live = tmp_path / "live.json"
+    append(live, "a1", "a2")
+    tailer = FileTailer(live)
+    tailer.read_lines(max_bytes=3)
+    inode, offset, fingerprint = tailer.inode, tailer.offset, tailer.fingerprint()
+    tailer.close()
+    append(live, "a3")
+    assert read_all(FileTailer(live, inode, offset, fingerprint)) == ["a2", "a3"]
+
+
+def test_lost_checkpoint_does_not_replay_copies_older_than_it(tmp_path):
+    live = tmp_path / "live.json"
+    append(live, "stale")
+    rotate(live)
+    os.utime(live.with_name("live.json.1"), (1_000_000, 1_000_000))
+    append(live, "new")
+    # the checkpointed inode is gone; only copies written since the checkpoint are read
+    assert read_all(FileTailer(live, -1, 10, "gone", saved_at=2_000_000)) == ["new"]
+
+
+def test_skips_a_line_longer_than_max_bytes(tmp_path):
+    live = tmp_path / "live.json"
+    append(live, "x" * 50, "short")
+    tailer = FileTailer(live)
+    assert tailer.read_lines(max_bytes=16) == [b"short"]
+    assert tailer.offset == live.stat().st_size
+
+
+def test_waits_for_the_end_of_an_incomplete_long_line(tmp_path):
+    live = tmp_path / "live.json"
+    append(live, "x" * 50, end=b"")
+    tailer = FileTailer(live)
+    assert tailer.read_lines(max_bytes=16) == []
+    assert tailer.offset == 0
+    append(live, "", "next")
+    assert tailer.read_lines(max_bytes=16) == [b"next"]
+
+
+def test_consume_messages_from_file_stores_lines_and_checkpoint(db_path, tmp_path):
+    live = tmp_path / "live.json"
+    append(live, json.dumps(make_message()), "not json", json.dumps(make_message(critic="Eve")))
+    stop_event = threading.Event()
+    timer = threading.Timer(0.5, stop_event.set)
+    timer.start()
+    consume_messages_from_file(live, db_path, stop_event=stop_event)
+    timer.join()
+
+    tailer = FileTailer(live)
+    read_all(tailer)
+    with get_connection_manager(db_path).reader() as conn:
+        assert conn.execute("SELECT critic FROM streamed_messages ORDER BY id").fetchall() == [
+            ("Bob",),
+            ("Eve",),
+        ]
+        assert conn.execute("SELECT offset, fingerprint FROM file_checkpoints").fetchone() == (
+            live.stat().st_size,
+            tailer.fingerprint(),
+        )
+    tailer.close()
@@ -0,0 +1,192 @@
+"""Tests for consumers/kafka_consumer_rogers.py, driven by a fake Kafka consumer."""
+
+import collections
+import threading
+
+import pytest
+from kafka import TopicPartition
+
+import consumers.kafka_consumer_rogers as kafka_consumer
+from consumers.sqlite_connection_rogers import get_connection_manager
+from utils.utils_codec import encode_record, get_codec
+from tests.conftest import make_message
+
+Record = collections.namedtuple("Record", "topic partition offset value headers")
+
+TOPIC = "buzz_test"
+
+
+def make_record(offset: int, partition: int = 0, codec: str = "json", **fields) -> Record:
+    value, headers = encode_record(make_message(**fields), get_codec(codec))
+    return Record(TOPIC, partition, offset, value, headers)
+
+
+class FakeConsumer:
+    """Returns one prepared poll() result per call, then sets stop_event."""
+
+    def __init__(self, polls: list, stop_event: threading.Event):
+        self.polls = list(polls)
+        self.stop_event = stop_event
+        self.commits = []
+        self.closed = False
+
+    def poll(self, timeout_ms=0, max_records=None):
+        if not self.polls:
+            self.stop_event.set()
+            return {}
+        result = self.polls.pop(0)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def commit(self, offsets=None):
+        self.commits.append(offsets)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def run_consumer(db_path, monkeypatch):
+    """Run consume_messages_from_kafka() in batch mode over the given polls."""
+
+    def run(polls, **kwargs):
+        stop_event = threading.Event()
+        consumer = FakeConsumer(polls, stop_event)
+        monkeypatch.setattr(kafka_consumer, "create_kafka_consumer", lambda *args, **kw: consumer)
+        kafka_consumer.consume_messages_from_kafka(
+            TOPIC, "localhost:9092", "test-group", stop_event=stop_event, **kwargs
+        )
+        return consumer
+
+    return run
+
+
+def _stored(db_path) -> int:
+    with get_connection_manager(db_path).reader() as conn:
+        return conn.execute("SELECT COUNT(*) FROM streamed_messages").fetchone()[0]
+
+
+def test_decode_message_reads_the_codec_header():
+    assert kafka_consumer.decode_message(make_record(0, codec="bin1")) == make_message()
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        Record(TOPIC, 0, 0, b"{}", [("codec", b"nope")]),
+        Record(TOPIC, 0, 0, b"\x00\x01", [("codec", b"bin1")]),
+        Record(TOPIC, 0, 0, b"not json", []),
+    ],
+)
+def test_decode_message_returns_none_for_bad_records(record):
+    assert kafka_consumer.decode_message(record) is None
+
+
+def test_batches_are_stored_and_bad_records_skipped(db_path, run_consumer):
+    tp = TopicPartition(TOPIC, 0)
+    bad = Record(TOPIC, 0, 2, b"{}", [("codec", b"nope")])
+    batches = []
+    run_consumer(
+        [{tp: [make_record(0), make_record(1, codec="bin1"), bad]}, {tp: [make_record(3)]}],
+        on_batch=batches.append,
+    )
+    assert _stored(db_path) == 3
+    assert [len(batch) for batch in batches if batch] == [2, 1]
+
+
+def _committed(consumer) -> list:
+    return [
+        {tp.partition: meta.offset for tp, meta in offsets.items()} for offsets in consumer.commits
+    ]
+
+
+def test_commits_the_offsets_of_stored_records_only(db_path, run_consumer):
+    tp0, tp1 = TopicPartition(TOPIC, 0), TopicPartition(TOPIC, 1)
+    consumer = run_consumer(
+        [
+            {tp0: [make_record(0), make_record(1)], tp1: [make_record(5, partition=1)]},
+            {tp0: [make_record(2)]},
+        ]
+    )
+    assert _committed(consumer) == [{0: 2, 1: 6}, {0: 3}]
+    assert consumer.closed
+
+
+def test_interrupt_before_the_write_commits_nothing_more(db_path, run_consumer, monkeypatch):
+    tp = TopicPartition(TOPIC, 0)
+    process_messages = kafka_consumer.process_messages
+    calls = []
+
+    def interrupt_second_batch(messages):
+        calls.append(1)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return process_messages(messages)
+
+    monkeypatch.setattr(kafka_consumer, "process_messages", interrupt_second_batch)
+    consumer = run_consumer([{tp: [make_record(0)]}, {tp: [make_record(1)]}])
+    assert _stored(db_path) == 1
+    assert _committed(consumer) == [{0: 1}]
+
+
+def test_failed_write_is_committed_with_the_next_stored_batch(db_path, run_consumer, monkeypatch):
+    import consumers.db_sqlite_rogers as db
+
+    insert_messages = db.insert_messages
+    calls = []
+
+    def fail_first_insert(*args, **kwargs):
+        calls.append(1)
+        return False if len(calls) == 1 else insert_messages(*args, **kwargs)
+
+    monkeypatch.setattr(db, "insert_messages", fail_first_insert)
+    tp = TopicPartition(TOPIC, 0)
+    consumer = run_consumer([{tp: [make_record(0)]}, {tp: [make_record(1)]}])
+    assert _stored(db_path) == 2
+    assert _committed(consumer) == [{0: 2}]
+
+
+def test_record_mode_with_a_stop_event_uses_batch_mode(db_path, run_consumer, settings):
+    import dataclasses
+
+    import utils.utils_config as config
+
+    config.set_settings(dataclasses.replace(settings, kafka_poll_mode="record"))
+    batches = []
+    consumer = run_consumer([{TopicPartition(TOPIC, 0): [make_record(0)]}], on_batch=batches.append)
+    assert _stored(db_path) == 1
+    assert batches[0] == [make_message()]
+    assert consumer.closed
+
+
+def test_supervisor_children_get_their_own_metrics_ports():
+    commands = kafka_consumer.supervisor_commands(2, 1, metrics_port=9109)
+    ports = {name: env["METRICS_PORT"] for name, (_, env) in commands.items()}
+    assert ports == {"ingest-1": "9109", "ingest-2": "9110", "viewer-1": "9111"}
+
+
+def test_supervisor_children_inherit_the_environment_without_metrics():
+    commands = kafka_consumer.supervisor_commands(1, 1)
+    assert all(env is None for _, env in commands.values())
+
+
+def test_combined_mode_stops_and_joins_ingest_before_closing(db_path, monkeypatch):
+    import consumers.dashboard_rogers as dashboard
+
+    events = []
+    ingest_stopped = threading.Event()
+
+    def fake_consume(topic, kafka_url, group_id, store=None, stop_event=None):
+        stop_event.wait(5)
+        ingest_stopped.set()
+
+    def fake_close_all():
+        events.append(f"close_all (ingest stopped: {ingest_stopped.is_set()})")
+
+    monkeypatch.setattr(kafka_consumer, "consume_messages_from_kafka", fake_consume)
+    monkeypatch.setattr(kafka_consumer, "close_all", fake_close_all)
+    monkeypatch.setattr(dashboard, "update_chart", lambda data: events.append("chart closed"))
+
+    kafka_consumer.main(["--mode", "combined", "--no-reset"])
+    assert events == ["chart closed", "close_all (ingest stopped: True)"]
@@ -0,0 +1,143 @@
+"""Tests for the topic functions in utils/utils_producer.py, against fake Kafka clients."""
+
+import pytest
+
+import utils.utils_producer as utils_producer
+from utils.utils_producer import create_kafka_topic, reset_kafka_topic
+
+
+class FakeAdmin:
+    """Admin client holding topic name -> partition count."""
+
+    def __init__(self, topics, with_delete_records=True):
+        self.topics = dict(topics)
+        self.calls = []
+        if with_delete_records:
+            self.delete_records = self._delete_records
+
+    def list_topics(self):
+        return list(self.topics)
+
+    def describe_topics(self, names):
+        return [{"partitions": [{"partition": p} for p in range(self.topics[name])]} for name in names]
+
+    def delete_topics(self, names, timeout_ms=None):
+        self.calls.append(("delete_topics", names))
+        for name in names:
+            del self.topics[name]
+
+    def create_topics(self, new_topics, timeout_ms=None):
+        for topic in new_topics:
+            self.calls.append(("create_topics", topic.name, topic.num_partitions))
+            self.topics[topic.name] = topic.num_partitions
+
+    def create_partitions(self, partitions):
+        for name, new_partitions in partitions.items():
+            self.calls.append(("create_partitions", name, new_partitions.total_count))
+            self.topics[name] = new_partitions.total_count
+
+    def _delete_records(self, offsets, timeout_ms=None):
+        self.calls.append(("delete_records", {tp.partition: offset for tp, offset in offsets.items()}))
+
+
+class FakeConsumer:
+    """KafkaConsumer with two partitions whose end offsets are 5 and 7."""
+
+    instances = []
+
+    def __init__(self, **settings):
+        self.group_id = settings.get("group_id")
+        self.committed = None
+        self.closed = False
+        FakeConsumer.instances.append(self)
+
+    def partitions_for_topic(self, topic):
+        return {0, 1}
+
+    def end_offsets(self, topic_partitions):
+        return {tp: (5, 7)[tp.partition] for tp in topic_partitions}
+
+    def commit(self, offsets):
+        self.committed = {tp.partition: meta.offset for tp, meta in offsets.items()}
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    admin = FakeAdmin({"buzz": 2})
+    monkeypatch.setattr(utils_producer, "get_admin_client", lambda: admin)
+    monkeypatch.setattr(utils_producer, "close_admin_client", lambda: None)
+    monkeypatch.setattr(utils_producer, "KafkaConsumer", FakeConsumer)
+    FakeConsumer.instances.clear()
+    return admin
+
+
+def test_recreate_deletes_and_recreates_with_the_same_partitions(admin):
+    result = reset_kafka_topic("buzz", mode="recreate", timeout_secs=5)
+    assert result.ok and result.mode == "recreate"
+    assert admin.calls == [("delete_topics", ["buzz"]), ("create_topics", "buzz", 2)]
+
+
+def test_delete_records_deletes_below_the_end_offsets(admin):
+    result = reset_kafka_topic("buzz", mode="delete_records", timeout_secs=5)
+    assert result.ok and result.mode == "delete_records"
+    assert admin.calls == [("delete_records", {0: 5, 1: 7})]
+    assert FakeConsumer.instances[0].closed
+
+
+def test_delete_records_falls_back_to_recreate(admin):
+    del admin.delete_records
+    result = reset_kafka_topic("buzz", mode="delete_records", timeout_secs=5)
+    assert result.ok and result.mode == "recreate"
+    assert admin.calls == [("delete_topics", ["buzz"]), ("create_topics", "buzz", 2)]
+
+
+def test_seek_end_commits_the_group_at_the_end(admin):
+    result = reset_kafka_topic("buzz", "buzz_group", mode="seek_end", timeout_secs=5)
+    assert result.ok and result.mode == "seek_end"
+    consumer = FakeConsumer.instances[0]
+    assert consumer.group_id == "buzz_group"
+    assert consumer.committed == {0: 5, 1: 7}
+    assert consumer.closed
+    assert admin.calls == []
+
+
+def test_seek_end_without_a_group_fails(admin):
+    result = reset_kafka_topic("buzz", mode="seek_end", timeout_secs=5)
+    assert not result.ok
+    assert "ValueError" in result.detail
+
+
+def test_none_leaves_the_topic_alone(admin):
+    result = reset_kafka_topic("buzz", mode="none", timeout_secs=5)
+    assert result.ok and result.detail == "left as is"
+    assert admin.calls == []
+
+
+def test_unknown_mode_is_rejected(admin):
+    with pytest.raises(ValueError):
+        reset_kafka_topic("buzz", mode="drain", timeout_secs=5)
+
+
+def test_create_kafka_topic_resets_and_grows_an_existing_topic(admin, monkeypatch):
+    monkeypatch.setattr(utils_producer, "get_kafka_topic_reset_mode", lambda: "none")
+    create_kafka_topic("buzz", "buzz_group", num_partitions=4)
+    assert admin.calls == [("create_partitions", "buzz", 4)]
+
+
+def test_create_kafka_topic_creates_a_missing_topic(admin):
+    create_kafka_topic("other", num_partitions=3)
+    assert admin.calls == [("create_topics", "other", 3)]
+
+
+def test_create_kafka_topic_raises_when_the_reset_fails(admin, monkeypatch):
+    def failing_delete(names, timeout_ms=None):
+        raise RuntimeError("broker said no")
+
+    admin.delete_topics = failing_delete
+    monkeypatch.setattr(utils_producer, "get_kafka_topic_reset_mode", lambda: "recreate")
+    with pytest.raises(RuntimeError, match="broker said no"):
+        create_kafka_topic("buzz", "buzz_group")
+    assert "buzz" in admin.topics
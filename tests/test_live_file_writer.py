@@ -0,0 +1,97 @@
+"""Tests for producers/live_file_writer_rogers.py: buffering, partial writes, fsync and rotation."""
+
+import pytest
+
+from producers.live_file_writer_rogers import LiveFileWriter
+from utils.utils_metrics import histogram
+
+
+class ShortWriteFile:
+    """Wrap a raw file so each write() takes at most a few bytes, like a short write."""
+
+    def __init__(self, file, most: int = 3):
+        self._file = file
+        self._most = most
+
+    def write(self, data):
+        return self._file.write(data[: self._most])
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def test_lines_are_buffered_until_a_threshold(tmp_path):
+    path = tmp_path / "live.json"
+    writer = LiveFileWriter(path, flush_bytes=1000, flush_interval_secs=3600)
+    writer.write('{"n": 1}')
+    assert path.read_text() == ""
+
+    writer.flush()
+    assert path.read_text() == '{"n": 1}\n'
+    writer.close()
+
+
+def test_flush_bytes_triggers_a_write(tmp_path):
+    path = tmp_path / "live.json"
+    with LiveFileWriter(path, flush_bytes=10, flush_interval_secs=3600) as writer:
+        writer.write("a" * 4)
+        assert path.read_text() == ""
+        writer.write("b" * 6)
+        assert path.read_text() == "aaaa\nbbbbbb\n"
+        assert writer.stats()["flushes"] == 1
+
+
+def test_short_writes_are_completed(tmp_path):
+    path = tmp_path / "live.json"
+    writer = LiveFileWriter(path, flush_bytes=1000, flush_interval_secs=3600)
+    writer._file = ShortWriteFile(writer._file)
+    for n in range(5):
+        writer.write(f'{{"n": {n}}}')
+    writer.close()
+    assert path.read_text().splitlines() == [f'{{"n": {n}}}' for n in range(5)]
+
+
+def test_always_policy_fsyncs_every_line(tmp_path):
+    with LiveFileWriter(tmp_path / "live.json", fsync_policy="always") as writer:
+        writer.write("one")
+        writer.write("two")
+        assert writer.stats()["fsyncs"] == 2
+
+
+def test_invalid_fsync_policy_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        LiveFileWriter(tmp_path / "live.json", fsync_policy="sometimes")
+
+
+def test_rotation_shifts_backups_and_drops_the_oldest(tmp_path):
+    path = tmp_path / "live.json"
+    with LiveFileWriter(path, flush_bytes=1, rotate_bytes=5, rotate_backups=2) as writer:
+        for line in ("aaaa", "bbbb", "cccc", "dddd"):
+            writer.write(line)
+        assert writer.stats()["rotations"] == 4
+
+    assert path.read_text() == ""
+    assert (tmp_path / "live.json.1").read_text() == "dddd\n"
+    assert (tmp_path / "live.json.2").read_text() == "cccc\n"
+    assert not (tmp_path / "live.json.3").exists()
+
+
+def test_rotation_without_backups_starts_over(tmp_path):
+    path = tmp_path / "live.json"
+    with LiveFileWriter(path, flush_bytes=1, rotate_bytes=5, rotate_backups=0) as writer:
+        writer.write("aaaa")
+        writer.write("bb")
+    assert path.read_text() == "bb\n"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_timings_are_exported_as_metrics(tmp_path):
+    write_seconds = histogram("buzz_live_file_write_seconds", "")
+    rotate_seconds = histogram("buzz_live_file_rotate_seconds", "")
+    writes, rotations = write_seconds.count, rotate_seconds.count
+
+    with LiveFileWriter(tmp_path / "live.json", flush_bytes=1, rotate_bytes=5) as writer:
+        writer.write("aaaa")
+        writer.write("bb")
+    assert write_seconds.count == writes + 2
+    assert rotate_seconds.count == rotations + 1
@@ -0,0 +1,108 @@
+"""Tests for utils/utils_metrics.py: histogram buckets, exposition format and the endpoint."""
+
+import socket
+import time
+import urllib.request
+
+import pytest
+
+from utils.utils_metrics import (
+    CounterMetric,
+    HistogramMetric,
+    counter,
+    gauge,
+    observe_lag,
+    percentile,
+    render,
+    start_metrics_server,
+    stop_metrics_server,
+    timestamp_to_epoch,
+)
+
+
+def _samples(metric) -> dict:
+    return {f"{metric.name}{suffix}{labels}": value for suffix, labels, value in metric.samples()}
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    histogram = HistogramMetric("test_seconds", "Test.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    histogram.observe(1.0, count=3)
+
+    samples = _samples(histogram)
+    # a value equal to a bound counts in that bucket (le = less than or equal)
+    assert samples['test_seconds_bucket{le="0.1"}'] == 2
+    assert samples['test_seconds_bucket{le="1"}'] == 6
+    assert samples['test_seconds_bucket{le="+Inf"}'] == 7
+    assert samples["test_seconds_count"] == 7
+    assert samples["test_seconds_sum"] == pytest.approx(0.05 + 0.1 + 0.5 + 2.0 + 3.0)
+
+
+def test_histogram_timer_observes_elapsed_seconds():
+    histogram = HistogramMetric("test_timer_seconds", "Test.")
+    with histogram.time():
+        time.sleep(0.01)
+    assert histogram.count == 1
+    assert histogram.total >= 0.01
+
+
+def test_histogram_percentile_is_the_upper_bound_of_its_bucket():
+    histogram = HistogramMetric("test_percentile_seconds", "Test.", buckets=(0.1, 1.0))
+    assert histogram.percentile(0.5) == 0.0
+    for value in (0.05, 0.05, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.percentile(0.5) == 0.1
+    assert histogram.percentile(0.75) == 1.0
+    assert histogram.percentile(0.99) == float("inf")
+
+
+def test_percentile_of_sorted_samples():
+    assert percentile([], 0.99) == 0.0
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 51
+    assert percentile(values, 0.99) == 100
+    assert percentile(values[:50], 0.99) == 50
+    assert percentile([7], 0.99) == 7
+
+
+def test_render_uses_the_text_exposition_format():
+    metric = CounterMetric("test_total", "Things counted.")
+    metric.inc(3)
+    assert metric.render() == "# HELP test_total Things counted.\n# TYPE test_total counter\ntest_total 3"
+
+
+def test_registry_returns_the_same_metric_and_rejects_type_clashes():
+    first = counter("buzz_test_registry_total", "Test.")
+    assert counter("buzz_test_registry_total", "Test.") is first
+    with pytest.raises(ValueError):
+        gauge("buzz_test_registry_total", "Test.")
+
+
+def test_observe_lag_counts_each_timestamp():
+    histogram = HistogramMetric("test_lag_seconds", "Test.", buckets=(1.0, 10.0))
+    now = timestamp_to_epoch("2025-02-20 07:53:30")
+    observe_lag(histogram, ["2025-02-20 07:53:29"] * 3 + ["2025-02-20 07:53:25", "bad"], now=now)
+    samples = _samples(histogram)
+    assert samples['test_lag_seconds_bucket{le="1"}'] == 3
+    assert samples["test_lag_seconds_count"] == 4
+
+
+def test_metrics_endpoint_serves_the_registry():
+    counter("buzz_test_endpoint_total", "Test.").inc()
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = start_metrics_server(port, "127.0.0.1")
+    try:
+        assert server is not None
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode()
+        assert "buzz_test_endpoint_total 1" in body
+        assert body == render()
+    finally:
+        stop_metrics_server()
+
+
+def test_port_zero_serves_nothing():
+    assert start_metrics_server(0) is None
@@ -0,0 +1,65 @@
+"""Tests for producers/pacing_rogers.py: TokenBucket pacing with a fake clock."""
+
+import math
+
+import pytest
+
+from producers.pacing_rogers import RateReporter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, secs: float) -> None:
+        self.slept += secs
+        self.now += secs
+
+
+def test_paces_to_the_target_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(10, clock=clock, sleep=clock.sleep)
+    for _ in range(21):
+        bucket.acquire()
+    # the first message goes at once, the other 20 at 10 per second
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_a_stall_is_caught_up_only_up_to_the_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(100, burst=5, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+    clock.now += 10.0
+    for _ in range(5):
+        bucket.acquire()
+    assert clock.slept == 0.0
+    bucket.acquire()
+    assert clock.slept == pytest.approx(0.01)
+
+
+def test_unthrottled_never_sleeps():
+    clock = FakeClock()
+    bucket = TokenBucket(math.inf, clock=clock, sleep=clock.sleep)
+    for _ in range(1000):
+        bucket.acquire()
+    assert clock.slept == 0.0
+
+
+@pytest.mark.parametrize("rate", [0, -1])
+def test_rejects_non_positive_rates(rate):
+    with pytest.raises(ValueError):
+        TokenBucket(rate)
+
+
+def test_rate_reporter_achieved_rate():
+    clock = FakeClock()
+    reporter = RateReporter(50, interval_secs=1.0, clock=clock)
+    for _ in range(4):
+        clock.now += 0.5
+        reporter.record(25)
+    assert reporter.count == 100
+    assert reporter.achieved_rate() == pytest.approx(50.0)
@@ -0,0 +1,34 @@
+"""Tests for producers/producer_rogers.py: message generation."""
+
+from producers.producer_rogers import generate_message_batches, generate_messages
+from utils.utils_metrics import histogram
+
+FIELDS = {"title", "review", "critic", "timestamp", "genre", "sentiment", "message_length"}
+
+
+def _generate_seconds():
+    return histogram("buzz_producer_generate_seconds", "")
+
+
+def test_generate_messages_times_each_message():
+    before = _generate_seconds().count
+    messages = generate_messages()
+    message = next(messages)
+    next(messages)
+    assert set(message) == FIELDS
+    assert message["message_length"] == len(message["review"])
+    assert _generate_seconds().count == before + 2
+
+
+def test_generate_message_batches_times_every_message_in_the_batch():
+    before = _generate_seconds().count
+    batch = next(generate_message_batches(5, seed=1))
+    assert len(batch) == 5
+    assert all(set(message) == FIELDS for message in batch)
+    assert _generate_seconds().count == before + 5
+
+
+def test_seeded_batches_are_reproducible():
+    first = next(generate_message_batches(3, seed=7))
+    second = next(generate_message_batches(3, seed=7))
+    assert [message["title"] for message in first] == [message["title"] for message in second]
@@ -0,0 +1,52 @@
+"""Tests for utils/utils_readiness.py and verify_services(): no probe may exit the process."""
+
+import pytest
+
+import utils.utils_producer as utils_producer
+from utils.utils_readiness import check_readiness, run_probe
+
+
+def failing_probe(timeout_secs):
+    raise ConnectionRefusedError("no broker")
+
+
+def test_run_probe_retries_until_the_deadline():
+    clock = iter(range(100)).__next__
+    result = run_probe(
+        "Kafka",
+        failing_probe,
+        deadline=5,
+        attempt_timeout_secs=1,
+        backoff_secs=0.5,
+        clock=clock,
+        sleep=lambda secs: None,
+    )
+    assert not result.ok
+    assert result.attempts > 1
+    assert "ConnectionRefusedError" in result.error
+
+
+def test_check_readiness_reports_each_probe():
+    report = check_readiness(
+        {"ok": lambda timeout: "fine", "down": failing_probe},
+        deadline_secs=0.2,
+        attempt_timeout_secs=0.1,
+        backoff_secs=0.05,
+    )
+    assert not report.ok
+    assert report.result("ok").ok
+    assert [result.name for result in report.failed()] == ["down"]
+
+
+def test_verify_services_returns_the_report_by_default(monkeypatch):
+    down = check_readiness({"Zookeeper": failing_probe, "Kafka": failing_probe}, deadline_secs=0)
+    monkeypatch.setattr(utils_producer, "check_readiness", lambda: down)
+    assert utils_producer.verify_services() is down
+
+
+def test_verify_services_exits_only_when_asked(monkeypatch):
+    down = check_readiness({"Zookeeper": failing_probe, "Kafka": failing_probe}, deadline_secs=0)
+    monkeypatch.setattr(utils_producer, "check_readiness", lambda: down)
+    with pytest.raises(SystemExit) as exited:
+        utils_producer.verify_services(exit_on_failure=True)
+    assert exited.value.code == 1
@@ -0,0 +1,57 @@
+"""Tests for consumers/sqlite_connection_rogers.py: pragma profiles and the shared connections."""
+
+import pytest
+
+import consumers.db_sqlite_rogers as db_sqlite
+from consumers.sqlite_connection_rogers import (
+    DEFAULT_PROFILE,
+    SQLiteConnectionManager,
+    get_connection_manager,
+    measure_concurrent_load,
+)
+
+
+def test_writer_uses_the_configured_journal_mode(db_path):
+    with get_connection_manager(db_path).writer() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_writer_rolls_back_on_error(db_path):
+    manager = get_connection_manager(db_path)
+    with pytest.raises(RuntimeError):
+        with manager.writer() as conn:
+            conn.execute("INSERT INTO critic_entry_counts VALUES ('Bob', 1)")
+            raise RuntimeError("boom")
+    with manager.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM critic_entry_counts").fetchone() == (0,)
+
+
+def test_reader_is_read_only(db_path):
+    import sqlite3
+
+    with get_connection_manager(db_path).reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO critic_entry_counts VALUES ('Bob', 1)")
+
+
+def test_invalid_pragma_values_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        SQLiteConnectionManager(tmp_path / "x.sqlite", dict(DEFAULT_PROFILE, journal_mode="FAST"))
+
+
+def test_measure_concurrent_load_writes_messages_and_aggregates(monkeypatch):
+    counts = []
+    insert_messages = db_sqlite.insert_messages
+
+    def counting_insert(messages, db_path):
+        committed = insert_messages(messages, db_path)
+        with get_connection_manager(db_path).reader() as conn:
+            counts.append(dict(conn.execute("SELECT critic, review_count FROM critic_entry_counts")))
+        return committed
+
+    monkeypatch.setattr(db_sqlite, "insert_messages", counting_insert)
+    result = measure_concurrent_load(DEFAULT_PROFILE, seconds=0.2, batch_size=6)
+
+    assert counts and counts[0] == {"Bob": 2, "Eve": 2, "Ann": 2}
+    assert result["writer_msgs_per_sec"] > 0
+    assert result["reader_p50_ms"] <= result["reader_p99_ms"] <= result["reader_max_ms"]
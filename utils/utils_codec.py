@@ -0,0 +1,267 @@
+"""
+utils_codec.py - wire codecs shared by producers and consumers.
+
+Each Kafka record carries a "codec" header naming how its value was
+encoded, so a topic with mixed encodings still decodes. Records without
+the header are treated as JSON (what older producers wrote).
+
+Codecs:
+- json: json.dumps / json.loads (the original format).
+- bin1: compact schema-based binary encoding of the seven message fields.
+- msgpack: MessagePack, only if the msgpack package is installed.
+
+Run this module directly to benchmark bytes per message and
+encode/decode time for each available codec:
+
+    python -m utils.utils_codec
+"""
+
+#####################################
+# Imports
+#####################################
+
+# Import packages from Python Standard Library
+import calendar
+import json
+import struct
+import time
+from functools import lru_cache
+
+# Import external packages (optional)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Import functions from local modules
+from .utils_logger import logger
+
+CODEC_HEADER = "codec"
+
+#####################################
+# JSON Codec
+#####################################
+
+
+class JsonCodec:
+    """UTF-8 JSON - readable, larger and slower."""
+
+    name = "json"
+
+    def encode(self, message: dict) -> bytes:
+        return json.dumps(message).encode("utf-8")
+
+    def decode(self, data: bytes) -> dict:
+        return json.loads(data.decode("utf-8"))
+
+
+#####################################
+# Compact Binary Codec
+#####################################
+
+
+class BinaryCodec:
+    """
+    Fixed-schema binary encoding for the movie review message.
+
+    Layout (little-endian):
+        uint32 timestamp (seconds since the epoch, the wall-clock time as written)
+        float64 sentiment
+        uint32 message_length
+        uint8 critic length, uint8 genre length,
+        uint16 title length, uint16 review length
+        then the UTF-8 bytes of critic, genre, title, review
+    """
+
+    name = "bin1"
+    _header = struct.Struct("<IdIBBHH")
+    TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+    # messages arrive many per second, so timestamp conversions are cached;
+    # lru_cache is thread-safe, so one codec can be shared by ingest and dashboard threads
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _to_epoch(text: str) -> int:
+        return calendar.timegm(time.strptime(text, BinaryCodec.TIME_FORMAT))
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _to_text(epoch: int) -> str:
+        return time.strftime(BinaryCodec.TIME_FORMAT, time.gmtime(epoch))
+
+    def encode(self, message: dict) -> bytes:
+        critic = message["critic"].encode("utf-8")
+        genre = message["genre"].encode("utf-8")
+        title = message["title"].encode("utf-8")
+        review = message["review"].encode("utf-8")
+        return (
+            self._header.pack(
+                self._to_epoch(message["timestamp"]),
+                message["sentiment"],
+                message["message_length"],
+                len(critic),
+                len(genre),
+                len(title),
+                len(review),
+            )
+            + critic
+            + genre
+            + title
+            + review
+        )
+
+    def decode(self, data: bytes) -> dict:
+        epoch, sentiment, message_length, n_critic, n_genre, n_title, n_review = (
+            self._header.unpack_from(data)
+        )
+        pos = self._header.size
+        critic = data[pos : pos + n_critic].decode("utf-8")
+        pos += n_critic
+        genre = data[pos : pos + n_genre].decode("utf-8")
+        pos += n_genre
+        title = data[pos : pos + n_title].decode("utf-8")
+        pos += n_title
+        review = data[pos : pos + n_review].decode("utf-8")
+        return {
+            "title": title,
+            "review": review,
+            "critic": critic,
+            "timestamp": self._to_text(epoch),
+            "genre": genre,
+            "sentiment": sentiment,
+            "message_length": message_length,
+        }
+
+
+#####################################
+# MessagePack Codec (optional)
+#####################################
+
+
+class MsgpackCodec:
+    """MessagePack - schema-less binary, needs the msgpack package."""
+
+    name = "msgpack"
+
+    def encode(self, message: dict) -> bytes:
+        return msgpack.packb(message)
+
+    def decode(self, data: bytes) -> dict:
+        return msgpack.unpackb(data)
+
+
+#####################################
+# Codec Registry
+#####################################
+
+CODECS = {codec.name: codec for codec in (JsonCodec(), BinaryCodec())}
+if msgpack is not None:
+    CODECS[MsgpackCodec.name] = MsgpackCodec()
+
+
+def get_codec(name: str):
+    """
+    Return the codec registered under name.
+
+    Raises:
+        ValueError: If the codec is unknown or its package isn't installed.
+    """
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown or unavailable codec '{name}'. Available: {sorted(CODECS)}."
+        ) from None
+
+
+def encode_record(message: dict, codec) -> tuple:
+    """
+    Encode a message for Kafka, falling back to JSON if the codec can't
+    represent it (e.g. a missing field for the binary schema).
+
+    Returns:
+        tuple: (value bytes, headers list for KafkaProducer.send)
+    """
+    try:
+        value = codec.encode(message)
+    except (KeyError, TypeError, ValueError, struct.error) as e:
+        logger.warning(f"Codec '{codec.name}' could not encode message ({e}); using json.")
+        codec = CODECS["json"]
+        value = codec.encode(message)
+    return value, [(CODEC_HEADER, codec.name.encode("ascii"))]
+
+
+def decode_record(value: bytes, headers=None) -> dict:
+    """
+    Decode a Kafka record value using the codec named in its headers.
+    Records without a codec header are JSON.
+
+    Args:
+        value (bytes): Raw record value.
+        headers (list): Record headers as (key, bytes) pairs.
+
+    Raises:
+        ValueError: If the codec header names an unknown codec; a corrupt
+            value raises whatever its codec raises. Consumers decode each
+            record separately and skip the ones that fail.
+    """
+    name = "json"
+    for key, header_value in headers or ():
+        if key == CODEC_HEADER:
+            name = header_value.decode("ascii")
+            break
+    return get_codec(name).decode(value)
+
+
+#####################################
+# Benchmark
+#####################################
+
+
+def benchmark(messages: list) -> dict:
+    """
+    Measure size and speed of every available codec on the same messages.
+
+    Returns:
+        dict: codec name -> bytes/msg, encode and decode microseconds/msg.
+    """
+    results = {}
+    for name, codec in CODECS.items():
+        started = time.perf_counter()
+        encoded = [codec.encode(message) for message in messages]
+        encode_secs = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for data in encoded:
+            codec.decode(data)
+        decode_secs = time.perf_counter() - started
+
+        results[name] = {
+            "bytes_per_msg": sum(len(data) for data in encoded) / len(messages),
+            "encode_us_per_msg": encode_secs / len(messages) * 1e6,
+            "decode_us_per_msg": decode_secs / len(messages) * 1e6,
+        }
+    return results
+
+
+def main() -> None:
+    """Benchmark the codecs on generated messages."""
+    from itertools import islice
+
+    from producers.producer_rogers import generate_messages
+
+    messages = list(islice(generate_messages(), 100_000))
+    for name, result in benchmark(messages).items():
+        logger.info(
+            f"{name:8s} {result['bytes_per_msg']:6.1f} bytes/msg, "
+            f"encode {result['encode_us_per_msg']:5.2f} us/msg, "
+            f"decode {result['decode_us_per_msg']:5.2f} us/msg"
+        )
+
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,14 @@ It centralizes the configuration management
 by loading environment variables from .env in the root project folder
  and constructing file paths using pathlib. 
 
+Settings are parsed and validated once, on first use, into a frozen
+Settings object (get_settings()). It is cheap to pass around and
+picklable, so child processes can be handed the parent's settings
+(set_settings()). The get_*() functions below are thin shims over it.
+
 If you rename any variables in .env, remember to:
 - recopy .env to .env.example (and hide the secrets)
-- update the corresponding function in this module.
+- update the Settings field, load_settings() and the corresponding function in this module.
 """
 
 #####################################
@@ -18,20 +23,325 @@ If you rename any variables in .env, remember to:
 #####################################
 
 # import from Python Standard Library
+import dataclasses
 import os
 import pathlib
+import threading
+from dataclasses import dataclass
+from typing import Optional, Union
 
 # import from external packages
 from dotenv import load_dotenv
 
 # import from local modules
-from .utils_logger import logger
+from .utils_logger import configure_logging, logger
 
 #####################################
-# Load Environment Variables
+# Settings
 #####################################
 
-load_dotenv()
+
+@dataclass(frozen=True)
+class Settings:
+    """Every .env setting, parsed and validated. Build with load_settings()."""
+
+    # Kafka and Zookeeper
+    zookeeper_address: str
+    kafka_broker_address: str
+    kafka_topic: str
+    kafka_num_partitions: int
+    kafka_consumer_group_id: str
+    kafka_poll_mode: str
+    kafka_poll_max_records: int
+    kafka_poll_timeout_ms: int
+    kafka_producer_profile: str
+    kafka_linger_ms: Optional[int]
+    kafka_batch_size: Optional[int]
+    kafka_compression_type: Optional[str]
+    kafka_acks: Optional[Union[int, str]]
+    kafka_buffer_memory: Optional[int]
+    kafka_producer_flush_timeout_seconds: float
+    kafka_topic_reset_mode: str
+    kafka_topic_reset_timeout_seconds: float
+    readiness_deadline_seconds: float
+    readiness_attempt_timeout_seconds: float
+    readiness_retry_backoff_seconds: float
+
+    # Producer
+    message_interval_seconds: int
+    message_rate_per_second: float
+    message_rate_burst: float
+    message_codec: str
+    producer_report_interval_seconds: float
+
+    # Consumers
+    consumer_mode: str
+    consumer_workers: int
+    consumer_report_interval_seconds: float
+    file_poll_min_seconds: float
+    file_poll_max_seconds: float
+    aggregate_series_capacity: int
+
+    # Files
+    base_data_path: pathlib.Path
+    live_data_path: pathlib.Path
+    live_data_flush_bytes: int
+    live_data_flush_interval_seconds: float
+    live_data_fsync: str
+    live_data_fsync_interval_seconds: float
+    live_data_rotate_bytes: int
+    live_data_rotate_backups: int
+
+    # SQLite
+    sqlite_path: pathlib.Path
+    sqlite_batch_size: int
+    sqlite_flush_interval_seconds: float
+    sqlite_reset_on_start: bool
+    sqlite_journal_mode: str
+    sqlite_synchronous: str
+    sqlite_cache_size: int
+    sqlite_mmap_size: int
+    sqlite_temp_store: str
+    sqlite_busy_timeout_ms: int
+    backfill_workers: int
+    backfill_chunk_mb: int
+    backfill_transaction_rows: int
+
+    # Dashboard
+    chart_critic: str
+    chart_genre: str
+    chart_max_points: int
+    chart_refresh_seconds: float
+    chart_blit: bool
+
+    # Metrics
+    metrics_host: str
+    metrics_port: int
+
+    # Other databases
+    database_type: str
+    postgres_host: str
+    postgres_port: int
+    postgres_db: str
+    postgres_user: str
+    postgres_password: str = dataclasses.field(repr=False)
+    mongodb_uri: str
+    mongodb_db: str
+    mongodb_collection: str
+
+
+class _EnvReader:
+    """Read typed values from an environment mapping, collecting every error."""
+
+    def __init__(self, env):
+        self.env = env
+        self.errors = []
+
+    def text(self, name: str, default: str) -> str:
+        return self.env.get(name, default)
+
+    def _convert(self, name: str, default, convert):
+        raw = self.env.get(name, "")
+        if not str(raw).strip():
+            return default
+        try:
+            return convert(str(raw).strip())
+        except ValueError:
+            self.errors.append(f"{name}={raw!r} is not a valid {convert.__name__}")
+            return default
+
+    def integer(self, name: str, default: int, minimum: int = None) -> int:
+        value = self._convert(name, default, int)
+        if minimum is not None and value is not None and value < minimum:
+            self.errors.append(f"{name}={value} must be at least {minimum}")
+        return value
+
+    def number(self, name: str, default: float, minimum: float = None) -> float:
+        value = self._convert(name, default, float)
+        if minimum is not None and value is not None and value < minimum:
+            self.errors.append(f"{name}={value} must be at least {minimum}")
+        return value
+
+    def flag(self, name: str, default: bool) -> bool:
+        raw = self.env.get(name)
+        if raw is None or not raw.strip():
+            return default
+        return raw.strip().lower() in ("1", "true", "yes")
+
+    def choice(self, name: str, default: str, choices: set, upper: bool = False) -> str:
+        raw = self.env.get(name, "").strip() or default
+        value = raw.upper() if upper else raw.lower()
+        if value not in choices:
+            self.errors.append(f"{name}={raw!r} must be one of {sorted(choices)}")
+            return default
+        return value
+
+
+def load_settings(env=None, dotenv: bool = True) -> Settings:
+    """
+    Parse and validate the settings.
+
+    Args:
+        env (Mapping, optional): Variables to read. Defaults to os.environ.
+        dotenv (bool): Load .env into os.environ first (only when env is None).
+
+    Raises:
+        ValueError: Listing every invalid variable.
+    """
+    if env is None:
+        if dotenv:
+            load_dotenv()
+            # pick up LOG_* settings from .env
+            configure_logging()
+        env = os.environ
+    read = _EnvReader(env)
+
+    rate = read.text("MESSAGE_RATE_PER_SECOND", "0").strip().lower()
+    if rate == "max":
+        message_rate_per_second = float("inf")
+    else:
+        message_rate_per_second = read.number("MESSAGE_RATE_PER_SECOND", 0.0, minimum=0.0)
+
+    acks = read.text("KAFKA_ACKS", "").strip().lower() or None
+    if acks is not None and acks != "all":
+        acks = read.integer("KAFKA_ACKS", None)
+        if acks not in (None, 0, 1, -1):
+            read.errors.append(f"KAFKA_ACKS={acks} must be 0, 1 or all")
+
+    project_root = pathlib.Path(__file__).parent.parent
+    base_data_path = project_root / read.text("BASE_DATA_DIR", "data")
+
+    settings = Settings(
+        zookeeper_address=read.text("ZOOKEEPER_ADDRESS", "localhost:2181"),
+        kafka_broker_address=read.text("KAFKA_BROKER_ADDRESS", "localhost:9092"),
+        kafka_topic=read.text("BUZZ_TOPIC", "buzzline"),
+        kafka_num_partitions=read.integer("KAFKA_NUM_PARTITIONS", 1, minimum=1),
+        kafka_consumer_group_id=read.text("BUZZ_CONSUMER_GROUP_ID", "buzz_group"),
+        kafka_poll_mode=read.choice("KAFKA_POLL_MODE", "batch", {"batch", "record"}),
+        kafka_poll_max_records=read.integer("KAFKA_POLL_MAX_RECORDS", 500, minimum=1),
+        kafka_poll_timeout_ms=read.integer("KAFKA_POLL_TIMEOUT_MS", 1000, minimum=0),
+        kafka_producer_profile=read.choice(
+            "KAFKA_PRODUCER_PROFILE", "default", {"throughput", "latency", "default"}
+        ),
+        kafka_linger_ms=read.integer("KAFKA_LINGER_MS", None, minimum=0),
+        kafka_batch_size=read.integer("KAFKA_BATCH_SIZE", None, minimum=0),
+        kafka_compression_type=read.text("KAFKA_COMPRESSION_TYPE", "").strip().lower() or None,
+        kafka_acks=acks,
+        kafka_buffer_memory=read.integer("KAFKA_BUFFER_MEMORY", None, minimum=0),
+        kafka_producer_flush_timeout_seconds=read.number(
+            "KAFKA_PRODUCER_FLUSH_TIMEOUT_SECONDS", 30.0, minimum=0.0
+        ),
+        kafka_topic_reset_mode=read.choice(
+            "KAFKA_TOPIC_RESET_MODE", "recreate", {"recreate", "delete_records", "seek_end", "none"}
+        ),
+        kafka_topic_reset_timeout_seconds=read.number(
+            "KAFKA_TOPIC_RESET_TIMEOUT_SECONDS", 30.0, minimum=0.0
+        ),
+        readiness_deadline_seconds=read.number("READINESS_DEADLINE_SECONDS", 10.0, minimum=0.0),
+        readiness_attempt_timeout_seconds=read.number(
+            "READINESS_ATTEMPT_TIMEOUT_SECONDS", 3.0, minimum=0.1
+        ),
+        readiness_retry_backoff_seconds=read.number(
+            "READINESS_RETRY_BACKOFF_SECONDS", 0.5, minimum=0.0
+        ),
+        message_interval_seconds=read.integer("MESSAGE_INTERVAL_SECONDS", 5, minimum=0),
+        message_rate_per_second=message_rate_per_second,
+        message_rate_burst=read.number("MESSAGE_RATE_BURST", 0.0, minimum=0.0),
+        message_codec=read.choice("MESSAGE_CODEC", "json", {"json", "bin1", "msgpack"}),
+        producer_report_interval_seconds=read.number(
+            "PRODUCER_REPORT_INTERVAL_SECONDS", 10.0, minimum=0.0
+        ),
+        consumer_mode=read.choice(
+            "CONSUMER_MODE", "combined", {"combined", "ingest", "supervisor"}
+        ),
+        consumer_workers=read.integer("CONSUMER_WORKERS", 2, minimum=1),
+        consumer_report_interval_seconds=read.number(
+            "CONSUMER_REPORT_INTERVAL_SECONDS", 2.0, minimum=0.0
+        ),
+        file_poll_min_seconds=read.number("FILE_POLL_MIN_SECONDS", 0.05, minimum=0.0),
+        file_poll_max_seconds=read.number("FILE_POLL_MAX_SECONDS", 2.0, minimum=0.0),
+        aggregate_series_capacity=read.integer("AGGREGATE_SERIES_CAPACITY", 100000, minimum=1),
+        base_data_path=base_data_path,
+        live_data_path=base_data_path / read.text("LIVE_DATA_FILE_NAME", "project_live.json"),
+        live_data_flush_bytes=read.integer("LIVE_DATA_FLUSH_BYTES", 65536, minimum=0),
+        live_data_flush_interval_seconds=read.number(
+            "LIVE_DATA_FLUSH_INTERVAL_SECONDS", 1.0, minimum=0.0
+        ),
+        live_data_fsync=read.choice("LIVE_DATA_FSYNC", "interval", {"never", "interval", "always"}),
+        live_data_fsync_interval_seconds=read.number(
+            "LIVE_DATA_FSYNC_INTERVAL_SECONDS", 5.0, minimum=0.0
+        ),
+        live_data_rotate_bytes=read.integer("LIVE_DATA_ROTATE_BYTES", 104857600, minimum=0),
+        live_data_rotate_backups=read.integer("LIVE_DATA_ROTATE_BACKUPS", 3, minimum=0),
+        sqlite_path=base_data_path / read.text("SQLITE_DB_FILE_NAME", "movie.sqlite"),
+        sqlite_batch_size=read.integer("SQLITE_BATCH_SIZE", 100, minimum=1),
+        sqlite_flush_interval_seconds=read.number(
+            "SQLITE_FLUSH_INTERVAL_SECONDS", 1.0, minimum=0.0
+        ),
+        sqlite_reset_on_start=read.flag("SQLITE_RESET_ON_START", True),
+        sqlite_journal_mode=read.choice(
+            "SQLITE_JOURNAL_MODE",
+            "WAL",
+            {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+            upper=True,
+        ),
+        sqlite_synchronous=read.choice(
+            "SQLITE_SYNCHRONOUS", "NORMAL", {"OFF", "NORMAL", "FULL", "EXTRA"}, upper=True
+        ),
+        sqlite_cache_size=read.integer("SQLITE_CACHE_SIZE", -20000),
+        sqlite_mmap_size=read.integer("SQLITE_MMAP_SIZE", 268435456, minimum=0),
+        sqlite_temp_store=read.choice(
+            "SQLITE_TEMP_STORE", "MEMORY", {"DEFAULT", "FILE", "MEMORY"}, upper=True
+        ),
+        sqlite_busy_timeout_ms=read.integer("SQLITE_BUSY_TIMEOUT_MS", 5000, minimum=0),
+        backfill_workers=read.integer("BACKFILL_WORKERS", 0, minimum=0),
+        backfill_chunk_mb=read.integer("BACKFILL_CHUNK_MB", 8, minimum=1),
+        backfill_transaction_rows=read.integer("BACKFILL_TRANSACTION_ROWS", 200000, minimum=1),
+        chart_critic=read.text("CHART_CRITIC", "Tilly"),
+        chart_genre=read.text("CHART_GENRE", "Action"),
+        chart_max_points=read.integer("CHART_MAX_POINTS", 1000, minimum=1),
+        chart_refresh_seconds=read.number("CHART_REFRESH_SECONDS", 2.0, minimum=0.0),
+        chart_blit=read.flag("CHART_BLIT", True),
+        metrics_host=read.text("METRICS_HOST", "127.0.0.1"),
+        metrics_port=read.integer("METRICS_PORT", 0, minimum=0),
+        database_type=read.text("DATABASE_TYPE", "sqlite"),
+        postgres_host=read.text("POSTGRES_HOST", "localhost"),
+        postgres_port=read.integer("POSTGRES_PORT", 5432, minimum=1),
+        postgres_db=read.text("POSTGRES_DB", "postgres_buzz_database"),
+        postgres_user=read.text("POSTGRES_USER", "your_username"),
+        postgres_password=read.text("POSTGRES_PASSWORD", "your_password"),
+        mongodb_uri=read.text("MONGODB_URI", "mongodb://localhost:27017/"),
+        mongodb_db=read.text("MONGODB_DB", "mongo_buzz_database"),
+        mongodb_collection=read.text("MONGODB_COLLECTION", "mongo_buzz_collection"),
+    )
+    if settings.file_poll_max_seconds < settings.file_poll_min_seconds:
+        read.errors.append("FILE_POLL_MAX_SECONDS must be at least FILE_POLL_MIN_SECONDS")
+    if read.errors:
+        raise ValueError("Invalid settings: " + "; ".join(read.errors))
+    return settings
+
+
+_settings = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """Return the process-wide settings, loading them on first use."""
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = load_settings()
+                logger.info(f"Loaded settings: {_settings}")
+    return _settings
+
+
+def set_settings(settings: Settings) -> None:
+    """Install settings loaded elsewhere (e.g. passed from a parent process)."""
+    global _settings
+    with _settings_lock:
+        _settings = settings
+
 
 #####################################
 # Getter Functions for .env Variables
@@ -39,125 +349,350 @@ load_dotenv()
 
 
 def get_zookeeper_address() -> str:
-    """Fetch ZOOKEEPER_ADDRESS from environment or use default."""
-    address = os.getenv("ZOOKEEPER_ADDRESS", "localhost:2181")
-    logger.info(f"ZOOKEEPER_ADDRESS: {address}")
-    return address
+    """Fetch ZOOKEEPER_ADDRESS."""
+    return get_settings().zookeeper_address
 
 
 def get_kafka_broker_address() -> str:
-    """Fetch KAFKA_BROKER_ADDRESS from environment or use default."""
-    address = os.getenv("KAFKA_BROKER_ADDRESS", "localhost:9092")
-    logger.info(f"KAFKA_BROKER_ADDRESS: {address}")
-    return address
+    """Fetch KAFKA_BROKER_ADDRESS."""
+    return get_settings().kafka_broker_address
+
+
+def get_kafka_producer_profile() -> str:
+    """Fetch KAFKA_PRODUCER_PROFILE (throughput, latency or default)."""
+    return get_settings().kafka_producer_profile
+
+
+def get_kafka_linger_ms():
+    """Fetch KAFKA_LINGER_MS (overrides the producer profile; None if unset)."""
+    return get_settings().kafka_linger_ms
+
+
+def get_kafka_batch_size():
+    """Fetch KAFKA_BATCH_SIZE in bytes (overrides the producer profile; None if unset)."""
+    return get_settings().kafka_batch_size
+
+
+def get_kafka_buffer_memory():
+    """Fetch KAFKA_BUFFER_MEMORY in bytes (overrides the producer profile; None if unset)."""
+    return get_settings().kafka_buffer_memory
+
+
+def get_kafka_compression_type():
+    """
+    Fetch KAFKA_COMPRESSION_TYPE (gzip, snappy, lz4, zstd or none;
+    overrides the producer profile; None if unset).
+    """
+    return get_settings().kafka_compression_type
+
+
+def get_kafka_acks():
+    """Fetch KAFKA_ACKS (0, 1 or all; overrides the producer profile; None if unset)."""
+    return get_settings().kafka_acks
+
+
+def get_kafka_producer_flush_timeout_seconds() -> float:
+    """Fetch KAFKA_PRODUCER_FLUSH_TIMEOUT_SECONDS (max wait for in-flight sends on shutdown)."""
+    return get_settings().kafka_producer_flush_timeout_seconds
+
+
+def get_kafka_topic_reset_mode() -> str:
+    """Fetch KAFKA_TOPIC_RESET_MODE (recreate, delete_records, seek_end or none)."""
+    return get_settings().kafka_topic_reset_mode
+
+
+def get_kafka_topic_reset_timeout_seconds() -> float:
+    """Fetch KAFKA_TOPIC_RESET_TIMEOUT_SECONDS (time allowed to reset the topic on startup)."""
+    return get_settings().kafka_topic_reset_timeout_seconds
+
+
+def get_readiness_deadline_seconds() -> float:
+    """Fetch READINESS_DEADLINE_SECONDS (total time the readiness probes keep retrying)."""
+    return get_settings().readiness_deadline_seconds
+
+
+def get_readiness_attempt_timeout_seconds() -> float:
+    """Fetch READINESS_ATTEMPT_TIMEOUT_SECONDS (timeout for one probe attempt)."""
+    return get_settings().readiness_attempt_timeout_seconds
+
+
+def get_readiness_retry_backoff_seconds() -> float:
+    """Fetch READINESS_RETRY_BACKOFF_SECONDS (first delay between probe attempts, doubling)."""
+    return get_settings().readiness_retry_backoff_seconds
 
 
 def get_kafka_topic() -> str:
-    """Fetch BUZZ_TOPIC from environment or use default."""
-    topic = os.getenv("BUZZ_TOPIC", "buzzline")
-    logger.info(f"BUZZ_TOPIC: {topic}")
-    return topic
+    """Fetch BUZZ_TOPIC."""
+    return get_settings().kafka_topic
+
+
+def get_kafka_num_partitions() -> int:
+    """Fetch KAFKA_NUM_PARTITIONS (partitions for the topic)."""
+    return get_settings().kafka_num_partitions
+
+
+def get_consumer_workers() -> int:
+    """Fetch CONSUMER_WORKERS (worker processes in the consumer group)."""
+    return get_settings().consumer_workers
+
+
+def get_consumer_report_interval_seconds() -> float:
+    """Fetch CONSUMER_REPORT_INTERVAL_SECONDS (how often workers report to the coordinator)."""
+    return get_settings().consumer_report_interval_seconds
 
 
 def get_message_interval_seconds_as_int() -> int:
-    """Fetch MESSAGE_INTERVAL_SECONDS from environment or use default."""
-    interval = int(os.getenv("MESSAGE_INTERVAL_SECONDS", 5))
-    logger.info(f"MESSAGE_INTERVAL_SECONDS: {interval}")
-    return interval
+    """Fetch MESSAGE_INTERVAL_SECONDS."""
+    return get_settings().message_interval_seconds
+
+
+def get_message_rate_per_second() -> float:
+    """
+    Fetch MESSAGE_RATE_PER_SECOND.
+    Fractions are allowed; "max" means unthrottled (inf);
+    0 or unset means pace by MESSAGE_INTERVAL_SECONDS instead.
+    """
+    return get_settings().message_rate_per_second
+
+
+def get_message_rate_burst() -> float:
+    """Fetch MESSAGE_RATE_BURST (token-bucket size; 0 = 0.1s worth of messages)."""
+    return get_settings().message_rate_burst
+
+
+def get_producer_report_interval_seconds() -> float:
+    """Fetch PRODUCER_REPORT_INTERVAL_SECONDS (rate and delivery summaries)."""
+    return get_settings().producer_report_interval_seconds
 
 
 def get_kafka_consumer_group_id() -> str:
-    """Fetch BUZZ_CONSUMER_GROUP_ID from environment or use default."""
-    group_id = os.getenv("BUZZ_CONSUMER_GROUP_ID", "buzz_group")
-    logger.info(f"BUZZ_CONSUMER_GROUP_ID: {group_id}")
-    return group_id
+    """Fetch BUZZ_CONSUMER_GROUP_ID."""
+    return get_settings().kafka_consumer_group_id
+
+
+def get_message_codec() -> str:
+    """Fetch MESSAGE_CODEC (json, bin1 or msgpack - see utils_codec)."""
+    return get_settings().message_codec
+
+
+def get_kafka_poll_mode() -> str:
+    """Fetch KAFKA_POLL_MODE (batch: poll + manual commit, record: iterate + auto-commit)."""
+    return get_settings().kafka_poll_mode
+
+
+def get_kafka_poll_max_records() -> int:
+    """Fetch KAFKA_POLL_MAX_RECORDS (records per poll)."""
+    return get_settings().kafka_poll_max_records
+
+
+def get_kafka_poll_timeout_ms() -> int:
+    """Fetch KAFKA_POLL_TIMEOUT_MS (max wait for a poll to fill)."""
+    return get_settings().kafka_poll_timeout_ms
+
+
+def get_consumer_mode() -> str:
+    """Fetch CONSUMER_MODE (combined, ingest or supervisor)."""
+    return get_settings().consumer_mode
 
 
 def get_base_data_path() -> pathlib.Path:
-    """Fetch BASE_DATA_DIR from environment or use default."""
-    project_root = pathlib.Path(__file__).parent.parent
-    data_dir = project_root / os.getenv("BASE_DATA_DIR", "data")
-    logger.info(f"BASE_DATA_DIR: {data_dir}")
-    return data_dir
+    """Fetch BASE_DATA_DIR."""
+    return get_settings().base_data_path
 
 
 def get_live_data_path() -> pathlib.Path:
-    """Fetch LIVE_DATA_FILE_NAME from environment or use default."""
-    live_data_path = get_base_data_path() / os.getenv(
-        "LIVE_DATA_FILE_NAME", "project_live.json"
-    )
-    logger.info(f"LIVE_DATA_PATH: {live_data_path}")
-    return live_data_path
+    """Fetch LIVE_DATA_FILE_NAME."""
+    return get_settings().live_data_path
+
+
+def get_file_poll_min_seconds() -> float:
+    """Fetch FILE_POLL_MIN_SECONDS (file source poll delay right after new data)."""
+    return get_settings().file_poll_min_seconds
+
+
+def get_file_poll_max_seconds() -> float:
+    """Fetch FILE_POLL_MAX_SECONDS (file source poll delay cap when idle)."""
+    return get_settings().file_poll_max_seconds
+
+
+def get_live_data_flush_bytes() -> int:
+    """Fetch LIVE_DATA_FLUSH_BYTES (buffered bytes before a write)."""
+    return get_settings().live_data_flush_bytes
+
+
+def get_live_data_flush_interval_seconds() -> float:
+    """Fetch LIVE_DATA_FLUSH_INTERVAL_SECONDS (max age of buffered lines)."""
+    return get_settings().live_data_flush_interval_seconds
+
+
+def get_live_data_fsync() -> str:
+    """Fetch LIVE_DATA_FSYNC (never, interval or always)."""
+    return get_settings().live_data_fsync
+
+
+def get_live_data_fsync_interval_seconds() -> float:
+    """Fetch LIVE_DATA_FSYNC_INTERVAL_SECONDS (min seconds between fsyncs)."""
+    return get_settings().live_data_fsync_interval_seconds
+
+
+def get_live_data_rotate_bytes() -> int:
+    """Fetch LIVE_DATA_ROTATE_BYTES (rotate the live file at this size, 0 = never)."""
+    return get_settings().live_data_rotate_bytes
+
+
+def get_live_data_rotate_backups() -> int:
+    """Fetch LIVE_DATA_ROTATE_BACKUPS (rotated live files to keep)."""
+    return get_settings().live_data_rotate_backups
 
 
 def get_sqlite_path() -> pathlib.Path:
-    """Fetch SQLITE_DB_FILE_NAME from environment or use default."""
-    sqlite_path = get_base_data_path() / os.getenv("SQLITE_DB_FILE_NAME", "movie.sqlite")
-    logger.info(f"SQLITE_PATH: {sqlite_path}")
-    return sqlite_path
+    """Fetch SQLITE_DB_FILE_NAME."""
+    return get_settings().sqlite_path
+
+
+def get_sqlite_batch_size() -> int:
+    """Fetch SQLITE_BATCH_SIZE (messages per insert transaction)."""
+    return get_settings().sqlite_batch_size
+
+
+def get_sqlite_flush_interval_seconds() -> float:
+    """Fetch SQLITE_FLUSH_INTERVAL_SECONDS (max age of a buffered message)."""
+    return get_settings().sqlite_flush_interval_seconds
+
+
+def get_sqlite_reset_on_start() -> bool:
+    """Fetch SQLITE_RESET_ON_START (drop stored messages when the consumer starts)."""
+    return get_settings().sqlite_reset_on_start
+
+
+def get_sqlite_journal_mode() -> str:
+    """Fetch SQLITE_JOURNAL_MODE (WAL lets readers and the writer overlap)."""
+    return get_settings().sqlite_journal_mode
+
+
+def get_sqlite_synchronous() -> str:
+    """Fetch SQLITE_SYNCHRONOUS."""
+    return get_settings().sqlite_synchronous
+
+
+def get_sqlite_cache_size() -> int:
+    """Fetch SQLITE_CACHE_SIZE (pages, or KiB if negative)."""
+    return get_settings().sqlite_cache_size
+
+
+def get_sqlite_mmap_size() -> int:
+    """Fetch SQLITE_MMAP_SIZE (bytes)."""
+    return get_settings().sqlite_mmap_size
+
+
+def get_sqlite_temp_store() -> str:
+    """Fetch SQLITE_TEMP_STORE."""
+    return get_settings().sqlite_temp_store
+
+
+def get_sqlite_busy_timeout_ms() -> int:
+    """Fetch SQLITE_BUSY_TIMEOUT_MS."""
+    return get_settings().sqlite_busy_timeout_ms
+
+
+def get_backfill_workers() -> int:
+    """Fetch BACKFILL_WORKERS (backfill parser processes, 0 = CPU count)."""
+    return get_settings().backfill_workers
+
+
+def get_backfill_chunk_mb() -> int:
+    """Fetch BACKFILL_CHUNK_MB (megabytes read per backfill chunk)."""
+    return get_settings().backfill_chunk_mb
+
+
+def get_backfill_transaction_rows() -> int:
+    """Fetch BACKFILL_TRANSACTION_ROWS (rows per backfill commit)."""
+    return get_settings().backfill_transaction_rows
+
+
+def get_chart_critic() -> str:
+    """Fetch CHART_CRITIC (critic plotted in the sentiment time series)."""
+    return get_settings().chart_critic
+
+
+def get_chart_genre() -> str:
+    """Fetch CHART_GENRE (genre plotted in the sentiment time series)."""
+    return get_settings().chart_genre
+
+
+def get_chart_max_points() -> int:
+    """Fetch CHART_MAX_POINTS (points kept in the live sentiment series)."""
+    return get_settings().chart_max_points
+
+
+def get_chart_refresh_seconds() -> float:
+    """Fetch CHART_REFRESH_SECONDS (dashboard refresh interval)."""
+    return get_settings().chart_refresh_seconds
+
+
+def get_chart_blit() -> bool:
+    """Fetch CHART_BLIT (redraw only the data artists when supported)."""
+    return get_settings().chart_blit
+
+
+def get_aggregate_series_capacity() -> int:
+    """Fetch AGGREGATE_SERIES_CAPACITY (recent points held by the in-memory aggregate store)."""
+    return get_settings().aggregate_series_capacity
+
+
+def get_metrics_host() -> str:
+    """Fetch METRICS_HOST (bind address for the /metrics endpoint)."""
+    return get_settings().metrics_host
+
+
+def get_metrics_port() -> int:
+    """Fetch METRICS_PORT (port for the /metrics endpoint, 0 = don't serve)."""
+    return get_settings().metrics_port
 
 
 def get_database_type() -> str:
-    """Fetch DATABASE_TYPE from environment or use default."""
-    db_type = os.getenv("DATABASE_TYPE", "sqlite")
-    logger.info(f"DATABASE_TYPE: {db_type}")
-    return db_type
+    """Fetch DATABASE_TYPE."""
+    return get_settings().database_type
 
 
 def get_postgres_host() -> str:
-    """Fetch POSTGRES_HOST from environment or use default."""
-    host = os.getenv("POSTGRES_HOST", "localhost")
-    logger.info(f"POSTGRES_HOST: {host}")
-    return host
+    """Fetch POSTGRES_HOST."""
+    return get_settings().postgres_host
 
 
 def get_postgres_port() -> int:
-    """Fetch POSTGRES_PORT from environment or use default."""
-    port = int(os.getenv("POSTGRES_PORT", 5432))
-    logger.info(f"POSTGRES_PORT: {port}")
-    return port
+    """Fetch POSTGRES_PORT."""
+    return get_settings().postgres_port
 
 
 def get_postgres_db() -> str:
-    """Fetch POSTGRES_DB from environment or use default."""
-    db = os.getenv("POSTGRES_DB", "postgres_buzz_database")
-    logger.info(f"POSTGRES_DB: {db}")
-    return db
+    """Fetch POSTGRES_DB."""
+    return get_settings().postgres_db
 
 
 def get_postgres_user() -> str:
-    """Fetch POSTGRES_USER from environment or use default."""
-    user = os.getenv("POSTGRES_USER", "your_username")
-    logger.info(f"POSTGRES_USER: {user}")
-    return user
+    """Fetch POSTGRES_USER."""
+    return get_settings().postgres_user
 
 
 def get_postgres_password() -> str:
-    """Fetch POSTGRES_PASSWORD from environment or use default."""
-    password = os.getenv("POSTGRES_PASSWORD", "your_password")
-    logger.info("POSTGRES_PASSWORD: [REDACTED]")
-    return password
+    """Fetch POSTGRES_PASSWORD."""
+    return get_settings().postgres_password
 
 
 def get_mongodb_uri() -> str:
-    """Fetch MONGODB_URI from environment or use default."""
-    uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
-    logger.info(f"MONGODB_URI: {uri}")
-    return uri
+    """Fetch MONGODB_URI."""
+    return get_settings().mongodb_uri
 
 
 def get_mongodb_db() -> str:
-    """Fetch MONGODB_DB from environment or use default."""
-    db = os.getenv("MONGODB_DB", "mongo_buzz_database")
-    logger.info(f"MONGODB_DB: {db}")
-    return db
+    """Fetch MONGODB_DB."""
+    return get_settings().mongodb_db
 
 
 def get_mongodb_collection() -> str:
-    """Fetch MONGODB_COLLECTION from environment or use default."""
-    collection = os.getenv("MONGODB_COLLECTION", "mongo_buzz_collection")
-    logger.info(f"MONGODB_COLLECTION: {collection}")
-    return collection
+    """Fetch MONGODB_COLLECTION."""
+    return get_settings().mongodb_collection
 
 
 #####################################
@@ -165,26 +700,14 @@ def get_mongodb_collection() -> str:
 #####################################
 
 if __name__ == "__main__":
-    # Test the configuration functions
+    # Test the configuration: parse and validate every setting once
     logger.info("Testing configuration.")
     try:
-        get_zookeeper_address()
-        get_kafka_broker_address()
-        get_kafka_topic()
-        get_message_interval_seconds_as_int()
-        get_kafka_consumer_group_id()
-        get_base_data_path()
-        get_live_data_path()
-        get_sqlite_path()
-        get_database_type()
-        get_postgres_host()
-        get_postgres_port()
-        get_postgres_db()
-        get_postgres_user()
-        get_postgres_password()
-        get_mongodb_uri()
-        get_mongodb_db()
-        get_mongodb_collection()
+        settings = get_settings()
+        for name, value in dataclasses.asdict(settings).items():
+            if name == "postgres_password":
+                value = "[REDACTED]"
+            logger.info(f"{name}: {value}")
         logger.info("SUCCESS: Configuration function tests complete.")
 
     except Exception as e:
@@ -11,6 +11,7 @@ Consumers subscribe to a topic and read messages from the Kafka topic.
 
 # Import external packages
 from kafka import KafkaConsumer
+from kafka.structs import OffsetAndMetadata
 
 # Import functions from local modules
 from .utils_config import get_kafka_broker_address
@@ -21,11 +22,21 @@ from .utils_logger import logger
 # Helper Functions
 #####################################
 
+# OffsetAndMetadata gained a leader_epoch field in newer kafka clients
+_OFFSET_METADATA = ("", -1) if len(OffsetAndMetadata._fields) > 2 else ("",)
+
+
+def offset_and_metadata(offset: int) -> OffsetAndMetadata:
+    """Return the OffsetAndMetadata for commit(offsets=...) on any kafka client version."""
+    return OffsetAndMetadata(offset, *_OFFSET_METADATA)
+
 
 def create_kafka_consumer(
     topic_provided: str = None,
     group_id_provided: str = None,
     value_deserializer_provided=None,
+    enable_auto_commit: bool = True,
+    max_poll_records: int = 500,
 ):
     """
     Create and return a Kafka consumer instance.
@@ -34,6 +45,9 @@ def create_kafka_consumer(
         topic_provided (str): The Kafka topic to subscribe to. Defaults to the environment variable or default.
         group_id_provided (str): The consumer group ID. Defaults to the environment variable or default.
         value_deserializer_provided (callable, optional): Function to deserialize message values.
+        enable_auto_commit (bool): Commit offsets in the background. Pass False
+            to commit manually after the records are safely stored.
+        max_poll_records (int): Upper bound on records returned by one poll().
 
     Returns:
         KafkaConsumer: Configured Kafka consumer instance.
@@ -54,7 +68,8 @@ def create_kafka_consumer(
             or (lambda x: x.decode("utf-8")),
             bootstrap_servers=kafka_broker,
             auto_offset_reset="earliest",
-            enable_auto_commit=True,
+            enable_auto_commit=enable_auto_commit,
+            max_poll_records=max_poll_records,
         )
         logger.info("Kafka consumer created successfully.")
         return consumer
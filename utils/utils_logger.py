@@ -9,6 +9,8 @@ This file can be used without modification.
 Features:
 - Logs information, warnings, and errors to a designated log file.
 - Ensures the log directory exists.
+- Enqueued (non-blocking) sinks; the file rotates, is retained and compressed.
+- SampledLogger and RateSummary for per-message hot paths.
 """
 
 #####################################
@@ -16,7 +18,12 @@ Features:
 #####################################
 
 # Imports from Python Standard Library
+import itertools
+import os
 import pathlib
+import sys
+import threading
+import time
 
 # Imports from external packages
 from loguru import logger
@@ -30,19 +37,132 @@ LOG_FOLDER: pathlib.Path = pathlib.Path("logs")
 # Set the name of the log file
 LOG_FILE: pathlib.Path = LOG_FOLDER.joinpath("project_log.log")
 
-# Ensure the log folder exists or create it
-try:
-    LOG_FOLDER.mkdir(exist_ok=True)
-    logger.info(f"Log folder created at: {LOG_FOLDER}")
-except Exception as e:
-    logger.error(f"Error creating log folder: {e}")
-
-# Configure Loguru to write to the log file
-try:
-    logger.add(LOG_FILE, level="INFO")
-    logger.info(f"Logging to file: {LOG_FILE}")
-except Exception as e:
-    logger.error(f"Error configuring logger to write to file: {e}")
+# Sink ids added by configure_logging(), so it can be called again
+_handler_ids = []
+
+
+def configure_logging() -> None:
+    """
+    (Re)configure the console and file sinks from the environment.
+
+    Both sinks are enqueued: a log call only puts the record on a queue
+    and a background thread does the formatting and writing, so hot
+    paths don't wait on disk. The file sink rotates, keeps old files for
+    a while and compresses them.
+
+    Environment variables (read directly - utils_config logs through this module):
+    - LOG_LEVEL: file sink level (default INFO)
+    - LOG_CONSOLE_LEVEL: console level (default INFO)
+    - LOG_ROTATION: size or time, e.g. "10 MB" or "00:00" (default 10 MB)
+    - LOG_RETENTION: how long to keep rotated files (default 7 days)
+    - LOG_COMPRESSION: format for rotated files, e.g. zip or gz (default zip)
+    """
+    if _handler_ids:
+        for handler_id in _handler_ids:
+            logger.remove(handler_id)
+        _handler_ids.clear()
+    else:
+        # first call: drop loguru's default synchronous stderr sink
+        logger.remove()
+
+    _handler_ids.append(
+        logger.add(sys.stderr, level=os.getenv("LOG_CONSOLE_LEVEL", "INFO"), enqueue=True)
+    )
+
+    # Ensure the log folder exists or create it
+    try:
+        LOG_FOLDER.mkdir(exist_ok=True)
+    except Exception as e:
+        logger.error(f"Error creating log folder: {e}")
+
+    # Configure Loguru to write to the log file
+    try:
+        _handler_ids.append(
+            logger.add(
+                LOG_FILE,
+                level=os.getenv("LOG_LEVEL", "INFO"),
+                enqueue=True,
+                rotation=os.getenv("LOG_ROTATION", "10 MB"),
+                retention=os.getenv("LOG_RETENTION", "7 days"),
+                compression=os.getenv("LOG_COMPRESSION", "zip") or None,
+            )
+        )
+    except Exception as e:
+        logger.error(f"Error configuring logger to write to file: {e}")
+
+
+configure_logging()
+logger.info(f"Logging to file: {LOG_FILE}")
+
+
+#####################################
+# Hot-Path Logging Helpers
+#####################################
+
+
+class SampledLogger:
+    """
+    Log every Nth call at DEBUG, lazily.
+
+    Arguments are callables that are only evaluated when a record is
+    actually emitted (loguru's lazy option), so unsampled calls cost a
+    counter increment:
+
+        _sample = SampledLogger(every=1000)
+        _sample.debug("Processed message: {}", lambda: processed_message)
+    """
+
+    def __init__(self, every: int = None):
+        """
+        Args:
+            every (int): Sampling interval. Defaults to LOG_SAMPLE_EVERY (1000).
+        """
+        self.every = max(1, every or int(os.getenv("LOG_SAMPLE_EVERY", 1000)))
+        self._counter = itertools.count(1)
+
+    def debug(self, message: str, *lazy_args) -> None:
+        if next(self._counter) % self.every:
+            return
+        logger.opt(lazy=True, depth=1).debug(message, *lazy_args)
+
+
+class RateSummary:
+    """
+    Count events and log one aggregated line per interval, e.g.
+    "Consumer: 5230 msgs in the last 10.0s (523.0 msgs/s), 81234 total",
+    in place of a line per record. Thread-safe.
+    """
+
+    def __init__(self, name: str, interval_secs: float = 10.0, unit: str = "msgs"):
+        """
+        Args:
+            name (str): Prefix for the summary line.
+            interval_secs (float): Seconds between summaries.
+            unit (str): What is being counted.
+        """
+        self.name = name
+        self.interval_secs = interval_secs
+        self.unit = unit
+        self.total = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self._interval_start = time.monotonic()
+
+    def add(self, n: int = 1) -> None:
+        """Count n events, logging a summary if the interval has passed."""
+        with self._lock:
+            self.total += n
+            self._count += n
+            now = time.monotonic()
+            elapsed = now - self._interval_start
+            if elapsed < self.interval_secs:
+                return
+            count, self._count, self._interval_start = self._count, 0, now
+            total = self.total
+        logger.opt(depth=1).info(
+            f"{self.name}: {count} {self.unit} in the last {elapsed:.1f}s "
+            f"({count / elapsed:.1f} {self.unit}/s), {total} total"
+        )
 
 
 def get_log_file_path() -> pathlib.Path:
@@ -0,0 +1,346 @@
+"""
+utils_metrics.py - in-process pipeline metrics served in Prometheus text format.
+
+Counters, gauges and latency histograms live in a module-level registry
+and are updated in place (a lock and a few additions per call). Nothing
+is formatted until something scrapes the endpoint, so an unscraped
+process pays only for the updates.
+
+    from utils.utils_metrics import counter, histogram
+    PROCESSED = counter("buzz_consumer_messages_processed_total", "Messages processed.")
+    PROCESSED.inc()
+
+start_metrics_server() serves GET /metrics from a daemon thread on
+127.0.0.1:METRICS_PORT (0, the default, means no server; metrics are
+still collected). Give each process its own port, e.g.
+
+    METRICS_PORT=9109 python -m consumers.kafka_consumer_rogers
+
+Usage (print the current process's metrics):
+    python -m utils.utils_metrics
+"""
+
+#####################################
+# Imports
+#####################################
+
+# Import packages from Python Standard Library
+import bisect
+import os
+import threading
+import time
+from collections import Counter as _Tally
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Import functions from local modules
+from .utils_config import get_metrics_host, get_metrics_port
+from .utils_logger import logger
+
+# default latency buckets in seconds (1 ms to 10 s)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# end-to-end lag buckets in seconds (message timestamps have 1 s resolution)
+LAG_BUCKETS = (0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+#####################################
+# Metric Types
+#####################################
+
+
+class Metric:
+    """Base class: a named value with a help string and a Prometheus type."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+
+    def samples(self) -> list:
+        """Return (name suffix, labels text, value) tuples."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class CounterMetric(Metric):
+    """A value that only goes up."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def samples(self) -> list:
+        return [("", "", self.value)]
+
+
+class GaugeMetric(Metric):
+    """A value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def samples(self) -> list:
+        return [("", "", self.value)]
+
+
+class HistogramMetric(Metric):
+    """Observations counted into fixed, cumulative buckets (plus sum and count)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float, count: int = 1) -> None:
+        """Record `count` observations of `value`."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.bucket_counts[index] += count
+            self.total += value * count
+            self.count += count
+
+    def time(self):
+        """Context manager that observes the elapsed seconds of its block."""
+        return _Timer(self)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Estimate a percentile as the upper bound of the bucket that contains
+        it (inf if it falls above the last bucket, 0.0 with no observations).
+        """
+        with self._lock:
+            counts = list(self.bucket_counts)
+            target = fraction * self.count
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            running += bucket_count
+            if running and running >= target:
+                return float(bound)
+        return 0.0
+
+    def samples(self) -> list:
+        with self._lock:
+            counts = list(self.bucket_counts)
+            total, count = self.total, self.count
+        samples = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            samples.append(("_bucket", f'{{le="{_format_value(bound)}"}}', running))
+        samples.append(("_bucket", '{le="+Inf"}', count))
+        samples.append(("_sum", "", total))
+        samples.append(("_count", "", count))
+        return samples
+
+
+class _Timer:
+    def __init__(self, histogram: HistogramMetric):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.histogram.observe(time.perf_counter() - self.started)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+#####################################
+# Registry
+#####################################
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _get_or_create(cls, name: str, help_text: str, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, help_text, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric '{name}' is already registered as a {metric.kind}.")
+        return metric
+
+
+def counter(name: str, help_text: str) -> CounterMetric:
+    """Return the counter with this name, registering it on first use."""
+    return _get_or_create(CounterMetric, name, help_text)
+
+
+def gauge(name: str, help_text: str) -> GaugeMetric:
+    """Return the gauge with this name, registering it on first use."""
+    return _get_or_create(GaugeMetric, name, help_text)
+
+
+def histogram(name: str, help_text: str, buckets: tuple = LATENCY_BUCKETS) -> HistogramMetric:
+    """Return the histogram with this name, registering it on first use."""
+    return _get_or_create(HistogramMetric, name, help_text, buckets=buckets)
+
+
+def render() -> str:
+    """Return every registered metric in Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda metric: metric.name)
+    return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+#####################################
+# End-to-End Lag
+#####################################
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """
+    Return the value at `fraction` of an ascending list of samples
+    (index int(len * fraction), capped at the last value; 0.0 if empty).
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+@lru_cache(maxsize=4096)
+def timestamp_to_epoch(timestamp: str) -> float:
+    """Convert a message timestamp ("%Y-%m-%d %H:%M:%S", local time) to epoch seconds."""
+    return time.mktime(time.strptime(timestamp, "%Y-%m-%d %H:%M:%S"))
+
+
+def observe_lag(metric: HistogramMetric, timestamps, now: float = None) -> None:
+    """
+    Observe now - timestamp for each message timestamp.
+
+    Timestamps have one-second resolution, so a batch holds only a few
+    distinct values: each is parsed (and cached) once and observed with
+    its count.
+    """
+    now = time.time() if now is None else now
+    for timestamp, count in _Tally(timestamps).items():
+        try:
+            metric.observe(max(now - timestamp_to_epoch(timestamp), 0.0), count)
+        except (TypeError, ValueError):
+            continue
+
+
+#####################################
+# HTTP Endpoint
+#####################################
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # scrapes are routine; don't write a line per request
+        pass
+
+
+_server = None
+_server_pid = None
+
+
+def start_metrics_server(port: int = None, host: str = None):
+    """
+    Serve /metrics from a daemon thread (once per process; a server
+    inherited from a forked parent does not count).
+
+    Args:
+        port (int): TCP port. Defaults to METRICS_PORT; 0 means don't serve.
+        host (str): Bind address. Defaults to METRICS_HOST (127.0.0.1).
+
+    Returns:
+        ThreadingHTTPServer or None: The server, or None if disabled or
+        the port is unavailable (metrics are still collected).
+    """
+    global _server, _server_pid
+    if _server is not None and _server_pid == os.getpid():
+        return _server
+    _server = None
+    port = get_metrics_port() if port is None else port
+    host = host or get_metrics_host()
+    if not port:
+        return None
+    try:
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+        return None
+    _server_pid = os.getpid()
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"Serving metrics at http://{host}:{port}/metrics")
+    return _server
+
+
+def stop_metrics_server() -> None:
+    global _server
+    if _server is not None and _server_pid == os.getpid():
+        _server.shutdown()
+        _server.server_close()
+        _server = None
+
+
+#####################################
+# Main Function for Testing
+#####################################
+
+
+def main() -> None:
+    example = histogram("buzz_example_seconds", "Example latency histogram.")
+    for value in (0.002, 0.02, 0.2):
+        example.observe(value)
+    counter("buzz_example_total", "Example counter.").inc(3)
+    print(render(), end="")
+
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == "__main__":
+    main()
@@ -10,21 +10,36 @@ Producers send messages to a Kafka topic.
 
 # Import packages from Python Standard Library
 import sys
-import socket
 import time
+from dataclasses import dataclass
 
 # Import external packages
-from kafka import KafkaProducer, KafkaConsumer, errors
-from kafka.admin import (
-    KafkaAdminClient,
-    ConfigResource,
-    ConfigResourceType,
-    NewTopic,
-)
+from kafka import KafkaProducer, KafkaConsumer, TopicPartition, errors
+from kafka.codec import has_lz4
+from kafka.admin import NewPartitions, NewTopic
 
 # Import functions from local modules
-from .utils_config import get_zookeeper_address, get_kafka_broker_address
+from .utils_config import (
+    get_kafka_broker_address,
+    get_kafka_num_partitions,
+    get_kafka_producer_profile,
+    get_kafka_linger_ms,
+    get_kafka_batch_size,
+    get_kafka_compression_type,
+    get_kafka_acks,
+    get_kafka_buffer_memory,
+    get_kafka_topic_reset_mode,
+    get_kafka_topic_reset_timeout_seconds,
+)
+from .utils_consumer import offset_and_metadata
 from .utils_logger import logger
+from .utils_readiness import (
+    check_readiness,
+    close_admin_client,
+    get_admin_client,
+    probe_kafka,
+    probe_zookeeper,
+)
 
 #####################################
 # Kafka and Zookeeper Readiness Checks
@@ -33,19 +48,14 @@ from .utils_logger import logger
 
 def check_zookeeper_service_is_ready():
     """
-    Check if Zookeeper is ready by verifying its port is open.
+    Check if Zookeeper is ready by verifying its port is open (one attempt).
 
     Returns:
         bool: True if Zookeeper is ready, False otherwise.
     """
-    zookeeper_address = get_zookeeper_address()
-    host, port = zookeeper_address.split(":")
-    port = int(port)
-
     try:
-        with socket.create_connection((host, port), timeout=5):
-            logger.info(f"Zookeeper is ready at {host}:{port}.")
-            return True
+        logger.info(f"Zookeeper is ready: {probe_zookeeper(timeout_secs=5)}.")
+        return True
     except Exception as e:
         logger.error(f"Error checking Zookeeper readiness: {e}")
         return False
@@ -53,20 +63,15 @@ def check_zookeeper_service_is_ready():
 
 def check_kafka_service_is_ready():
     """
-    Check if Kafka is ready by connecting to the broker and fetching metadata.
+    Check if Kafka is ready by fetching metadata through the shared admin client (one attempt).
 
     Returns:
         bool: True if Kafka is ready, False otherwise.
     """
-    kafka_broker = get_kafka_broker_address()
-
     try:
-        admin_client = KafkaAdminClient(bootstrap_servers=kafka_broker)
-        brokers = admin_client.describe_cluster()
-        logger.info(f"Kafka is ready. Brokers: {brokers}")
-        admin_client.close()
+        logger.info(f"Kafka is ready: {probe_kafka(timeout_secs=5)}.")
         return True
-    except errors.KafkaError as e:
+    except Exception as e:
         logger.error(f"Error checking Kafka: {e}")
         return False
 
@@ -76,39 +81,97 @@ def check_kafka_service_is_ready():
 #####################################
 
 
-def verify_services():
-    # Verify Zookeeper is ready
-    if not check_zookeeper_service_is_ready():
-        logger.error(
-            "Zookeeper is not ready. Please check your Zookeeper setup. Exiting..."
-        )
-        sys.exit(1)
+def verify_services(exit_on_failure: bool = False):
+    """
+    Probe Zookeeper and Kafka concurrently, retrying until the readiness
+    deadline (see utils_readiness.check_readiness()).
 
-    # Verify Kafka is ready
-    if not check_kafka_service_is_ready():
-        logger.error(
-            "Kafka broker is not ready. Please check your Kafka setup. Exiting..."
-        )
+    Args:
+        exit_on_failure (bool): Exit (code 1 for Zookeeper, 2 for Kafka) if a
+            service is not ready. Only command-line entry points should pass
+            True; by default the report is returned and the caller decides.
+
+    Returns:
+        ReadinessReport: The probe results.
+    """
+    report = check_readiness()
+    report.log()
+    if exit_on_failure and not report.ok:
+        if not report.result("Zookeeper").ok:
+            logger.error("Zookeeper is not ready. Please check your Zookeeper setup. Exiting...")
+            sys.exit(1)
+        logger.error("Kafka broker is not ready. Please check your Kafka setup. Exiting...")
         sys.exit(2)
+    return report
 
 
 #####################################
 # Create a Kafka Producer
 #####################################
 
+# throughput: wait up to 20 ms to fill large, compressed batches
+# latency: send each record as soon as possible, uncompressed
+PRODUCER_PRESETS = {
+    "throughput": {
+        "linger_ms": 20,
+        "batch_size": 131072,
+        "compression_type": "lz4" if has_lz4() else "gzip",
+        "acks": 1,
+        "buffer_memory": 67108864,
+    },
+    "latency": {
+        "linger_ms": 0,
+        "batch_size": 16384,
+        "compression_type": None,
+        "acks": 1,
+        "buffer_memory": 33554432,
+    },
+    "default": {},
+}
+
+
+def get_producer_settings() -> dict:
+    """
+    Build KafkaProducer settings from KAFKA_PRODUCER_PROFILE plus any
+    per-setting overrides in the environment (see utils_config).
 
-def create_kafka_producer(value_serializer=None):
+    Returns:
+        dict: KafkaProducer keyword arguments.
+    """
+    profile = get_kafka_producer_profile()
+    if profile not in PRODUCER_PRESETS:
+        raise ValueError(
+            f"Invalid KAFKA_PRODUCER_PROFILE '{profile}'. Use one of {sorted(PRODUCER_PRESETS)}."
+        )
+    settings = dict(PRODUCER_PRESETS[profile])
+    overrides = {
+        "linger_ms": get_kafka_linger_ms(),
+        "batch_size": get_kafka_batch_size(),
+        "compression_type": get_kafka_compression_type(),
+        "acks": get_kafka_acks(),
+        "buffer_memory": get_kafka_buffer_memory(),
+    }
+    for name, value in overrides.items():
+        if value is not None:
+            settings[name] = None if value == "none" else value
+    return settings
+
+
+def create_kafka_producer(value_serializer=None, **settings):
     """
     Create and return a Kafka producer instance.
 
     Args:
         value_serializer (callable): A custom serializer for message values.
                                      Defaults to UTF-8 string encoding.
+        **settings: KafkaProducer settings (linger_ms, batch_size, ...).
+                    Defaults to get_producer_settings().
 
     Returns:
         KafkaProducer: Configured Kafka producer instance.
     """
     kafka_broker = get_kafka_broker_address()
+    settings = settings or get_producer_settings()
 
     if value_serializer is None:
 
@@ -116,10 +179,11 @@ def create_kafka_producer(value_serializer=None):
             return x.encode("utf-8")  # Default to string serialization
 
     try:
-        logger.info(f"Connecting to Kafka broker at {kafka_broker}...")
+        logger.info(f"Connecting to Kafka broker at {kafka_broker} with {settings}...")
         producer = KafkaProducer(
             bootstrap_servers=kafka_broker,
             value_serializer=value_serializer,
+            **settings,
         )
         logger.info("Kafka producer successfully created.")
         return producer
@@ -133,99 +197,223 @@ def create_kafka_producer(value_serializer=None):
 #####################################
 
 
-def create_kafka_topic(topic_name, group_id=None):
+def create_kafka_topic(topic_name, group_id=None, num_partitions=None):
     """
     Create a fresh Kafka topic with the given name.
     Args:
         topic_name (str): Name of the Kafka topic.
+        group_id (str): Consumer group ID used when clearing an existing topic.
+        num_partitions (int): Partitions for the topic (KAFKA_NUM_PARTITIONS by default).
+            An existing topic with fewer partitions is grown to this count.
+    Raises:
+        RuntimeError: If an existing topic could not be reset (see reset_kafka_topic()).
     """
-    kafka_broker = get_kafka_broker_address()
+    num_partitions = num_partitions or get_kafka_num_partitions()
 
     try:
-        admin_client = KafkaAdminClient(bootstrap_servers=kafka_broker)
+        admin_client = get_admin_client()
 
         # Check if the topic exists
         topics = admin_client.list_topics()
         if topic_name in topics:
             logger.info(f"Topic '{topic_name}' exists. Clearing it out...")
-            clear_kafka_topic(topic_name, group_id)
+            result = reset_kafka_topic(topic_name, group_id, num_partitions=num_partitions)
+            if not result.ok:
+                raise RuntimeError(f"reset ({result.mode}) failed: {result.detail}")
+
+            description = admin_client.describe_topics([topic_name])[0]
+            current_partitions = len(description.get("partitions", []))
+            if current_partitions < num_partitions:
+                admin_client.create_partitions(
+                    {topic_name: NewPartitions(total_count=num_partitions)}
+                )
+                logger.info(
+                    f"Topic '{topic_name}' grown from {current_partitions} to {num_partitions} partitions."
+                )
 
         else:
-            logger.info(f"Creating '{topic_name}'.")
+            logger.info(f"Creating '{topic_name}' with {num_partitions} partitions.")
             new_topic = NewTopic(
-                name=topic_name, num_partitions=1, replication_factor=1
+                name=topic_name, num_partitions=num_partitions, replication_factor=1
             )
             admin_client.create_topics([new_topic])
             logger.info(f"Topic '{topic_name}' created successfully.")
 
     except Exception as e:
         logger.error(f"Error managing topic '{topic_name}': {e}")
-        sys.exit(1)
-
-    finally:
-        admin_client.close()
+        close_admin_client()
+        raise
 
 
 #####################################
-# Clear a Kafka Topic
+# Reset (Clear) a Kafka Topic
 #####################################
 
+TOPIC_RESET_MODES = {"recreate", "delete_records", "seek_end", "none"}
 
-def clear_kafka_topic(topic_name, group_id):
+
+@dataclass(frozen=True)
+class TopicResetResult:
+    """Outcome of reset_kafka_topic()."""
+
+    topic: str
+    mode: str
+    ok: bool
+    elapsed_secs: float
+    detail: str = ""
+
+
+def _wait_until(condition, deadline: float, interval_secs: float = 0.2) -> bool:
+    """Poll condition() until it is true or the deadline (time.monotonic()) passes."""
+    while True:
+        if condition():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval_secs)
+
+
+def _end_offsets(topic_name: str, group_id: str = None, timeout_secs: float = 30.0):
+    """
+    Return (consumer, {TopicPartition: end offset}) for every partition of
+    the topic. The caller closes the consumer.
     """
-    Consume and discard all messages in the Kafka topic to clear it.
+    timeout_ms = int(max(timeout_secs, 1) * 1000)
+    consumer = KafkaConsumer(
+        bootstrap_servers=get_kafka_broker_address(),
+        group_id=group_id,
+        enable_auto_commit=False,
+        request_timeout_ms=max(timeout_ms, 11000),  # must exceed the session timeout
+        api_version_auto_timeout_ms=timeout_ms,
+    )
+    partitions = consumer.partitions_for_topic(topic_name) or set()
+    topic_partitions = [TopicPartition(topic_name, p) for p in sorted(partitions)]
+    return consumer, consumer.end_offsets(topic_partitions) if topic_partitions else {}
+
+
+def _recreate_topic(topic_name: str, deadline: float, num_partitions: int = None) -> str:
+    """Delete the topic, wait for it to go, and create it again with the same partitions."""
+    admin_client = get_admin_client()
+    description = admin_client.describe_topics([topic_name])[0]
+    num_partitions = max(num_partitions or 1, len(description.get("partitions", [])))
+    timeout_ms = int(max(deadline - time.monotonic(), 1) * 1000)
+
+    admin_client.delete_topics([topic_name], timeout_ms=timeout_ms)
+    # deletion is asynchronous on the broker
+    if not _wait_until(lambda: topic_name not in admin_client.list_topics(), deadline):
+        raise TimeoutError(f"topic '{topic_name}' still exists after delete")
+
+    new_topic = NewTopic(name=topic_name, num_partitions=num_partitions, replication_factor=1)
+    while True:
+        try:
+            admin_client.create_topics([new_topic], timeout_ms=timeout_ms)
+            break
+        except errors.TopicAlreadyExistsError:
+            # still marked for deletion
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"topic '{topic_name}' could not be recreated in time")
+            time.sleep(0.2)
+    return f"deleted and recreated with {num_partitions} partition(s)"
+
+
+def _delete_records(topic_name: str, deadline: float) -> str:
+    """Delete every record below the current end offsets, keeping the topic."""
+    admin_client = get_admin_client()
+    consumer, end_offsets = _end_offsets(topic_name, timeout_secs=deadline - time.monotonic())
+    consumer.close()
+    if end_offsets:
+        admin_client.delete_records(
+            dict(end_offsets), timeout_ms=int(max(deadline - time.monotonic(), 1) * 1000)
+        )
+    return f"deleted records below {sum(end_offsets.values())} offset(s) in {len(end_offsets)} partition(s)"
+
+
+def _seek_group_to_end(topic_name: str, group_id: str, deadline: float) -> str:
+    """Commit the group's offsets at the end of every partition; records stay in the topic."""
+    if not group_id:
+        raise ValueError("seek_end needs a consumer group ID")
+    consumer, end_offsets = _end_offsets(topic_name, group_id, deadline - time.monotonic())
+    try:
+        if end_offsets:
+            consumer.commit(
+                {tp: offset_and_metadata(offset) for tp, offset in end_offsets.items()}
+            )
+    finally:
+        consumer.close()
+    return f"group '{group_id}' moved to the end of {len(end_offsets)} partition(s)"
+
+
+
+def reset_kafka_topic(
+    topic_name: str,
+    group_id: str = None,
+    mode: str = None,
+    timeout_secs: float = None,
+    num_partitions: int = None,
+) -> TopicResetResult:
+    """
+    Clear an existing topic (or, in seek_end mode, skip past its records)
+    in bounded time.
+
+    Modes (KAFKA_TOPIC_RESET_MODE):
+    - recreate: delete the topic and create it again (default)
+    - delete_records: delete records up to the end offsets, keeping the
+      topic and its configs (needs a client with admin delete_records();
+      otherwise falls back to recreate)
+    - seek_end: leave the records, move group_id's offsets to the end
+    - none: leave the topic as it is
 
     Args:
         topic_name (str): Name of the Kafka topic.
-        group_id (str): Consumer group ID.
+        group_id (str): Consumer group moved in seek_end mode.
+        mode (str): One of TOPIC_RESET_MODES.
+        timeout_secs (float): Time allowed (KAFKA_TOPIC_RESET_TIMEOUT_SECONDS).
+        num_partitions (int): Minimum partitions when recreating.
+
+    Returns:
+        TopicResetResult: Whether it succeeded, how long it took and what was done.
     """
-    kafka_broker = get_kafka_broker_address()
-    admin_client = KafkaAdminClient(bootstrap_servers=kafka_broker)
+    mode = mode or get_kafka_topic_reset_mode()
+    timeout_secs = timeout_secs if timeout_secs is not None else get_kafka_topic_reset_timeout_seconds()
+    if mode not in TOPIC_RESET_MODES:
+        raise ValueError(f"Invalid topic reset mode '{mode}'. Use one of {sorted(TOPIC_RESET_MODES)}.")
 
+    started = time.monotonic()
+    deadline = started + timeout_secs
     try:
-        # Fetch the current retention period
-        config_resource = ConfigResource(ConfigResourceType.TOPIC, topic_name)
-        configs = admin_client.describe_configs([config_resource])
-        original_retention = configs[config_resource].get(
-            "retention.ms", "604800000"
-        )  # Default to 7 days
-        logger.info(
-            f"Original retention.ms for topic '{topic_name}': {original_retention}"
+        if mode == "delete_records" and not hasattr(get_admin_client(), "delete_records"):
+            logger.warning("This Kafka client cannot delete records; recreating the topic instead.")
+            mode = "recreate"
+        if mode == "recreate":
+            detail = _recreate_topic(topic_name, deadline, num_partitions)
+        elif mode == "delete_records":
+            detail = _delete_records(topic_name, deadline)
+        elif mode == "seek_end":
+            detail = _seek_group_to_end(topic_name, group_id, deadline)
+        else:
+            detail = "left as is"
+        result = TopicResetResult(topic_name, mode, True, time.monotonic() - started, detail)
+        logger.info(f"Topic '{topic_name}' reset ({mode}): {detail} in {result.elapsed_secs:.2f}s.")
+    except Exception as e:
+        result = TopicResetResult(
+            topic_name, mode, False, time.monotonic() - started, f"{type(e).__name__}: {e}"
         )
+        logger.error(f"Topic '{topic_name}' reset ({mode}) failed after {result.elapsed_secs:.2f}s: {e}")
+    return result
 
-        # Temporarily set retention to 1ms
-        admin_client.alter_configs({config_resource: {"retention.ms": "1"}})
-        logger.info(f"Retention.ms temporarily set to 1ms for topic '{topic_name}'.")
-
-        # Wait a moment for Kafka to apply retention and delete old data
-        time.sleep(2)
 
-        # Clear remaining messages by consuming and discarding them
-        logger.info(f"Clearing topic '{topic_name}' by consuming all messages...")
-        consumer = KafkaConsumer(
-            topic_name,
-            group_id=group_id,
-            bootstrap_servers=kafka_broker,
-            auto_offset_reset="earliest",
-            enable_auto_commit=True,
-        )
-        for message in consumer:
-            logger.debug(f"Clearing message: {message.value}")
-        consumer.close()
-        logger.info(f"All messages cleared from topic '{topic_name}'.")
+def clear_kafka_topic(topic_name, group_id):
+    """
+    Clear the Kafka topic with reset_kafka_topic() (KAFKA_TOPIC_RESET_MODE).
 
-        # Restore the original retention period
-        admin_client.alter_configs(
-            {config_resource: {"retention.ms": original_retention}}
-        )
-        logger.info(
-            f"Retention.ms restored to {original_retention} for topic '{topic_name}'."
-        )
+    Args:
+        topic_name (str): Name of the Kafka topic.
+        group_id (str): Consumer group ID.
 
-    except Exception as e:
-        logger.error(f"Error managing retention for topic '{topic_name}': {e}")
-    finally:
-        admin_client.close()
+    Returns:
+        TopicResetResult: See reset_kafka_topic().
+    """
+    return reset_kafka_topic(topic_name, group_id)
 
 
 #####################################
@@ -239,15 +427,11 @@ def is_topic_available(topic_name) -> bool:
     Args:
         topic_name (str): Name of the Kafka topic.
     Returns:
-        bool: True if the topic exists, False otherwise.
+        bool: True if the topic exists, False otherwise (or if Kafka could not be reached).
     """
-    kafka_broker = get_kafka_broker_address()
-
     try:
-        admin_client = KafkaAdminClient(bootstrap_servers=kafka_broker)
-
         # Check if the topic exists
-        topics = admin_client.list_topics()
+        topics = get_admin_client().list_topics()
         if topic_name in topics:
             logger.info(f"Topic '{topic_name}' already exists. ")
             return True
@@ -257,10 +441,8 @@ def is_topic_available(topic_name) -> bool:
 
     except Exception as e:
         logger.error(f"Error verifying topic '{topic_name}': {e}")
-        sys.exit(8)
-
-    finally:
-        admin_client.close()
+        close_admin_client()
+        return False
 
 
 #####################################
@@ -272,16 +454,7 @@ def main():
     """
     Main entry point.
     """
-    if not check_zookeeper_service_is_ready():
-        logger.error(
-            "Zookeeper is not ready. Check .env file and ensure Zookeeper is running."
-        )
-        sys.exit(1)
-
-    if not check_kafka_service_is_ready():
-        logger.error("Kafka is not ready. Check .env file and ensure Kafka is running.")
-        sys.exit(2)
-
+    verify_services(exit_on_failure=True)
     logger.info("All services are ready. Proceed with producer setup.")
     create_kafka_topic("test_topic", "default_group")
 
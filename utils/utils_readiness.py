@@ -0,0 +1,300 @@
+"""
+utils_readiness.py - readiness checks for Zookeeper, Kafka and topics.
+
+Probes run concurrently, each retried with exponential backoff until it
+succeeds or the shared deadline passes. No probe exits the process:
+check_readiness() returns a ReadinessReport and the caller decides what
+to do (e.g. the producer keeps writing the live file without Kafka).
+
+Kafka probes and the topic helpers in utils_producer share one cached
+KafkaAdminClient per process (get_admin_client()), so startup does not
+open a new admin connection for every metadata request.
+
+Usage:
+    python -m utils.utils_readiness [--topic NAME] [--deadline SECS]
+"""
+
+#####################################
+# Imports
+#####################################
+
+# Import packages from Python Standard Library
+import argparse
+import atexit
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+# Import external packages
+from kafka.admin import KafkaAdminClient
+
+# Import functions from local modules
+from .utils_config import (
+    get_kafka_broker_address,
+    get_readiness_attempt_timeout_seconds,
+    get_readiness_deadline_seconds,
+    get_readiness_retry_backoff_seconds,
+    get_zookeeper_address,
+)
+from .utils_logger import logger
+
+# backoff doubles after each failed attempt, up to this
+MAX_BACKOFF_SECONDS = 5.0
+
+#####################################
+# Results
+#####################################
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Outcome of one readiness probe."""
+
+    name: str
+    ok: bool
+    attempts: int
+    elapsed_secs: float
+    detail: str = ""
+    error: str = None
+
+
+@dataclass(frozen=True)
+class ReadinessReport:
+    """Outcome of a set of probes run together."""
+
+    results: tuple
+    elapsed_secs: float
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+    def result(self, name: str) -> ProbeResult:
+        """Return the result of the named probe (KeyError if it did not run)."""
+        for result in self.results:
+            if result.name == name:
+                return result
+        raise KeyError(name)
+
+    def failed(self) -> list:
+        return [result for result in self.results if not result.ok]
+
+    def log(self) -> None:
+        for result in self.results:
+            if result.ok:
+                logger.info(
+                    f"{result.name} is ready ({result.detail}) after {result.attempts} "
+                    f"attempt(s), {result.elapsed_secs:.2f}s."
+                )
+            else:
+                logger.error(
+                    f"{result.name} is not ready after {result.attempts} attempt(s), "
+                    f"{result.elapsed_secs:.2f}s: {result.error}"
+                )
+
+
+#####################################
+# Shared Admin Client
+#####################################
+
+_admin_clients = {}
+_admin_lock = threading.Lock()
+
+
+def get_admin_client(broker: str = None, timeout_secs: float = None) -> KafkaAdminClient:
+    """
+    Return this process's KafkaAdminClient for the broker, creating it on first use.
+
+    A client inherited from a parent process (after fork) is not reused.
+
+    Args:
+        broker (str): Bootstrap address. Defaults to KAFKA_BROKER_ADDRESS.
+        timeout_secs (float): Connection and request timeout for a new client.
+            Defaults to READINESS_ATTEMPT_TIMEOUT_SECONDS.
+    """
+    broker = broker or get_kafka_broker_address()
+    key = (os.getpid(), broker)
+    with _admin_lock:
+        client = _admin_clients.get(key)
+        if client is None:
+            timeout_ms = int((timeout_secs or get_readiness_attempt_timeout_seconds()) * 1000)
+            client = KafkaAdminClient(
+                bootstrap_servers=broker,
+                request_timeout_ms=max(timeout_ms, 1000),
+                api_version_auto_timeout_ms=max(timeout_ms, 1000),
+            )
+            _admin_clients[key] = client
+        return client
+
+
+def close_admin_client(broker: str = None) -> None:
+    """Close and forget this process's cached admin client(s) (all brokers if None)."""
+    with _admin_lock:
+        for key in list(_admin_clients):
+            pid, client_broker = key
+            if pid != os.getpid() or (broker is not None and client_broker != broker):
+                continue
+            client = _admin_clients.pop(key)
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Error closing Kafka admin client: {e}")
+
+
+atexit.register(close_admin_client)
+
+#####################################
+# Probes
+#####################################
+
+
+def probe_zookeeper(address: str = None, timeout_secs: float = 3.0) -> str:
+    """Open a TCP connection to Zookeeper. Raises on failure."""
+    address = address or get_zookeeper_address()
+    host, port = address.rsplit(":", 1)
+    with socket.create_connection((host, int(port)), timeout=timeout_secs):
+        return f"port open at {address}"
+
+
+def probe_kafka(broker: str = None, timeout_secs: float = 3.0) -> str:
+    """Fetch cluster metadata through the shared admin client. Raises on failure."""
+    broker = broker or get_kafka_broker_address()
+    try:
+        cluster = get_admin_client(broker, timeout_secs).describe_cluster()
+    except Exception:
+        # the connection may be broken; start over on the next attempt
+        close_admin_client(broker)
+        raise
+    return f"{len(cluster.get('brokers', []))} broker(s) at {broker}"
+
+
+def probe_topic(topic: str, broker: str = None, timeout_secs: float = 3.0) -> str:
+    """Check that a topic exists. Raises on failure."""
+    broker = broker or get_kafka_broker_address()
+    try:
+        topics = get_admin_client(broker, timeout_secs).list_topics()
+    except Exception:
+        close_admin_client(broker)
+        raise
+    if topic not in topics:
+        raise LookupError(f"topic '{topic}' does not exist")
+    return f"topic '{topic}' exists"
+
+
+def run_probe(
+    name: str,
+    probe,
+    deadline: float,
+    attempt_timeout_secs: float,
+    backoff_secs: float,
+    clock=time.monotonic,
+    sleep=time.sleep,
+) -> ProbeResult:
+    """
+    Call probe(timeout_secs) until it returns or the deadline passes.
+
+    Args:
+        name (str): Probe name for the result.
+        probe (callable): Takes a timeout in seconds; returns a detail
+            string or raises.
+        deadline (float): clock() value after which no attempt is started.
+        attempt_timeout_secs (float): Upper bound for one attempt.
+        backoff_secs (float): First delay between attempts (doubles).
+    """
+    started = clock()
+    attempts = 0
+    error = None
+    while True:
+        remaining = deadline - clock()
+        if remaining <= 0 and attempts:
+            break
+        attempts += 1
+        try:
+            detail = probe(max(min(attempt_timeout_secs, remaining), 0.1))
+            return ProbeResult(name, True, attempts, clock() - started, detail=detail)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.debug(f"{name} probe attempt {attempts} failed: {error}")
+        remaining = deadline - clock()
+        if remaining <= 0:
+            break
+        sleep(min(backoff_secs * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS, remaining))
+    return ProbeResult(name, False, attempts, clock() - started, error=error)
+
+
+def check_readiness(
+    probes: dict = None,
+    topic: str = None,
+    deadline_secs: float = None,
+    attempt_timeout_secs: float = None,
+    backoff_secs: float = None,
+) -> ReadinessReport:
+    """
+    Run readiness probes concurrently under one deadline.
+
+    Args:
+        probes (dict): name -> probe(timeout_secs). Defaults to Zookeeper
+            and Kafka (plus the topic, if given).
+        topic (str, optional): Also check that this topic exists.
+        deadline_secs (float): Total time allowed (READINESS_DEADLINE_SECONDS).
+        attempt_timeout_secs (float): Per-attempt timeout (READINESS_ATTEMPT_TIMEOUT_SECONDS).
+        backoff_secs (float): First retry delay (READINESS_RETRY_BACKOFF_SECONDS).
+
+    Returns:
+        ReadinessReport: One ProbeResult per probe, in the order given.
+    """
+    if deadline_secs is None:
+        deadline_secs = get_readiness_deadline_seconds()
+    if attempt_timeout_secs is None:
+        attempt_timeout_secs = get_readiness_attempt_timeout_seconds()
+    if backoff_secs is None:
+        backoff_secs = get_readiness_retry_backoff_seconds()
+    if probes is None:
+        probes = {
+            "Zookeeper": lambda timeout: probe_zookeeper(timeout_secs=timeout),
+            "Kafka": lambda timeout: probe_kafka(timeout_secs=timeout),
+        }
+        if topic:
+            probes["Topic"] = lambda timeout: probe_topic(topic, timeout_secs=timeout)
+
+    started = time.monotonic()
+    deadline = started + deadline_secs
+    with ThreadPoolExecutor(max_workers=max(len(probes), 1), thread_name_prefix="readiness") as pool:
+        futures = [
+            pool.submit(run_probe, name, probe, deadline, attempt_timeout_secs, backoff_secs)
+            for name, probe in probes.items()
+        ]
+        results = tuple(future.result() for future in futures)
+    return ReadinessReport(results, time.monotonic() - started)
+
+
+#####################################
+# Main Function for Testing
+#####################################
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check that Zookeeper and Kafka are ready.")
+    parser.add_argument("--topic", default=None, help="Also check that this topic exists.")
+    parser.add_argument("--deadline", type=float, default=None, help="Seconds to keep trying.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    report = check_readiness(topic=args.topic, deadline_secs=args.deadline)
+    report.log()
+    logger.info(f"Readiness checks finished in {report.elapsed_secs:.2f}s.")
+    sys.exit(0 if report.ok else 1)
+
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == "__main__":
+    main()